@@ -11,13 +11,7 @@ Author: Stanley Lab / RareResearch
 Date: November 2025
 """
 
-from .ui.configurator import TopologyConfigurator, ModuleConfigTab
-from .ui.output_viewer import OutputBrowser, OutputTab
-from .ui.widgets import PatientSelector, ProgressTracker, StatusDisplay, RunButton
-from .ui.review_interface import DiagnosisReviewTable, DiagnosisReviewRow, create_review_interface
-
-# Import the new LangGraph pipeline runner
-from .uh2025_graph.graph import run_pipeline
+import importlib
 
 __all__ = [
     'TopologyConfigurator',
@@ -33,3 +27,35 @@ __all__ = [
     'DiagnosisReviewRow',
     'create_review_interface'
 ]
+
+# UI widgets (ipywidgets) and the LangGraph runner are imported on first
+# attribute access (PEP 562), so `import code.agents` or `import code.llm`
+# does not pay for the whole UI/LangGraph stack.
+_LAZY_IMPORTS = {
+    'TopologyConfigurator': '.ui.configurator',
+    'ModuleConfigTab': '.ui.configurator',
+    'OutputBrowser': '.ui.output_viewer',
+    'OutputTab': '.ui.output_viewer',
+    'PatientSelector': '.ui.widgets',
+    'ProgressTracker': '.ui.widgets',
+    'StatusDisplay': '.ui.widgets',
+    'RunButton': '.ui.widgets',
+    'DiagnosisReviewTable': '.ui.review_interface',
+    'DiagnosisReviewRow': '.ui.review_interface',
+    'create_review_interface': '.ui.review_interface',
+    'run_pipeline': '.uh2025_graph.graph',
+}
+
+
+def __getattr__(name):
+    """Lazily import UI components and the pipeline runner on first access."""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
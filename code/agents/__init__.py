@@ -15,20 +15,45 @@ Each agent follows the BaseAgent interface and supports:
 - Local-first execution (M4 Envelope)
 """
 
-from .base_agent import BaseAgent, AgentConfig, AgentResult
-from .ingestion_agent import IngestionAgent
-from .structuring_agent import StructuringAgent
-from .executor_agent import ExecutorAgent
-from .synthesis_agent import SynthesisAgent
+import importlib
 
 __all__ = [
     "BaseAgent",
     "AgentConfig",
     "AgentResult",
+    "AgentResultBatch",
     "IngestionAgent",
     "StructuringAgent",
     "ExecutorAgent",
     "SynthesisAgent",
 ]
 
+# Agents are imported on first attribute access (PEP 562) so that using
+# one agent does not pull in the modules of all the others.
+_LAZY_IMPORTS = {
+    "BaseAgent": ".base_agent",
+    "AgentConfig": ".base_agent",
+    "AgentResult": ".base_agent",
+    "AgentResultBatch": ".base_agent",
+    "IngestionAgent": ".ingestion_agent",
+    "StructuringAgent": ".structuring_agent",
+    "ExecutorAgent": ".executor_agent",
+    "SynthesisAgent": ".synthesis_agent",
+}
+
+
+def __getattr__(name):
+    """Lazily import agent classes on first access."""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
 __version__ = "2.0.0"
@@ -19,19 +19,91 @@ Date: November 2025
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+import asyncio
+import functools
+import io
 import json
+import logging
+import mmap
+import os
+import re
+import time
+import traceback
 import yaml
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoder
+    orjson = None
+
+# Prefer the libyaml-backed loader; the pure-Python one is several times slower
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+    logger.warning(
+        "PyYAML was built without libyaml; prompt templates will be parsed "
+        "with the pure-Python SafeLoader"
+    )
+
 # LangChain imports (HIPAA-safe - local only)
 if TYPE_CHECKING:
+    import numpy as np
     from langchain_core.language_models.llms import BaseLLM
 
 
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse a YAML prompt template, memoized on (path, mtime).
+
+    The mtime is part of the cache key so edits to a template on disk
+    are picked up on the next render. The system and user messages are
+    stripped here, once, so rendering does not have to. The returned
+    dict is shared between callers and must be treated as read-only.
+    """
+    with open(path) as f:
+        template = yaml.load(f, Loader=_YamlLoader)
+    for key in ("system", "user"):
+        if isinstance(template.get(key), str):
+            template[key] = template[key].strip()
+    return template
+
+
+@functools.lru_cache(maxsize=16)
+def _read_context_file_cached(path: str, mtime: float) -> str:
+    """
+    Read a context file via mmap, memoized on (path, mtime).
+
+    Mapping the file lets the OS page cache serve it to every process
+    (and every agent) referencing the same reference text, and the LRU
+    keeps the decoded string around between runs.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # mmap cannot map empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:].decode("utf-8")
+
+
+# Agent model names -> LLMFactory registry names (after normalization)
+_MODEL_NAME_MAP: Dict[str, str] = {
+    "llama-3.2-3b-instruct": "llama-3.2-3b-instruct",
+    "llama-3-2-3b-instruct": "llama-3.2-3b-instruct",
+    "qwen-2.5-14b-instruct": "qwen-2.5-14b-instruct",
+    "qwen-2-5-14b-instruct": "qwen-2.5-14b-instruct",
+    "qwen-2.5-32b-instruct": "qwen-2.5-32b-instruct",
+    "qwen-2-5-32b-instruct": "qwen-2.5-32b-instruct",
+}
+
+
 class AgentStatus(Enum):
     """Agent execution status."""
     PENDING = "pending"
@@ -41,12 +113,14 @@ class AgentStatus(Enum):
     AWAITING_REVIEW = "awaiting_review"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     """
     Configuration for LLM model loading.
 
-    Designed for llama.cpp backend with GGUF models.
+    Designed for llama.cpp backend with GGUF models; backend="mlx" uses
+    mlx-lm on Apple Silicon and backend="vllm" uses vLLM on CUDA GPUs
+    where available (llama.cpp otherwise).
     """
     name: str
     backend: str = "llama.cpp"
@@ -56,6 +130,7 @@ class ModelConfig:
     top_p: float = 0.9
     top_k: int = 40
     repeat_penalty: float = 1.1
+    max_tokens: int = 4096
 
     # Path to GGUF model file (resolved at runtime)
     model_path: Optional[str] = None
@@ -63,22 +138,26 @@ class ModelConfig:
     # Memory estimate in GB
     memory_gb: float = 2.0
 
+    # KV-cache precision ("float16" keeps it half-size vs "float32") and
+    # CPU threads for llama.cpp (None = library default)
+    compute_dtype: str = "float16"
+    n_threads: Optional[int] = None
+
+    # llama.cpp offload and prompt batch: -1 puts every layer on the GPU
+    # (Metal on Apple Silicon); 512 is the prefill sweet spot there
+    n_gpu_layers: int = -1
+    n_batch: int = 512
+
+    # Speculative decoding: MLX/vLLM draft model sharing the main model's
+    # tokenizer (llama.cpp uses prompt-lookup drafting when set)
+    draft_model: Optional[str] = None
+    num_draft_tokens: int = 3
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "backend": self.backend,
-            "quantization": self.quantization,
-            "context_length": self.context_length,
-            "temperature": self.temperature,
-            "top_p": self.top_p,
-            "top_k": self.top_k,
-            "repeat_penalty": self.repeat_penalty,
-            "model_path": self.model_path,
-            "memory_gb": self.memory_gb,
-        }
+        return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class PromptConfig:
     """
     Configuration for prompt templates.
@@ -90,29 +169,53 @@ class PromptConfig:
     few_shot_examples: Optional[str] = None
     version: str = "v1"
 
-    def load_template(self) -> Dict[str, Any]:
-        """Load prompt template from YAML file."""
+    # Resolved template location (memoized after the first lookup)
+    _resolved_path: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Missing template already reported (warn once, not on every render)
+    _warned_missing: bool = field(
+        default=False, init=False, repr=False, compare=False
+    )
+
+    def _resolve_path(self) -> Optional[str]:
+        """Resolve template_path (as given, then relative to agents dir)."""
+        if self._resolved_path is not None:
+            return self._resolved_path
+
         path = Path(self.template_path)
+        if not path.exists():
+            # Try path relative to the agents directory
+            path = Path(__file__).parent / self.template_path
+            if not path.exists():
+                return None
 
-        # Try relative path first
-        if path.exists():
-            with open(path) as f:
-                return yaml.safe_load(f)
+        self._resolved_path = str(path.resolve())
+        return self._resolved_path
 
-        # Try path relative to the agents directory
-        agents_dir = Path(__file__).parent
-        relative_path = agents_dir / self.template_path
-        if relative_path.exists():
-            with open(relative_path) as f:
-                return yaml.safe_load(f)
+    def load_template(self) -> Dict[str, Any]:
+        """
+        Load prompt template from YAML file.
+
+        Parsed templates are cached per (path, mtime), so repeated
+        renders only pay for an os.stat() call.
+        """
+        path = self._resolve_path()
+        if path is not None:
+            try:
+                return _load_yaml_cached(path, os.stat(path).st_mtime)
+            except FileNotFoundError:
+                # Template moved since it was resolved; look it up again
+                self._resolved_path = None
 
         # Fallback to inline system message
-        import logging
-        logging.getLogger(__name__).warning(f"Prompt template not found: {self.template_path}")
-        return {"system": self.system_message, "user": "", "examples": []}
+        if not self._warned_missing:
+            logger.warning(f"Prompt template not found: {self.template_path}")
+            self._warned_missing = True
+        return {"system": self.system_message.strip(), "user": "", "examples": []}
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """
     Full configuration for an agent.
@@ -128,10 +231,16 @@ class AgentConfig:
     timeout_seconds: int = 300
     retry_count: int = 2
     collect_rlhf: bool = True
+    # Build the RLHF feedback schema only when a reviewer asks for it
+    rlhf_lazy: bool = True
 
     # Context injection
     context_files: List[str] = field(default_factory=list)
 
+    # Micro-batching of concurrent arun() calls (see BaseAgent.arun)
+    batch_window_ms: float = 20.0
+    max_batch_size: int = 16
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "agent_id": self.agent_id,
@@ -145,10 +254,13 @@ class AgentConfig:
             "timeout_seconds": self.timeout_seconds,
             "retry_count": self.retry_count,
             "collect_rlhf": self.collect_rlhf,
+            "rlhf_lazy": self.rlhf_lazy,
+            "batch_window_ms": self.batch_window_ms,
+            "max_batch_size": self.max_batch_size,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     """
     Standardized result from agent execution.
@@ -171,14 +283,65 @@ class AgentResult:
     # Model info
     tokens_input: int = 0
     tokens_output: int = 0
+    load_ms: float = 0.0  # Time spent in load_model() (0 when already resident)
+    ttft_ms: float = 0.0  # Time to first token (0 when the LLM was not called)
+    tpot_ms: float = 0.0  # Mean time per output token after the first
 
-    # Errors
+    # Errors (traceback exposed via the error_traceback property)
     error_message: Optional[str] = None
-    error_traceback: Optional[str] = None
-
-    # RLHF
+    _error_traceback: Optional[str] = field(
+        default=None, init=False, repr=False
+    )
+    _error_exc: Optional[traceback.TracebackException] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # RLHF (schema exposed via the feedback_schema property)
     awaiting_feedback: bool = False
-    feedback_schema: Optional[Dict[str, Any]] = None
+    _feedback_schema: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False
+    )
+    _feedback_schema_fn: Optional[Callable[[], Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def feedback_schema(self) -> Optional[Dict[str, Any]]:
+        """RLHF feedback schema; deferred schemas are built on first access."""
+        if self._feedback_schema is None and self._feedback_schema_fn is not None:
+            self._feedback_schema = self._feedback_schema_fn()
+            self._feedback_schema_fn = None
+        return self._feedback_schema
+
+    @feedback_schema.setter
+    def feedback_schema(self, value: Optional[Dict[str, Any]]) -> None:
+        self._feedback_schema = value
+        self._feedback_schema_fn = None
+
+    @property
+    def error_traceback(self) -> Optional[str]:
+        """Formatted traceback of the failure; formatted on first access."""
+        if self._error_traceback is None and self._error_exc is not None:
+            self._error_traceback = "".join(self._error_exc.format())
+            self._error_exc = None
+        return self._error_traceback
+
+    @error_traceback.setter
+    def error_traceback(self, value: Optional[str]) -> None:
+        self._error_traceback = value
+        self._error_exc = None
+
+    def set_exception(self, exc: BaseException) -> None:
+        """
+        Record a failure's traceback without formatting it.
+
+        Source lines are neither read nor formatted until
+        error_traceback is accessed, which most runs never do.
+        """
+        self._error_traceback = None
+        self._error_exc = traceback.TracebackException.from_exception(
+            exc, lookup_lines=False
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -192,13 +355,226 @@ class AgentResult:
             "duration_seconds": self.duration_seconds,
             "tokens_input": self.tokens_input,
             "tokens_output": self.tokens_output,
+            "load_ms": self.load_ms,
+            "ttft_ms": self.ttft_ms,
+            "tpot_ms": self.tpot_ms,
             "error_message": self.error_message,
             "awaiting_feedback": self.awaiting_feedback,
         }
 
     def to_json(self, indent: int = 2) -> str:
+        # orjson only supports 2-space indentation
+        if orjson is not None and indent == 2:
+            return orjson.dumps(
+                self.to_dict(),
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            ).decode()
         return json.dumps(self.to_dict(), indent=indent, default=str)
 
+    def dump_json(self, fp: IO, indent: int = 2) -> None:
+        """
+        Write the result as JSON directly to an open file object.
+
+        Avoids building the full string first (as `fp.write(to_json())`
+        would) for results with large outputs. Accepts text or binary
+        file objects.
+        """
+        if orjson is not None and indent == 2:
+            data = orjson.dumps(
+                self.to_dict(),
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            )
+            fp.write(data.decode() if isinstance(fp, io.TextIOBase) else data)
+        elif isinstance(fp, io.TextIOBase):
+            json.dump(self.to_dict(), fp, indent=indent, default=str)
+        else:
+            fp.write(json.dumps(self.to_dict(), indent=indent, default=str).encode())
+
+
+# LLM response extractors; BaseAgent.invoke_llm picks one on the first
+# response and reuses it, since a backend's response type does not change
+def _extract_str(response: Any) -> str:
+    return response
+
+
+def _extract_content(response: Any) -> str:
+    return response.content
+
+
+def _extract_repr(response: Any) -> str:
+    return str(response)
+
+
+def _select_response_extractor(response: Any) -> Callable[[Any], str]:
+    if isinstance(response, str):
+        return _extract_str
+    if hasattr(response, "content"):
+        return _extract_content
+    return _extract_repr
+
+
+# LLM types whose get_num_tokens() runs the model's tokenizer (LangChain's
+# default would load a GPT-2 tokenizer instead)
+_TOKENIZER_LLM_TYPES = frozenset({"llamacpp", "mlx"})
+
+# Call argument carrying the output constraint, by LangChain _llm_type
+_GRAMMAR_KWARGS = {"llamacpp": "grammar", "vllm": "guided_decoding"}
+
+# Sampling settings passed on every call, by LangChain _llm_type: the
+# model is shared between agents, so its load-time defaults may be another
+# agent's (vLLM's SamplingParams has no repeat_penalty)
+_SAMPLING_KWARGS = {
+    "llamacpp": ("temperature", "top_p", "top_k", "max_tokens", "repeat_penalty"),
+    "mlx": ("temperature", "top_p", "top_k", "max_tokens", "repeat_penalty"),
+    "vllm": ("temperature", "top_p", "top_k", "max_tokens"),
+}
+
+
+# AgentStatus <-> compact int8 code used by AgentResultBatch.statuses
+_STATUS_ORDER: Tuple[AgentStatus, ...] = tuple(AgentStatus)
+_STATUS_CODES: Dict[AgentStatus, int] = {s: i for i, s in enumerate(_STATUS_ORDER)}
+
+
+@dataclass(slots=True)
+class AgentResultBatch:
+    """
+    Structure-of-arrays view over many AgentResults for telemetry.
+
+    Numeric fields are stored as parallel NumPy arrays so pipeline-level
+    metrics (total tokens, mean duration, failure counts) reduce at
+    NumPy speed instead of iterating result objects.
+    """
+    agent_ids: List[str]
+    durations: "np.ndarray"       # float64, seconds
+    tokens_input: "np.ndarray"    # int64
+    tokens_output: "np.ndarray"   # int64
+    statuses: "np.ndarray"        # int8 codes into AgentStatus
+    ttft_ms: "np.ndarray"         # float64, 0 where the LLM was not called
+    tpot_ms: "np.ndarray"         # float64
+    outputs: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_results(cls, results: List[AgentResult]) -> "AgentResultBatch":
+        """Build the batch from AgentResults in a single pass."""
+        import numpy as np
+
+        n = len(results)
+        durations = np.empty(n, dtype=np.float64)
+        tokens_input = np.empty(n, dtype=np.int64)
+        tokens_output = np.empty(n, dtype=np.int64)
+        statuses = np.empty(n, dtype=np.int8)
+        ttft_ms = np.empty(n, dtype=np.float64)
+        tpot_ms = np.empty(n, dtype=np.float64)
+        agent_ids = []
+        outputs = []
+
+        for i, r in enumerate(results):
+            durations[i] = r.duration_seconds
+            tokens_input[i] = r.tokens_input
+            tokens_output[i] = r.tokens_output
+            statuses[i] = _STATUS_CODES[r.status]
+            ttft_ms[i] = r.ttft_ms
+            tpot_ms[i] = r.tpot_ms
+            agent_ids.append(r.agent_id)
+            outputs.append(r.outputs)
+
+        return cls(
+            agent_ids=agent_ids,
+            durations=durations,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            statuses=statuses,
+            ttft_ms=ttft_ms,
+            tpot_ms=tpot_ms,
+            outputs=outputs,
+        )
+
+    def count(self, status: AgentStatus) -> int:
+        """Number of results with the given status."""
+        return int((self.statuses == _STATUS_CODES[status]).sum())
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate metrics over the batch."""
+        n = len(self.agent_ids)
+        # Latency means cover only results that actually generated
+        generated = self.ttft_ms > 0
+        n_generated = int(generated.sum())
+        return {
+            "count": n,
+            "total_duration_seconds": float(self.durations.sum()),
+            "mean_duration_seconds": float(self.durations.mean()) if n else 0.0,
+            "total_tokens_input": int(self.tokens_input.sum()),
+            "total_tokens_output": int(self.tokens_output.sum()),
+            "mean_ttft_ms": float(self.ttft_ms[generated].mean()) if n_generated else 0.0,
+            "mean_tpot_ms": float(self.tpot_ms[generated].mean()) if n_generated else 0.0,
+            "by_status": {
+                status.value: self.count(status) for status in _STATUS_ORDER
+            },
+        }
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
+
+
+class _MicroBatcher:
+    """
+    Collects concurrent BaseAgent.arun() requests into run_batch() calls.
+
+    The first queued request opens a window of `window_seconds`; every
+    request arriving within it (up to `max_batch_size`) goes to the
+    backend in the same generate() call. Batches run one at a time in a
+    worker thread, so the model is never used concurrently.
+    """
+
+    def __init__(self, agent: "BaseAgent", window_seconds: float, max_batch_size: int):
+        self._agent = agent
+        self._window = window_seconds
+        self._max_batch_size = max_batch_size
+        self._queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self.loop = asyncio.get_running_loop()
+
+    async def submit(self, inputs: Dict[str, Any]) -> "AgentResult":
+        if self._worker is None or self._worker.done():
+            self._worker = self.loop.create_task(self._run())
+        future = self.loop.create_future()
+        await self._queue.put((inputs, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self.loop.time() + self._window
+            while len(batch) < self._max_batch_size:
+                # Take already-queued requests without wait_for(), which
+                # can swallow a cancellation when the get() is ready
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - self.loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            logger.debug("[%s] Running micro-batch of %d", self._agent.AGENT_TYPE, len(batch))
+            try:
+                results = await asyncio.to_thread(
+                    self._agent.run_batch, [inputs for inputs, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+
 
 class BaseAgent(ABC):
     """
@@ -225,6 +601,9 @@ class BaseAgent(ABC):
     DEFAULT_TEMPERATURE: float = 0.3
     DEFAULT_MEMORY_GB: float = 2.0
 
+    # Matches {variable_name} placeholders in prompt templates
+    _VAR_RE = re.compile(r"\{(\w+)\}")
+
     def __init__(self, config: Optional[AgentConfig] = None):
         """
         Initialize agent with configuration.
@@ -237,6 +616,35 @@ class BaseAgent(ABC):
         self._llm_factory = None
         self._is_loaded = False
 
+        # (template dict, rendered static head, user template segments,
+        # prompt_prefix())
+        self._compiled_prompt: Optional[Tuple[Dict[str, Any], str, List[str], str]] = None
+
+        # prompt -> response, pre-generated by run_batch()
+        self._batched_responses: Dict[str, str] = {}
+
+        # Chosen on the first invoke_llm() response of the loaded model
+        self._response_extractor: Optional[Callable[[Any], str]] = None
+
+        # Created by arun() on the running event loop
+        self._batcher: Optional[_MicroBatcher] = None
+
+        # Backend KV cache of prompt_prefix(), for models that support it
+        self._prefix_cache: Any = None
+
+        # (prompt_prefix(), its token count) for count_prompt_tokens()
+        self._prefix_tokens: Optional[Tuple[str, int]] = None
+
+        # Backend constraint compiled from _output_json_schema(): a llama.cpp
+        # grammar or vLLM guided-decoding params (False = none/unavailable)
+        self._grammar: Any = None
+
+        # Quantization of the loaded weights, as reported by the factory
+        self._quantization: Optional[str] = None
+
+        # Context window the model was acquired with (see load_model)
+        self._n_ctx = 0
+
     def _default_config(self) -> AgentConfig:
         """Create default configuration for this agent type."""
         return AgentConfig(
@@ -255,43 +663,68 @@ class BaseAgent(ABC):
             ),
         )
 
-    def load_model(self) -> None:
+    def load_model(self, n_ctx: Optional[int] = None) -> None:
         """
         Load the LLM model into memory via LangChain LlamaCpp.
 
         Uses the HIPAA-safe LLMFactory which enforces local-only
-        execution (no cloud APIs permitted).
+        execution (no cloud APIs permitted). The factory is shared by all
+        agents in the process, so a model that is already resident (e.g.
+        from a previous agent using the same GGUF) is reused instead of
+        reloaded.
+
+        Args:
+            n_ctx: Context window to allocate (default: the configured
+                   context_length). A loaded model with a smaller window
+                   is reacquired with this one.
         """
+        model_config = self.config.model
+        n_ctx = n_ctx or model_config.context_length
         if self._is_loaded:
-            return
-
-        import logging
-        logger = logging.getLogger(__name__)
+            if n_ctx <= self._n_ctx:
+                return
+            self.unload_model()
 
-        model_config = self.config.model
         logger.info(f"[{self.AGENT_TYPE}] Loading model: {model_config.name} ({model_config.quantization}, ~{model_config.memory_gb}GB)")
 
         # Import LLMFactory (lazy import to avoid circular dependencies)
-        from code.llm import LLMFactory
+        from code.llm import get_shared_factory
 
-        # Create factory and load model
-        self._llm_factory = LLMFactory()
+        self._llm_factory = get_shared_factory()
 
         # Map model name to LLMFactory model name
         model_name = self._map_model_name(model_config.name)
 
-        self._model = self._llm_factory.create(
+        self._model = self._llm_factory.get_or_create(
             model_name=model_name,
             temperature=model_config.temperature,
             top_p=model_config.top_p,
             top_k=model_config.top_k,
             repeat_penalty=model_config.repeat_penalty,
+            max_tokens=model_config.max_tokens,
+            # Right-sized context: the KV cache is allocated for n_ctx at load
+            n_ctx=n_ctx,
+            use_mmap=True,
+            use_mlock=False,
+            compute_dtype=model_config.compute_dtype,
+            n_threads=model_config.n_threads,
+            n_gpu_layers=model_config.n_gpu_layers,
+            n_batch=model_config.n_batch,
+            backend=model_config.backend,
+            quantization=model_config.quantization,
+            draft_model=model_config.draft_model,
+            num_draft_tokens=model_config.num_draft_tokens,
+            on_evict=self._on_model_evicted,
         )
+        self._quantization = self._llm_factory.current_quantization
+        self._n_ctx = n_ctx
 
         self._is_loaded = True
         logger.info(f"[{self.AGENT_TYPE}] Model loaded successfully")
 
-    def _map_model_name(self, name: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _map_model_name(name: str) -> str:
         """
         Map agent model names to LLMFactory registry names.
 
@@ -300,44 +733,113 @@ class BaseAgent(ABC):
         # Normalize name
         name_lower = name.lower().replace("_", "-").replace(" ", "-")
 
-        # Direct mapping
-        mappings = {
-            "llama-3.2-3b-instruct": "llama-3.2-3b-instruct",
-            "llama-3-2-3b-instruct": "llama-3.2-3b-instruct",
-            "qwen-2.5-14b-instruct": "qwen-2.5-14b-instruct",
-            "qwen-2-5-14b-instruct": "qwen-2.5-14b-instruct",
-            "qwen-2.5-32b-instruct": "qwen-2.5-32b-instruct",
-            "qwen-2-5-32b-instruct": "qwen-2.5-32b-instruct",
-        }
-
-        if name_lower in mappings:
-            return mappings[name_lower]
-
         # Return as-is if not found in mapping
-        return name_lower
+        return _MODEL_NAME_MAP.get(name_lower, name_lower)
 
-    def unload_model(self) -> None:
+    def unload_model(self, force: bool = False) -> None:
         """
-        Unload model from memory.
+        Release this agent's hold on its model.
+
+        By default the model stays resident in the shared LLMFactory so
+        the next agent using the same GGUF skips the load; the factory
+        still unloads it before loading a different model, so sequential
+        loading on memory-constrained systems is preserved.
 
-        Important for sequential model loading on memory-constrained systems.
-        Uses LLMFactory's unload method for proper cleanup.
+        Args:
+            force: Unload the model now if no other agent holds it
         """
         if not self._is_loaded:
             return
 
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info(f"[{self.AGENT_TYPE}] Unloading model: {self.config.model.name}")
 
-        # Use LLMFactory's unload for proper cleanup
         if self._llm_factory is not None:
-            self._llm_factory.unload()
-            self._llm_factory = None
+            self._llm_factory.release(
+                self._map_model_name(self.config.model.name),
+                force=force,
+                on_evict=self._on_model_evicted,
+            )
+        self._drop_model()
+        logger.debug(f"[{self.AGENT_TYPE}] Model released (force={force})")
 
+    def _on_model_evicted(self) -> None:
+        """Factory callback: the shared model was unloaded while held."""
+        logger.info(f"[{self.AGENT_TYPE}] Model evicted: {self.config.model.name}")
+        self._drop_model()
+
+    def _drop_model(self) -> None:
+        """Forget the model and everything derived from it."""
+        self._llm_factory = None
         self._model = None
+        self._response_extractor = None
+        self._prefix_cache = None
+        self._prefix_tokens = None
+        self._grammar = None
+        self._quantization = None
+        self._n_ctx = 0
         self._is_loaded = False
-        logger.debug(f"[{self.AGENT_TYPE}] Model unloaded")
+
+    def _load_context_files(self) -> List[str]:
+        """
+        Load the contents of config.context_files for prompt injection.
+
+        Paths are resolved like prompt templates (as given, then relative
+        to the agents directory). Files are cached per (path, mtime), so
+        repeated runs do not re-read large reference texts. Missing
+        files are skipped with a warning.
+        """
+        contents = []
+        for context_file in self.config.context_files:
+            path = Path(context_file)
+            if not path.exists():
+                path = Path(__file__).parent / context_file
+            try:
+                resolved = str(path.resolve())
+                contents.append(
+                    _read_context_file_cached(resolved, os.stat(resolved).st_mtime)
+                )
+            except FileNotFoundError:
+                logger.warning(
+                    f"[{self.AGENT_TYPE}] Context file not found: {context_file}"
+                )
+        return contents
+
+    def _compile_prompt(self) -> Tuple[str, List[str], str]:
+        """
+        Return (static head, user template segments, prompt prefix).
+
+        Compiled once per parsed template: splitting the user template on
+        {name} yields alternating literal / variable-name segments, and
+        the head (system message plus the first literal segment) is
+        joined here so renders only format the per-input part.
+        """
+        template = self.config.prompt.load_template()
+
+        compiled = self._compiled_prompt
+        if compiled is None or compiled[0] is not template:
+            system_message = template.get("system", "")
+            segments = self._VAR_RE.split(template.get("user", ""))
+            # Leading edge of the user message's strip() (see render_prompt)
+            segments[0] = segments[0].lstrip()
+            head = (
+                f"{system_message.strip()}\n\n{segments[0]}" if system_message else segments[0]
+            )
+            prefix = head[:head.rfind("\n") + 1] if len(segments) > 1 else head
+            compiled = (template, head, segments, prefix)
+            self._compiled_prompt = compiled
+        return compiled[1], compiled[2], compiled[3]
+
+    def prompt_prefix(self) -> str:
+        """
+        Static start of every prompt rendered by render_prompt().
+
+        This is the system message plus the user template up to the last
+        line break before its first variable, so it is byte-identical
+        across inputs and does not end mid-token. Templates should keep
+        per-input variables (patient ID, clinical text) towards the end
+        so backends can reuse the KV cache of this prefix.
+        """
+        return self._compile_prompt()[2]
 
     def render_prompt(self, inputs: Dict[str, Any]) -> str:
         """
@@ -354,20 +856,25 @@ class BaseAgent(ABC):
         Returns:
             Rendered prompt string (system + user concatenated)
         """
-        template = self.config.prompt.load_template()
-
-        # Substitute variables in user template
-        user_template = template.get("user", "")
-        for key, value in inputs.items():
-            user_template = user_template.replace(f"{{{key}}}", str(value))
-
-        system_message = template.get("system", "")
+        head, segments, _ = self._compile_prompt()
 
         # Simple concatenation - let chat_format handle the special tokens
         # The llama-cpp-python library with chat_format will properly wrap this
-        if system_message:
-            return f"{system_message.strip()}\n\n{user_template.strip()}"
-        return user_template.strip()
+        # (the static head was stripped and joined when it was compiled).
+        # Substitute variables in a single pass; unknown names are left as-is
+        parts = segments[:]
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = str(inputs[name]) if name in inputs else f"{{{name}}}"
+
+        # The rendered user message is stripped: its leading literal was
+        # at compile time, unless the template opens with a variable
+        user = "".join(parts[1:])
+        if not segments[0]:
+            user = user.lstrip()
+        if segments[0] or user:
+            return (head + user).rstrip()
+        return head
 
     def invoke_llm(self, prompt: str) -> str:
         """
@@ -390,20 +897,215 @@ class BaseAgent(ABC):
                 f"Model not loaded. Call load_model() first or use run() method."
             )
 
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.debug(f"Prompt length: {len(prompt)} chars")
+        logger.debug("Prompt length: %d chars", len(prompt))
+
+        # Response already generated as part of run_batch()
+        batched = self._batched_responses.get(prompt)
+        if batched is not None:
+            return batched
 
         # LangChain LLM invoke
-        response = self._model.invoke(prompt)
+        response = self._model.invoke(prompt, **self._llm_kwargs())
+
+        # Handle different response types (str, message with .content,
+        # anything else); resolved once per loaded model
+        extractor = self._response_extractor
+        if extractor is None:
+            extractor = self._response_extractor = _select_response_extractor(response)
+        return extractor(response)
+
+    def invoke_llm_with_metrics(
+        self,
+        prompt: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run the LLM via stream_llm(), timing prefill and decode.
 
-        # Handle different response types
-        if isinstance(response, str):
-            return response
-        elif hasattr(response, 'content'):
-            return response.content
-        else:
-            return str(response)
+        Args:
+            prompt: The formatted prompt string
+            on_chunk: Called with each response chunk as it arrives
+
+        Returns:
+            (response text, metrics) where metrics holds ttft_ms (time to
+            first token, i.e. prefill), tpot_ms (mean time per output
+            token after the first, i.e. decode), prefill_tokens and
+            decode_tokens
+        """
+        chunks = []
+        t_first = None
+        t0 = time.perf_counter()
+        for chunk in self.stream_llm(prompt):
+            if t_first is None:
+                t_first = time.perf_counter()
+            chunks.append(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+        t_end = time.perf_counter()
+        if t_first is None:
+            t_first = t_end
+
+        response = "".join(chunks)
+        decode_tokens = self.count_tokens(response)
+        return response, {
+            "ttft_ms": (t_first - t0) * 1000,
+            "tpot_ms": (
+                (t_end - t_first) * 1000 / (decode_tokens - 1) if decode_tokens > 1 else 0.0
+            ),
+            "prefill_tokens": self.count_prompt_tokens(prompt),
+            "decode_tokens": decode_tokens,
+        }
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Number of tokens in text.
+
+        Uses the loaded model's own tokenizer for llama.cpp and MLX;
+        otherwise (no model, other backends) a cheap estimate from the
+        number of spaces.
+        """
+        model = self._model
+        if model is not None and getattr(model, "_llm_type", None) in _TOKENIZER_LLM_TYPES:
+            return model.get_num_tokens(text)
+        return text.count(" ") + 1 if text else 0
+
+    def count_prompt_tokens(self, prompt: str) -> int:
+        """
+        count_tokens() for a prompt from render_prompt().
+
+        With a real tokenizer, the static prompt_prefix() is tokenized
+        once per model and template and only the per-input suffix on each
+        call. The prefix ends at a line break, so this matches tokenizing
+        the whole prompt except for a rare merge across that boundary.
+        """
+        model = self._model
+        if model is None or getattr(model, "_llm_type", None) not in _TOKENIZER_LLM_TYPES:
+            return self.count_tokens(prompt)
+        prefix = self.prompt_prefix()
+        if not prefix or not prompt.startswith(prefix):
+            return self.count_tokens(prompt)
+        cached = self._prefix_tokens
+        if cached is None or cached[0] != prefix:
+            cached = self._prefix_tokens = (prefix, self.count_tokens(prefix))
+        return cached[1] + self.count_tokens(prompt[len(prefix):])
+
+    def stream_llm(self, prompt: str) -> Iterator[str]:
+        """
+        Invoke the loaded LLM, yielding the response text as it is generated.
+
+        Same as invoke_llm(), but lets callers act on partial output (e.g.
+        parse fields as they close) instead of waiting for the full
+        completion. Backends without streaming yield a single chunk.
+
+        Raises:
+            RuntimeError: If model is not loaded
+        """
+        if not self._is_loaded or self._model is None:
+            raise RuntimeError(
+                f"Model not loaded. Call load_model() first or use run() method."
+            )
+
+        return self._stream_response(prompt)
+
+    def _stream_response(self, prompt: str) -> Iterator[str]:
+        # Response already generated as part of run_batch()
+        batched = self._batched_responses.get(prompt)
+        if batched is not None:
+            yield batched
+            return
+
+        extractor = self._response_extractor
+        for chunk in self._model.stream(prompt, **self._llm_kwargs()):
+            if extractor is None:
+                extractor = self._response_extractor = _select_response_extractor(chunk)
+            yield extractor(chunk)
+
+    def _needs_llm(self, inputs: Dict[str, Any]) -> bool:
+        """
+        Whether running these inputs calls the LLM.
+
+        False for stub runs; subclasses add their own fast paths. run()
+        skips loading the model and run_batch() skips generation for
+        such inputs.
+        """
+        return not inputs.get("use_stub")
+
+    def _context_length(self, inputs: Dict[str, Any]) -> int:
+        """
+        Context window to load the model with for these inputs.
+
+        The configured context_length by default; subclasses can size it
+        to the prompt, since llama.cpp allocates the KV cache for the
+        whole window at load.
+        """
+        return self.config.model.context_length
+
+    def _output_json_schema(self) -> Optional[Dict[str, Any]]:
+        """
+        JSON Schema the LLM output must follow, if any.
+
+        When set, llama.cpp and vLLM backends decode under a grammar
+        derived from it, so the response always parses. None = unconstrained.
+        """
+        return None
+
+    def _llm_kwargs(self) -> Dict[str, Any]:
+        """
+        Extra invoke()/stream()/generate() arguments for the loaded model.
+
+        - prefix_cache: models with make_prefix_cache() (MLXLLM) get a KV
+          cache of prompt_prefix(), built once and rebuilt if the template
+          changes. llama.cpp needs nothing here: it already reuses the
+          longest matching token prefix of its previous evaluation.
+        - grammar / guided_decoding: llama.cpp and vLLM models get a
+          constraint compiled once from _output_json_schema(), when the
+          agent defines one.
+        - temperature, top_p, top_k, max_tokens, repeat_penalty: this
+          agent's ModelConfig, since the shared model may have been
+          loaded by an agent with other settings.
+        """
+        llm_type = getattr(self._model, "_llm_type", None)
+        model_config = self.config.model
+        kwargs: Dict[str, Any] = {
+            name: getattr(model_config, name) for name in _SAMPLING_KWARGS.get(llm_type, ())
+        }
+
+        make_prefix_cache = getattr(self._model, "make_prefix_cache", None)
+        if make_prefix_cache is not None:
+            prefix = self.prompt_prefix()
+            if prefix:
+                if self._prefix_cache is None or self._prefix_cache.prefix != prefix:
+                    self._prefix_cache = make_prefix_cache(prefix)
+                kwargs["prefix_cache"] = self._prefix_cache
+
+        if llm_type in _GRAMMAR_KWARGS:
+            if self._grammar is None:
+                self._grammar = self._build_grammar(llm_type)
+            if self._grammar is not False:
+                kwargs[_GRAMMAR_KWARGS[llm_type]] = self._grammar
+
+        return kwargs
+
+    def _build_grammar(self, llm_type: str) -> Any:
+        """Compile _output_json_schema() for the backend (False if unavailable)."""
+        schema = self._output_json_schema()
+        if schema is None:
+            return False
+        try:
+            if llm_type == "vllm":
+                # Picked up by LangChain's VLLM as a SamplingParams field
+                from vllm.sampling_params import GuidedDecodingParams
+
+                return GuidedDecodingParams(json=schema)
+
+            from llama_cpp.llama_grammar import LlamaGrammar
+
+            return LlamaGrammar.from_json_schema(json.dumps(schema), verbose=False)
+        except Exception as e:
+            logger.warning(
+                f"[{self.AGENT_TYPE}] Output grammar unavailable, decoding unconstrained: {e}"
+            )
+            return False
 
     def run(self, inputs: Dict[str, Any]) -> AgentResult:
         """
@@ -418,6 +1120,9 @@ class BaseAgent(ABC):
         Returns:
             AgentResult with outputs and metadata
         """
+        # Wall-clock timestamps are kept for auditing; duration uses the
+        # monotonic perf_counter
+        t0 = time.perf_counter()
         result = AgentResult(
             agent_id=self.config.agent_id,
             agent_type=self.AGENT_TYPE,
@@ -433,38 +1138,183 @@ class BaseAgent(ABC):
                 result.error_message = validation_error
                 return result
 
-            # Load model if needed
+            # Load model if needed (weights are mmap'd, so a cold load
+            # mostly maps the file and pages tensors in on first use)
             result.status = AgentStatus.RUNNING
-            self.load_model()
+            if self._needs_llm(inputs):
+                t_load = time.perf_counter()
+                self.load_model(self._context_length(inputs))
+                result.load_ms = (time.perf_counter() - t_load) * 1000
 
             # Execute agent logic
             outputs = self._execute(inputs)
 
             # Collect results
             result.outputs = outputs
+            result.tokens_input = outputs.get("input_tokens", 0)
+            result.tokens_output = outputs.get("output_tokens", 0)
+            metrics = outputs.get("metrics") or {}
+            result.ttft_ms = metrics.get("ttft_ms", 0.0)
+            result.tpot_ms = metrics.get("tpot_ms", 0.0)
             result.status = AgentStatus.COMPLETED
 
             # Set up RLHF feedback if enabled
             if self.config.collect_rlhf:
                 result.awaiting_feedback = True
-                result.feedback_schema = self._get_feedback_schema()
+                if self.config.rlhf_lazy:
+                    # Offline/batch runs often never look at the schema
+                    result._feedback_schema_fn = self._get_feedback_schema
+                else:
+                    result.feedback_schema = self._get_feedback_schema()
                 result.status = AgentStatus.AWAITING_REVIEW
 
         except Exception as e:
             result.status = AgentStatus.FAILED
             result.error_message = str(e)
-            import traceback
-            result.error_traceback = traceback.format_exc()
+            result.set_exception(e)
+
+        finally:
+            result.end_time = datetime.now()
+            result.duration_seconds = time.perf_counter() - t0
+
+        return result
+
+    def run_batch(self, inputs_list: List[Dict[str, Any]]) -> List[AgentResult]:
+        """
+        Execute the agent for several inputs (e.g. several patients).
+
+        Prompts for all valid, non-stub inputs are rendered up front and
+        sent to the backend in one generate() call; each input is then run
+        as usual, with invoke_llm() answering from the batch instead of
+        making its own call. Identical prompts (e.g. a case replayed
+        several times for RLHF) are generated once and share the
+        response. Output constraints from _llm_kwargs() apply to every
+        prompt of the batch. Results are returned in input order.
+
+        Args:
+            inputs_list: List of input dictionaries for this agent
+
+        Returns:
+            List of AgentResult, one per input
+        """
+        # Copies, since _build_prompt may fill in derived inputs
+        inputs_list = [dict(inputs) for inputs in inputs_list]
+
+        llm_inputs = [
+            inputs
+            for inputs in inputs_list
+            if self._needs_llm(inputs) and self._validate_input(inputs) is None
+        ]
+        # dict.fromkeys: distinct prompts, in input order
+        prompts = list(dict.fromkeys(self._build_prompt(inputs) for inputs in llm_inputs))
+
+        if prompts:
+            self.load_model(max(self._context_length(inputs) for inputs in llm_inputs))
+            llm_result = self._model.generate(prompts, **self._llm_kwargs())
+            self._batched_responses = {
+                prompt: generations[0].text
+                for prompt, generations in zip(prompts, llm_result.generations)
+            }
+
+        try:
+            return [self.run(inputs) for inputs in inputs_list]
+        finally:
+            self._batched_responses = {}
+
+    async def arun(self, inputs: Dict[str, Any]) -> AgentResult:
+        """
+        Execute the agent from async code, batching concurrent calls.
+
+        Calls made within config.batch_window_ms of each other (e.g. one
+        per patient during multi-patient intake) are handed to
+        run_batch() together, up to config.max_batch_size, so the backend
+        sees one generate() call instead of a queue of single requests.
+        A lone call just waits out the window and runs on its own.
+
+        Args:
+            inputs: Dictionary of inputs for this agent
+
+        Returns:
+            AgentResult with outputs and metadata
+        """
+        loop = asyncio.get_running_loop()
+        if self._batcher is None or self._batcher.loop is not loop:
+            self._batcher = _MicroBatcher(
+                self,
+                self.config.batch_window_ms / 1000,
+                self.config.max_batch_size,
+            )
+        return await self._batcher.submit(inputs)
+
+    def dry_run(self, inputs: Dict[str, Any]) -> AgentResult:
+        """
+        Validate inputs and render the prompt without loading the model.
+
+        Useful for CI, cost estimation and catching config/template
+        errors without paying the multi-GB model load. The token count
+        comes from count_prompt_tokens(): the model's tokenizer if one is
+        already loaded, otherwise the space-count estimate.
+
+        Args:
+            inputs: Dictionary of inputs for this agent
+
+        Returns:
+            AgentResult with the rendered prompt and its size estimates
+        """
+        t0 = time.perf_counter()
+        result = AgentResult(
+            agent_id=self.config.agent_id,
+            agent_type=self.AGENT_TYPE,
+            status=AgentStatus.PENDING,
+            start_time=datetime.now(),
+        )
+
+        try:
+            validation_error = self._validate_input(inputs)
+            if validation_error:
+                result.status = AgentStatus.FAILED
+                result.error_message = validation_error
+                return result
+
+            prompt = self._build_prompt(dict(inputs))
+            result.tokens_input = self.count_prompt_tokens(prompt)
+            result.outputs = {
+                "dry_run": True,
+                "prompt": prompt,
+                "prompt_chars": len(prompt),
+                "estimated_input_tokens": result.tokens_input,
+                "context_length": self.config.model.context_length,
+            }
+            result.status = AgentStatus.COMPLETED
+
+        except Exception as e:
+            result.status = AgentStatus.FAILED
+            result.error_message = str(e)
+            result.set_exception(e)
 
         finally:
             result.end_time = datetime.now()
-            if result.start_time:
-                result.duration_seconds = (
-                    result.end_time - result.start_time
-                ).total_seconds()
+            result.duration_seconds = time.perf_counter() - t0
 
         return result
 
+    def _build_prompt(self, inputs: Dict[str, Any]) -> str:
+        """
+        Build the LLM prompt for a set of inputs.
+
+        Subclasses override this to map their inputs onto template
+        variables; _execute() and run_batch() both go through it, so the
+        two render identical prompts. Implementations may store derived
+        values (e.g. a generated ID) back into `inputs`.
+
+        Args:
+            inputs: Validated input dictionary
+
+        Returns:
+            Rendered prompt string
+        """
+        return self.render_prompt(inputs)
+
     @abstractmethod
     def _execute(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
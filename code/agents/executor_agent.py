@@ -40,12 +40,396 @@ Sandboxing: File system restricted, network to approved endpoints only
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 from enum import Enum
+from collections import OrderedDict
 import asyncio
+import concurrent.futures
+import functools
 import json
+import logging
+import random
+import re
+import threading
 import time
 
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoder
+    orjson = None
+
+if TYPE_CHECKING:
+    from code.biotools.base_tool import Variant
+
+logger = logging.getLogger(__name__)
+
+
+# "chr:pos:ref>alt" variant keys, e.g. "chr17:43045712:G>A"
+_VARIANT_RE = re.compile(
+    r"^(?P<chrom>[^:]+):(?P<pos>\d+):(?P<ref>[ACGT]+)>(?P<alt>[ACGT]+)$"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_variant_string(v_str: str) -> Optional[Tuple[str, int, str, str]]:
+    """
+    Parse a "chr:pos:ref>alt" variant string, memoized per string.
+
+    Returns (chromosome, position, reference, alternate), or None if the
+    string is not in that form.
+    """
+    match = _VARIANT_RE.match(v_str)
+    if match is None:
+        return None
+    return match["chrom"], int(match["pos"]), match["ref"], match["alt"]
+
+
+# Per-variant answers that are stable enough to cache
+_CACHEABLE_QUERY_STATUSES = frozenset({"success", "not_found"})
+
+# Per-variant query statuses (code.biotools.base_tool.ToolStatus values)
+# worth retrying
+_TRANSIENT_QUERY_STATUSES = frozenset({"rate_limited", "timeout", "unavailable"})
+
+# Exceptions worth retrying: timeouts and connection failures
+_TRANSIENT_ERRORS: Tuple[type, ...] = (TimeoutError, ConnectionError)
+try:
+    import requests
+
+    _TRANSIENT_ERRORS += (requests.ConnectionError, requests.Timeout)
+except ImportError:
+    pass
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    """True for timeouts, connection failures and HTTP 429 / 5xx errors."""
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+def _run_detached(coro: Any) -> Any:
+    """
+    Run `coro` to completion on a new event loop, like asyncio.run().
+
+    asyncio.run() joins the default executor before returning, so a
+    tool query that already timed out would still hold up the caller
+    until its blocking HTTP call returned. Here the worker threads
+    belong to a pool that is shut down with wait=False: abandoned
+    queries finish in the background.
+    """
+    loop = asyncio.new_event_loop()
+    pool = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="executor-tool")
+    loop.set_default_executor(pool)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            pool.shutdown(wait=False)
+            loop.close()
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for asyncio code.
+
+    Allows at most `max_rate` acquisitions per `time_period` seconds;
+    bursts up to `max_rate` are admitted at once, after which callers
+    wait for the bucket to drain.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._level = 0.0
+        self._last_check = 0.0
+        self._lock = asyncio.Lock()
+
+    def _leak(self) -> None:
+        now = time.monotonic()
+        if self._level:
+            elapsed = now - self._last_check
+            self._level = max(self._level - elapsed * self._rate_per_sec, 0.0)
+        self._last_check = now
+
+    async def acquire(self) -> None:
+        """Wait until one more request fits within the rate."""
+        async with self._lock:
+            self._leak()
+            while self._level + 1 > self.max_rate:
+                await asyncio.sleep(
+                    (self._level + 1 - self.max_rate) / self._rate_per_sec
+                )
+                self._leak()
+            self._level += 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+class CircuitBreaker:
+    """
+    Per-tool circuit breaker (CLOSED -> OPEN -> HALF_OPEN -> CLOSED).
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected without touching the backend. Once
+    `recovery_seconds` have passed, one probe call is let through
+    (half-open): success closes the circuit, failure re-opens it. A
+    probe that ends without either (bad input, cancellation) must call
+    release_probe(); a probe that never reports back is given up on
+    after another `recovery_seconds`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+
+    def allow_request(self) -> bool:
+        """Whether a call may proceed (moves OPEN -> HALF_OPEN when due)."""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self._opened_at < self.recovery_seconds:
+                return False
+        elif self.state == self.HALF_OPEN:
+            # Only the single probe call may run while half-open, unless
+            # it has been outstanding so long that it is presumed lost
+            if now - self._probe_started < self.recovery_seconds:
+                return False
+        else:
+            return True
+        self.state = self.HALF_OPEN
+        self._probe_started = now
+        return True
+
+    def release_probe(self) -> None:
+        """
+        End a half-open probe that gave no verdict on the backend.
+
+        The circuit goes back to OPEN without restarting the recovery
+        wait, so the next call probes again.
+        """
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for values the encoder can't handle itself."""
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+class AdmissionController:
+    """
+    Concurrency limit that can shrink and grow while tools are running.
+
+    Works like a semaphore whose size is changed with set_limit(): a
+    counter of active tools guarded by an asyncio.Condition, where
+    acquire() waits until `active < limit`. Lowering the limit never
+    interrupts running tools; new ones just wait until enough finish.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._active = 0
+        self._cond = asyncio.Condition(asyncio.Lock())
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            while self._active >= self._limit:
+                await self._cond.wait()
+            self._active += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_limit(self, limit: int) -> None:
+        """Change the limit; waiters are woken if it grew."""
+        async with self._cond:
+            grew = limit > self._limit
+            self._limit = limit
+            if grew:
+                self._cond.notify_all()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.release()
+
+
+@dataclass(slots=True)
+class _RunContext:
+    """
+    State of one plan execution (see ExecutorAgent._new_run).
+
+    Passed down to every tool call of the run instead of living on the
+    agent, so concurrent runs on one ExecutorAgent keep their own
+    deadline, concurrency limit, rate limiters and bulkheads.
+    """
+    admission: AdmissionController
+    limiters: Dict[str, Tuple[AsyncRateLimiter, ...]]
+    bulkheads: Dict[str, asyncio.Semaphore]
+    deadline: Optional[float] = None  # time.monotonic() value
+    admission_streak: int = 0  # tools completed since the last change
+
+
+class ResponseCache:
+    """
+    LRU cache with a time-to-live for per-variant tool annotations.
+
+    Bio-database answers for a variant do not change within a session,
+    so re-runs over overlapping variant sets can skip the network.
+    Entries expire `ttl` seconds after being stored; past `maxsize`
+    the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Tuple, value: Dict[str, Any]) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass
+class ChaosRule:
+    """
+    Fault-injection settings for chaos-testing the executor.
+
+    Each HTTP request fails with probability `fault_rate`, with the kind
+    of fault drawn from `faults` (name -> relative weight):
+
+        timeout   raise requests.Timeout
+        http_5xx  respond 503 Service Unavailable
+        http_429  respond 429 Too Many Requests
+        slow      delay the real request by `slow_seconds`
+
+    Draws come from random.Random(seed), so runs are reproducible for
+    the same request order.
+    """
+    fault_rate: float = 0.1
+    seed: int = 0
+    faults: Dict[str, float] = field(default_factory=lambda: {
+        "timeout": 1.0, "http_5xx": 1.0, "http_429": 1.0, "slow": 1.0,
+    })
+    slow_seconds: float = 2.0
+
+
+class ChaosSession:
+    """
+    Wraps the shared HTTP session and injects faults per ChaosRule.
+
+    Anything other than get/post/request is passed through to the
+    wrapped session. Injected faults are counted in `fault_counts`.
+    """
+
+    FAULT_KINDS = ("timeout", "http_5xx", "http_429", "slow")
+
+    def __init__(self, session: Any, rule: ChaosRule):
+        unknown = set(rule.faults) - set(self.FAULT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown chaos fault kinds: {sorted(unknown)}")
+        self._session = session
+        self.rule = rule
+        self.fault_counts = {kind: 0 for kind in rule.faults}
+        self._rng = random.Random(rule.seed)
+        self._lock = threading.Lock()  # tools call in from worker threads
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Any:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> Any:
+        import requests
+
+        fault = self._draw_fault()
+        if fault == "timeout":
+            raise requests.Timeout(f"Injected timeout: {method} {url}")
+        if fault in ("http_5xx", "http_429"):
+            response = requests.Response()
+            response.status_code = 503 if fault == "http_5xx" else 429
+            response.reason = "Injected fault"
+            response.url = url
+            response._content = b""
+            return response
+        if fault == "slow":
+            time.sleep(self.rule.slow_seconds)
+        return self._session.request(method, url, **kwargs)
+
+    def _draw_fault(self) -> Optional[str]:
+        with self._lock:
+            if self._rng.random() >= self.rule.fault_rate:
+                return None
+            kinds = list(self.rule.faults)
+            fault = self._rng.choices(kinds, weights=[self.rule.faults[k] for k in kinds])[0]
+            self.fault_counts[fault] += 1
+            return fault
+
 
 class ToolStatus(Enum):
     """Execution status for a tool."""
@@ -57,16 +441,22 @@ class ToolStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
-    """Result from a single bio-tool execution."""
+    """
+    Result from a single bio-tool execution.
+
+    The collection fields default to None rather than fresh empty
+    containers, since most results never fill some of them; to_dict()
+    reports None as an empty list/dict.
+    """
     tool_name: str
     status: ToolStatus
-    variants_queried: List[str] = field(default_factory=list)
+    variants_queried: Optional[List[str]] = None
 
     # Results
-    results: Dict[str, Any] = field(default_factory=dict)
-    annotations: List[Dict[str, Any]] = field(default_factory=list)
+    results: Optional[Dict[str, Any]] = None
+    annotations: Optional[List[Dict[str, Any]]] = None
 
     # Timing
     start_time: Optional[datetime] = None
@@ -85,9 +475,9 @@ class ToolResult:
         return {
             "tool_name": self.tool_name,
             "status": self.status.value,
-            "variants_queried": self.variants_queried,
-            "results": self.results,
-            "annotations": self.annotations,
+            "variants_queried": self.variants_queried or [],
+            "results": self.results or {},
+            "annotations": self.annotations or [],
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "duration_seconds": self.duration_seconds,
@@ -97,8 +487,38 @@ class ToolResult:
             "rate_limited": self.rate_limited,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize to UTF-8 JSON, equivalent to dumping to_dict().
 
-@dataclass
+        With orjson installed the enum and datetimes are encoded natively
+        instead of being formatted in Python.
+        """
+        if orjson is not None:
+            return orjson.dumps(
+                self._json_fields(), default=_json_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(self.to_dict(), default=_json_default).encode()
+
+    def _json_fields(self) -> Dict[str, Any]:
+        """to_dict() with the enum and datetimes left for orjson to encode."""
+        return {
+            "tool_name": self.tool_name,
+            "status": self.status,
+            "variants_queried": self.variants_queried or [],
+            "results": self.results or {},
+            "annotations": self.annotations or [],
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_seconds": self.duration_seconds,
+            "error_message": self.error_message,
+            "retry_count": self.retry_count,
+            "api_calls": self.api_calls,
+            "rate_limited": self.rate_limited,
+        }
+
+
+@dataclass(slots=True)
 class ExecutorOutput:
     """Complete output from Executor Agent."""
     tool_results: List[ToolResult]
@@ -109,6 +529,16 @@ class ExecutorOutput:
     # Execution metadata
     execution_id: str = ""
     parallelism_used: int = 1
+    circuit_breakers: Dict[str, str] = field(default_factory=dict)  # tool -> state
+    execution_waves: List[List[str]] = field(default_factory=list)  # tool names per wave
+    cache_hits: int = 0
+    cache_misses: int = 0
+    chaos_faults: Dict[str, int] = field(default_factory=dict)  # injected fault -> count
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -118,7 +548,40 @@ class ExecutorOutput:
             "tools_failed": self.tools_failed,
             "execution_id": self.execution_id,
             "parallelism_used": self.parallelism_used,
+            "circuit_breakers": self.circuit_breakers,
+            "execution_waves": self.execution_waves,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": self.cache_hit_ratio,
+            "chaos_faults": self.chaos_faults,
+        }
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize to UTF-8 JSON, equivalent to dumping to_dict().
+
+        With orjson installed the enums and datetimes are encoded
+        natively instead of being formatted in Python.
+        Prefer this over json.dumps(to_dict()) when handing the output
+        on as JSON.
+        """
+        if orjson is None:
+            return json.dumps(self.to_dict(), default=_json_default).encode()
+        data = {
+            "tool_results": [tr._json_fields() for tr in self.tool_results],
+            "total_duration_seconds": self.total_duration_seconds,
+            "tools_completed": self.tools_completed,
+            "tools_failed": self.tools_failed,
+            "execution_id": self.execution_id,
+            "parallelism_used": self.parallelism_used,
+            "circuit_breakers": self.circuit_breakers,
+            "execution_waves": self.execution_waves,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": self.cache_hit_ratio,
+            "chaos_faults": self.chaos_faults,
         }
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
 
 
 class ExecutorAgent:
@@ -144,11 +607,24 @@ class ExecutorAgent:
         "omim": "OMIMTool",
     }
 
+    # Upper bound on a tool's in-flight requests unless configured
+    DEFAULT_TOOL_CONCURRENCY = 8
+
     def __init__(
         self,
         max_concurrent: int = 3,
         default_timeout: int = 30,
         collect_rlhf: bool = True,
+        rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.2,
+        breaker_failure_threshold: int = 5,
+        breaker_recovery_seconds: float = 30.0,
+        execution_timeout: Optional[float] = None,
+        tool_concurrency: Optional[Dict[str, int]] = None,
+        cache_size: int = 10_000,
+        cache_ttl: float = 3600.0,
+        chaos: Optional[ChaosRule] = None,
     ):
         """
         Initialize Executor Agent.
@@ -157,18 +633,126 @@ class ExecutorAgent:
             max_concurrent: Maximum tools to run in parallel
             default_timeout: Default timeout per tool (seconds)
             collect_rlhf: Whether to collect RLHF feedback
+            rate_limits: Per-tool request rate as (max_requests, period_seconds).
+                         Tools not listed use their own rate_limit_per_second
+                         and rate_limit_per_minute.
+            max_retries: Retries for transient tool failures (429, timeouts,
+                         connection errors)
+            retry_base_delay: Base delay (seconds) for jittered exponential backoff
+            breaker_failure_threshold: Consecutive failures before a tool's
+                                       circuit opens and it is skipped
+            breaker_recovery_seconds: Time before an open circuit lets a
+                                      probe call through
+            execution_timeout: Deadline (seconds) for the whole plan; inputs
+                               may override it with 'deadline_seconds'
+            tool_concurrency: Per-tool cap on in-flight requests (bulkhead).
+                              Tools not listed allow
+                              min(DEFAULT_TOOL_CONCURRENCY, rate_limit_per_second).
+            cache_size: Max per-variant annotations kept in the response
+                        cache (0 disables caching)
+            cache_ttl: Seconds a cached annotation stays valid
+            chaos: Fault injection for chaos testing (never in production);
+                   wraps the shared HTTP session in a ChaosSession
         """
         self.max_concurrent = max_concurrent
         self.default_timeout = default_timeout
         self.collect_rlhf = collect_rlhf
+        self.rate_limits = rate_limits or {}
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.execution_timeout = execution_timeout
+        self.tool_concurrency = tool_concurrency or {}
         self._tools = {}
+        # Kept across runs so a backend that is down stays skipped
+        self._breakers = {
+            name: CircuitBreaker(breaker_failure_threshold, breaker_recovery_seconds)
+            for name in self.TOOL_REGISTRY
+        }
+        # Kept across runs: (tool, chrom, pos, ref, alt) -> annotation
+        self._cache = ResponseCache(cache_size, cache_ttl) if cache_size > 0 else None
+        # One pooled HTTP session shared by every tool wrapper
+        self._http = self._create_http_session()
+        if chaos is not None:
+            if self._http is None:
+                logger.warning("Chaos rule ignored: requests is not installed")
+            else:
+                self._http = ChaosSession(self._http, chaos)
         self._load_tools()
 
+    def _create_http_session(self) -> Optional[Any]:
+        """
+        Create the HTTP session shared by all tool wrappers.
+
+        Keep-alive connections are pooled per host, so repeated API calls
+        reuse TCP/TLS connections instead of handshaking per request.
+        """
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            return None
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=len(self.TOOL_REGISTRY),
+            pool_maxsize=self.max_concurrent * 4,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _create_limiters(self) -> Dict[str, Tuple[AsyncRateLimiter, ...]]:
+        """Build the per-tool request rate limiters for one execution."""
+        limiters = {}
+        for name, tool in self._tools.items():
+            if name in self.rate_limits:
+                max_rate, period = self.rate_limits[name]
+                limiters[name] = (AsyncRateLimiter(max_rate, period),)
+            else:
+                limiters[name] = (
+                    AsyncRateLimiter(tool.rate_limit_per_second, 1.0),
+                    AsyncRateLimiter(tool.rate_limit_per_minute, 60.0),
+                )
+        return limiters
+
+    def _create_bulkheads(self) -> Dict[str, asyncio.Semaphore]:
+        """
+        Build the per-tool in-flight request caps for one execution.
+
+        Each backend gets its own ceiling, so a tool with many variants
+        can't take every worker thread while other tools wait.
+        """
+        return {
+            name: asyncio.Semaphore(
+                self.tool_concurrency.get(
+                    name,
+                    max(1, min(self.DEFAULT_TOOL_CONCURRENCY, tool.rate_limit_per_second)),
+                )
+            )
+            for name, tool in self._tools.items()
+        }
+
+    def _new_run(self, deadline_seconds: Optional[float] = None) -> _RunContext:
+        """Fresh admission, limiters and bulkheads for one execution."""
+        return _RunContext(
+            admission=AdmissionController(self.max_concurrent),
+            limiters=self._create_limiters(),
+            bulkheads=self._create_bulkheads(),
+            deadline=(
+                time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+            ),
+        )
+
+    def close(self) -> None:
+        """Close the shared HTTP session and its pooled connections."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+            for tool in self._tools.values():
+                tool.client = None
+
     def _load_tools(self) -> None:
         """Load bio-tool wrappers from registry."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         try:
             from code.biotools import TOOL_REGISTRY
             
@@ -176,7 +760,7 @@ class ExecutorAgent:
             
             for name, tool_class in TOOL_REGISTRY.items():
                 try:
-                    self._tools[name] = tool_class()
+                    self._tools[name] = tool_class(client=self._http)
                 except Exception as e:
                     logger.error(f"Failed to instantiate {name}: {e}")
                     
@@ -189,6 +773,30 @@ class ExecutorAgent:
         """
         Execute bio-tools according to the tool-usage plan.
 
+        Synchronous wrapper around arun(). When called from a thread that
+        already runs an event loop (e.g. a Jupyter kernel), the plan is
+        executed on a fresh loop in a worker thread. Either way run()
+        returns once the plan does: queries that timed out are not
+        waited for.
+
+        Args:
+            inputs: Must contain 'tool_usage_plan' and 'variants_table'
+
+        Returns:
+            Dictionary with tool results and metadata
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return _run_detached(self.arun(inputs))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(_run_detached, self.arun(inputs)).result()
+
+    async def arun(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute bio-tools according to the tool-usage plan (async).
+
         Args:
             inputs: Must contain 'tool_usage_plan' and 'variants_table'
 
@@ -205,18 +813,24 @@ class ExecutorAgent:
         tool_usage_plan = inputs["tool_usage_plan"]
         variants_table = inputs.get("variants_table", [])
 
+        t0 = time.perf_counter()
         start_time = datetime.now()
         execution_id = f"exec_{start_time.strftime('%Y%m%d_%H%M%S')}"
 
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info(f"Starting execution {execution_id}: {len(tool_usage_plan)} tools, {len(variants_table)} variants")
+        hits_before, misses_before = (
+            (self._cache.hits, self._cache.misses) if self._cache is not None else (0, 0)
+        )
+        faults_before = dict(getattr(self._http, "fault_counts", {}))
 
         # Execute tools (prioritized)
-        tool_results = self._execute_tools(tool_usage_plan, variants_table)
+        tool_results = await self._aexecute_tools(
+            tool_usage_plan,
+            variants_table,
+            deadline_seconds=inputs.get("deadline_seconds", self.execution_timeout),
+        )
 
-        end_time = datetime.now()
-        total_duration = (end_time - start_time).total_seconds()
+        total_duration = time.perf_counter() - t0
 
         # Aggregate results
         executor_output = ExecutorOutput(
@@ -226,13 +840,29 @@ class ExecutorAgent:
             tools_failed=sum(1 for tr in tool_results if tr.status in [ToolStatus.FAILED, ToolStatus.TIMEOUT]),
             execution_id=execution_id,
             parallelism_used=self.max_concurrent,
+            circuit_breakers={
+                name: breaker.state for name, breaker in self._breakers.items()
+            },
+            execution_waves=[
+                [tool_usage_plan[i]["tool_name"] for i in wave]
+                for wave in self._plan_dependencies(tool_usage_plan)[0]
+            ],
         )
+        if self._cache is not None:
+            executor_output.cache_hits = self._cache.hits - hits_before
+            executor_output.cache_misses = self._cache.misses - misses_before
+        if isinstance(self._http, ChaosSession):
+            executor_output.chaos_faults = {
+                kind: count - faults_before.get(kind, 0)
+                for kind, count in self._http.fault_counts.items()
+            }
 
         logger.info(f"Execution complete: {total_duration:.2f}s, {executor_output.tools_completed} completed, {executor_output.tools_failed} failed")
 
+        output_dict = executor_output.to_dict()
         result = {
-            "executor_output": executor_output.to_dict(),
-            "tool_results": [tr.to_dict() for tr in tool_results],
+            "executor_output": output_dict,
+            "tool_results": output_dict["tool_results"],
             "execution_id": execution_id,
             "duration_seconds": total_duration,
         }
@@ -258,43 +888,299 @@ class ExecutorAgent:
             if entry["tool_name"] not in self.TOOL_REGISTRY:
                 return f"Unknown tool: {entry['tool_name']}"
 
+        try:
+            self._plan_dependencies(plan)
+        except ValueError as e:
+            return str(e)
+
         return None
 
-    def _execute_tools(
+    async def arun_stream(self, inputs: Dict[str, Any]) -> AsyncIterator[ToolResult]:
+        """
+        Execute the tool-usage plan, yielding each ToolResult as it completes.
+
+        Unlike run()/arun(), which buffer every result into one dict,
+        this lets downstream consumers start on the first annotation
+        while slower tools are still running. Results arrive in
+        completion order, not plan order. Closing the generator early
+        cancels the tools that have not finished yet.
+
+        Args:
+            inputs: Must contain 'tool_usage_plan' and 'variants_table'
+
+        Yields:
+            ToolResult for each plan entry
+
+        Raises:
+            ValueError: If the inputs fail validation
+        """
+        validation_error = self._validate_input(inputs)
+        if validation_error:
+            raise ValueError(validation_error)
+
+        tool_usage_plan = inputs["tool_usage_plan"]
+        variants_table = inputs.get("variants_table", [])
+
+        logger.info(f"Streaming execution: {len(tool_usage_plan)} tools, {len(variants_table)} variants")
+
+        tasks = self._schedule_tools(
+            tool_usage_plan,
+            variants_table,
+            deadline_seconds=inputs.get("deadline_seconds", self.execution_timeout),
+        )
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _aexecute_tools(
         self,
         tool_usage_plan: List[Dict[str, Any]],
         variants_table: List[Dict[str, Any]],
+        deadline_seconds: Optional[float] = None,
     ) -> List[ToolResult]:
         """
         Execute tools according to plan.
 
         Runs high-priority tools first, with parallel execution
-        within priority levels.
-        """
-        import logging
-        logger = logging.getLogger(__name__)
-        results = []
-
-        # Group by priority
-        priority_groups = {"high": [], "medium": [], "low": []}
-        for entry in tool_usage_plan:
-            priority = entry.get("priority", "medium")
-            priority_groups[priority].append(entry)
-
-        # Execute in priority order
-        for priority in ["high", "medium", "low"]:
-            group = priority_groups[priority]
-            if not group:
+        within priority levels (at most max_concurrent tools at once),
+        or follows explicit `depends_on` edges when the plan has them
+        (see _plan_dependencies). Results are returned in wave order.
+        With `deadline_seconds`, every tool's timeout is capped so the
+        whole plan finishes within that budget.
+        """
+        return list(await asyncio.gather(
+            *self._schedule_tools(tool_usage_plan, variants_table, deadline_seconds)
+        ))
+
+    def _schedule_tools(
+        self,
+        tool_usage_plan: List[Dict[str, Any]],
+        variants_table: List[Dict[str, Any]],
+        deadline_seconds: Optional[float] = None,
+    ) -> List["asyncio.Task[ToolResult]"]:
+        """
+        Start one task per plan entry on the running loop.
+
+        Each task waits for its predecessors (see _plan_dependencies)
+        before running its tool. Tasks are returned in wave order.
+        """
+        # Created per run: asyncio primitives belong to the running loop
+        run = self._new_run(deadline_seconds)
+
+        # Index the table and build each queried Variant once, shared by
+        # every tool that queries it
+        variant_objs = self._build_variant_objects(
+            self._index_variants(variants_table),
+            (v for entry in tool_usage_plan for v in entry.get("variants_to_query", [])),
+        )
+
+        waves, predecessors = self._plan_dependencies(tool_usage_plan)
+
+        # One task per entry, started as soon as its predecessors finish
+        tasks: Dict[int, asyncio.Task] = {}
+
+        async def run_entry(i: int) -> ToolResult:
+            if predecessors[i]:
+                await asyncio.wait([tasks[j] for j in predecessors[i]])
+            return await self._aexecute_single_tool(tool_usage_plan[i], variant_objs, run)
+
+        for n, wave in enumerate(waves):
+            logger.debug(f"Scheduling wave {n}: {len(wave)} tools")
+            for i in wave:
+                tasks[i] = asyncio.create_task(run_entry(i))
+
+        return [tasks[i] for wave in waves for i in wave]
+
+    @staticmethod
+    def _plan_dependencies(
+        tool_usage_plan: List[Dict[str, Any]],
+    ) -> Tuple[List[List[int]], Dict[int, List[int]]]:
+        """
+        Work out which plan entries each entry has to wait for.
+
+        If any entry has `depends_on` (a list of tool names), the plan is
+        scheduled as a DAG: an entry starts once the entries it depends
+        on are done, independent of priority. Otherwise high-priority
+        tools run before medium before low, layer by layer.
+
+        Returns:
+            (waves, predecessors): entry indices grouped into layers in
+            dependency order, and entry index -> indices it waits for
+
+        Raises:
+            ValueError: On an unknown dependency or priority, or a cycle
+        """
+        if not any("depends_on" in entry for entry in tool_usage_plan):
+            groups: Dict[str, List[int]] = {"high": [], "medium": [], "low": []}
+            for i, entry in enumerate(tool_usage_plan):
+                priority = entry.get("priority", "medium")
+                if priority not in groups:
+                    raise ValueError(f"tool_usage_plan[{i}] has unknown priority: {priority}")
+                groups[priority].append(i)
+
+            waves = [group for group in groups.values() if group]
+            predecessors: Dict[int, List[int]] = {}
+            previous: List[int] = []
+            for wave in waves:
+                for i in wave:
+                    predecessors[i] = previous
+                previous = wave
+            return waves, predecessors
+
+        by_tool: Dict[str, List[int]] = {}
+        for i, entry in enumerate(tool_usage_plan):
+            by_tool.setdefault(entry["tool_name"], []).append(i)
+
+        predecessors = {}
+        for i, entry in enumerate(tool_usage_plan):
+            deps = entry.get("depends_on") or []
+            if isinstance(deps, str):
+                deps = [deps]
+            preds = set()
+            for dep in deps:
+                if dep not in by_tool:
+                    raise ValueError(
+                        f"tool_usage_plan[{i}] depends on '{dep}', which is not in the plan"
+                    )
+                preds.update(j for j in by_tool[dep] if j != i)
+            predecessors[i] = sorted(preds)
+
+        # Kahn's algorithm, one layer at a time
+        waves = []
+        done: set = set()
+        remaining = {i: set(preds) for i, preds in predecessors.items()}
+        while remaining:
+            wave = [i for i, preds in remaining.items() if preds <= done]
+            if not wave:
+                cycle = ", ".join(tool_usage_plan[i]["tool_name"] for i in remaining)
+                raise ValueError(f"Cyclic depends_on between tools: {cycle}")
+            waves.append(wave)
+            done.update(wave)
+            for i in wave:
+                del remaining[i]
+        return waves, predecessors
+
+    async def _aquery_with_retry(
+        self,
+        tool_instance: Any,
+        variants: List["Variant"],
+        result: ToolResult,
+        run: _RunContext,
+    ) -> List[Any]:
+        """
+        Query a tool for `variants`, retrying transient failures.
+
+        Per-variant results that come back rate-limited or timed out, and
+        transient network exceptions, are retried up to max_retries times
+        with full-jitter exponential backoff. Anything else (validation
+        errors, auth failures, bugs) is returned or raised as-is.
+        Updates result.api_calls, retry_count and rate_limited.
+        """
+        limiters = run.limiters.get(tool_instance.name, ())
+        bulkhead = run.bulkheads.get(tool_instance.name)
+        tool_results: List[Any] = [None] * len(variants)
+        pending = list(range(len(variants)))
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                result.retry_count += 1
+                await asyncio.sleep(
+                    random.uniform(0, self.retry_base_delay * 2 ** (attempt - 1))
+                )
+
+            result.api_calls += 1 if tool_instance.supports_batch else len(pending)
+            try:
+                batch = await tool_instance.aquery_batch(
+                    [variants[i] for i in pending], limiters=limiters, bulkhead=bulkhead
+                )
+            except Exception as e:
+                if getattr(getattr(e, "response", None), "status_code", None) == 429:
+                    result.rate_limited = True
+                if attempt == self.max_retries or not _is_transient_error(e):
+                    raise
+                logger.debug(f"{tool_instance.name}: transient error ({e}), retrying")
                 continue
 
-            logger.debug(f"Executing {len(group)} {priority}-priority tools")
+            retry = []
+            for i, tool_res in zip(pending, batch):
+                tool_results[i] = tool_res
+                if tool_res.status.value in _TRANSIENT_QUERY_STATUSES:
+                    retry.append(i)
+                    if tool_res.status.value == "rate_limited":
+                        result.rate_limited = True
+            if not retry:
+                break
+            pending = retry
+
+        return tool_results
+
+    @staticmethod
+    def _index_variants(
+        variants_table: List[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Map variant key -> variants_table row (first row wins)."""
+        variants_by_key: Dict[str, Dict[str, Any]] = {}
+        for v in variants_table:
+            variants_by_key.setdefault(v.get("variant"), v)
+        return variants_by_key
+
+    @classmethod
+    def _build_variant_objects(
+        cls,
+        variants_by_key: Dict[str, Dict[str, Any]],
+        variant_strs: Iterable[str],
+    ) -> Dict[str, "Variant"]:
+        """Build one Variant per queried key found in the table."""
+        variant_objs: Dict[str, "Variant"] = {}
+        for v_str in variant_strs:
+            if v_str in variant_objs:
+                continue
+            v_data = variants_by_key.get(v_str)
+            if v_data:
+                variant_objs[v_str] = cls._build_variant(v_str, v_data)
+        return variant_objs
+
+    async def _aexecute_single_tool(
+        self,
+        tool_entry: Dict[str, Any],
+        variant_objs: Dict[str, "Variant"],
+        run: _RunContext,
+    ) -> ToolResult:
+        """
+        Execute a single bio-tool as part of `run`.
+
+        Tool wrappers are synchronous (blocking HTTP / database calls),
+        so queries run in a worker thread to keep the event loop free.
+        """
+        async with run.admission:
+            result = await self._aexecute_single_tool_unbounded(
+                tool_entry, variant_objs, run
+            )
+        await self._adjust_admission(result, run)
+        return result
 
-            # In production, would use asyncio for parallel execution
-            for entry in group:
-                result = self._execute_single_tool(entry, variants_table)
-                results.append(result)
+    async def _adjust_admission(self, result: ToolResult, run: _RunContext) -> None:
+        """
+        Back off on rate limiting, recover on sustained success.
 
-        return results
+        A tool that hit a 429 lowers the concurrency limit by one (down
+        to 1); every `limit` consecutive completed tools raise it by one,
+        up to max_concurrent.
+        """
+        limit = run.admission.limit
+        if result.rate_limited:
+            run.admission_streak = 0
+            if limit > 1:
+                await run.admission.set_limit(limit - 1)
+                logger.debug(f"{result.tool_name} rate limited; concurrency -> {limit - 1}")
+        elif result.status == ToolStatus.COMPLETED:
+            run.admission_streak += 1
+            if run.admission_streak >= limit and limit < self.max_concurrent:
+                run.admission_streak = 0
+                await run.admission.set_limit(limit + 1)
 
     def _execute_single_tool(
         self,
@@ -302,13 +1188,33 @@ class ExecutorAgent:
         variants_table: List[Dict[str, Any]],
     ) -> ToolResult:
         """
-        Execute a single bio-tool.
+        Synchronous shim over _aexecute_single_tool, for callers (e.g.
+        tests) that run one tool outside an event loop. The tool gets a
+        run of its own, so it never shares state with a live arun().
         """
+        variant_objs = self._build_variant_objects(
+            self._index_variants(variants_table),
+            tool_entry.get("variants_to_query", []),
+        )
+        return _run_detached(
+            self._aexecute_single_tool_unbounded(tool_entry, variant_objs, self._new_run())
+        )
+
+    async def _aexecute_single_tool_unbounded(
+        self,
+        tool_entry: Dict[str, Any],
+        variant_objs: Dict[str, "Variant"],
+        run: _RunContext,
+    ) -> ToolResult:
+        """Body of _aexecute_single_tool, without the concurrency bound."""
         tool_name = tool_entry["tool_name"]
         timeout = tool_entry.get("timeout_seconds", self.default_timeout)
         variants_to_query = tool_entry.get("variants_to_query", [])
         parameters = tool_entry.get("parameters", {})
 
+        # Wall-clock times are for the audit trail; durations use the
+        # monotonic perf_counter so they can't go negative on clock changes
+        t0 = time.perf_counter()
         result = ToolResult(
             tool_name=tool_name,
             status=ToolStatus.PENDING,
@@ -316,93 +1222,158 @@ class ExecutorAgent:
             start_time=datetime.now(),
         )
 
-        import logging
-        logger = logging.getLogger(__name__)
+        breaker = self._breakers.get(tool_name)
+        probing = False  # this call is the breaker's half-open probe
 
         try:
+            if breaker is not None:
+                if not breaker.allow_request():
+                    # Fast-fail instead of waiting on a backend that keeps failing
+                    result.status = ToolStatus.SKIPPED
+                    result.error_message = f"Circuit open for {tool_name}; skipped"
+                    return result
+                probing = breaker.state == CircuitBreaker.HALF_OPEN
+
             result.status = ToolStatus.RUNNING
             logger.debug(f"Running {tool_name}...")
             
             tool_instance = self._tools.get(tool_name)
             
             if tool_instance:
-                from code.biotools.base_tool import Variant
-                
-                # Execute against actual tool
-                annotations = []
+                # Collect the pre-built variants, then query the tool once
+                # for all of them (annotations keep plan order)
+                annotations: List[Optional[Dict[str, Any]]] = []
+                to_query = []
+                slots = []
+                cache_keys = []
                 for v_str in variants_to_query:
-                    # Find variant data in table
-                    v_data = next((v for v in variants_table if v.get("variant") == v_str), None)
-                    
-                    if v_data:
-                        # Construct Variant object (parsing HGVS/strings if needed)
-                        # For now, we assume simple mapping if fields exist
-                        # Use split for CHR:POS:REF:ALT if formatted that way
-                        
-                        # Fallback parsing for HGVS strings if structure is missing
-                        chrom = v_data.get("chromosome")
-                        pos = v_data.get("position")
-                        ref = v_data.get("reference")
-                        alt = v_data.get("alternate")
-                        
-                        # Try to parse from variant string if fields missing
-                        if not all([chrom, pos, ref, alt]) and ":" in v_str and ">" in v_str:
-                             try:
-                                 # Very basic parsing: chr:pos:ref>alt
-                                 parts = v_str.replace(">", ":").split(":")
-                                 if len(parts) >= 4:
-                                     chrom = parts[0]
-                                     pos = int(parts[1])
-                                     ref = parts[2]
-                                     alt = parts[3]
-                             except:
-                                 pass
-
-                        variant_obj = Variant(
-                            chromosome=chrom,
-                            position=int(pos) if pos else None,
-                            reference=ref,
-                            alternate=alt,
-                            gene=v_data.get("gene"),
-                            hgvs_c=v_str if v_str.startswith("c.") else None,
-                            hgvs_p=v_data.get("protein_change"),
-                            zygosity=v_data.get("zygosity")
-                        )
-                        
-                        tool_res = tool_instance.query(variant_obj)
-                        annotations.append(tool_res.to_dict())
-                        result.api_calls += 1
+                    variant_obj = variant_objs.get(v_str)
+
+                    if variant_obj is not None:
+                        key = self._cache_key(tool_name, variant_obj)
+                        cached = self._cache.get(key) if key is not None else None
+                        if cached is not None:
+                            annotations.append(dict(cached))
+                            continue
+                        slots.append(len(annotations))
+                        annotations.append(None)
+                        to_query.append(variant_obj)
+                        cache_keys.append(key)
                     else:
                         annotations.append({"variant": v_str, "error": "Variant data not found in table"})
 
+                if to_query:
+                    # Bound the tool (including retries) by its timeout and
+                    # whatever remains of the plan deadline. Worker threads
+                    # cannot be cancelled, but the executor stops waiting.
+                    if run.deadline is not None:
+                        timeout = min(timeout, run.deadline - time.monotonic())
+                        if timeout <= 0:
+                            # Not the backend's fault; leave the breaker alone
+                            result.status = ToolStatus.TIMEOUT
+                            result.error_message = "Plan deadline exceeded before tool started"
+                            return result
+                    tool_results = await asyncio.wait_for(
+                        self._aquery_with_retry(tool_instance, to_query, result, run),
+                        timeout=timeout,
+                    )
+                    unresolved = []
+                    for i, key, tool_res in zip(slots, cache_keys, tool_results):
+                        annotations[i] = tool_res.to_dict()
+                        if key is not None and tool_res.status.value in _CACHEABLE_QUERY_STATUSES:
+                            self._cache.set(key, annotations[i])
+                        if tool_res.status.value in _TRANSIENT_QUERY_STATUSES:
+                            unresolved.append(tool_res)
+
+                    if unresolved:
+                        # Still failing after every retry: the backend is in
+                        # trouble, so this counts against the circuit
+                        result.annotations = annotations
+                        result.status = ToolStatus.FAILED
+                        result.error_message = (
+                            f"{len(unresolved)} of {len(tool_results)} {tool_name} "
+                            f"queries failed after {result.retry_count} retries "
+                            f"({unresolved[0].status.value}: {unresolved[0].error_message})"
+                        )
+                        if breaker is not None:
+                            breaker.record_failure()
+                        return result
+
                 result.annotations = annotations
                 result.status = ToolStatus.COMPLETED
 
             else:
                 # Fallback to stub if tool not loaded
-                time.sleep(0.1)  # Simulated latency
+                await asyncio.sleep(0.1)  # Simulated latency (yields the loop)
                 result.annotations = self._stub_tool_results(
                     tool_name, variants_to_query, parameters
                 )
                 result.api_calls = len(variants_to_query) or 1
                 result.status = ToolStatus.COMPLETED
 
-        except TimeoutError:
+        except asyncio.TimeoutError:
             result.status = ToolStatus.TIMEOUT
-            result.error_message = f"Tool timed out after {timeout}s"
+            result.error_message = f"Tool timed out after {timeout:.3g}s"
+            if breaker is not None:
+                breaker.record_failure()
 
         except Exception as e:
             result.status = ToolStatus.FAILED
             result.error_message = str(e)
+            # Only backend trouble counts against the circuit, not bad input
+            if breaker is not None and _is_transient_error(e):
+                breaker.record_failure()
+
+        else:
+            if breaker is not None:
+                breaker.record_success()
 
         finally:
+            # A probe that recorded neither success nor failure (deadline,
+            # bad input, cancellation) must not leave the circuit half-open
+            if probing and breaker.state == CircuitBreaker.HALF_OPEN:
+                breaker.release_probe()
+            result.duration_seconds = time.perf_counter() - t0
             result.end_time = datetime.now()
-            result.duration_seconds = (
-                result.end_time - result.start_time
-            ).total_seconds()
 
         return result
 
+    def _cache_key(self, tool_name: str, variant: "Variant") -> Optional[Tuple]:
+        """Response-cache key, or None if caching is off or the variant lacks coordinates."""
+        if self._cache is None or variant.chromosome is None or variant.position is None:
+            return None
+        return (
+            tool_name, variant.chromosome, variant.position,
+            variant.reference, variant.alternate,
+        )
+
+    @staticmethod
+    def _build_variant(v_str: str, v_data: Dict[str, Any]) -> "Variant":
+        """Construct a Variant from a variants_table row and its key."""
+        from code.biotools.base_tool import Variant
+
+        chrom = v_data.get("chromosome")
+        pos = v_data.get("position")
+        ref = v_data.get("reference")
+        alt = v_data.get("alternate")
+
+        # Fall back to parsing the variant string if fields are missing
+        if not all([chrom, pos, ref, alt]):
+            parsed = _parse_variant_string(v_str)
+            if parsed is not None:
+                chrom, pos, ref, alt = parsed
+
+        return Variant(
+            chromosome=chrom,
+            position=int(pos) if pos else None,
+            reference=ref,
+            alternate=alt,
+            gene=v_data.get("gene"),
+            hgvs_c=v_str if v_str.startswith("c.") else None,
+            hgvs_p=v_data.get("protein_change"),
+            zygosity=v_data.get("zygosity")
+        )
+
     def _stub_tool_results(
         self,
         tool_name: str,
@@ -11,7 +11,7 @@ critical artifacts:
 
 Model Selection Rationale:
 --------------------------
-Qwen 2.5 14B Instruct (Q4_K_M quantization)
+Qwen 2.5 14B Instruct (w8a8, or opt-in FP8, via vLLM on Linux GPUs; Q4_K_M GGUF via llama.cpp)
 
 Why this model?
 1. STRONG MULTI-STEP REASONING: This is the most demanding cognitive task
@@ -42,10 +42,27 @@ Context Length: 32K tokens
 Temperature: 0.3 (moderate for balanced reasoning)
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import platform
+import re
+import sys
+from collections import OrderedDict
+import functools
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoder
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional typed JSON decoder
+    msgspec = None
+
 from .base_agent import (
     BaseAgent,
     AgentConfig,
@@ -70,7 +87,12 @@ class ToolPriority(Enum):
     LOW = "low"
 
 
-@dataclass
+# LLM string -> enum, for coercing parsed rows without Enum(value) raising
+_PATHOGENICITY_BY_VALUE: Dict[str, PathogenicityClass] = {c.value: c for c in PathogenicityClass}
+_TOOL_PRIORITY_BY_VALUE: Dict[str, ToolPriority] = {p.value: p for p in ToolPriority}
+
+
+@dataclass(slots=True)
 class DiagnosisEntry:
     """A single diagnosis in the differential."""
     diagnosis: str
@@ -93,7 +115,7 @@ class DiagnosisEntry:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class VariantEntry:
     """A prioritized variant for investigation."""
     gene: str
@@ -105,6 +127,14 @@ class VariantEntry:
     rationale: str = ""
     associated_diagnoses: List[str] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        # Gene symbols and HGVS strings recur across tables, plans and
+        # patients; interned, they compare and hash by identity
+        if type(self.gene) is str:
+            self.gene = sys.intern(self.gene)
+        if type(self.variant) is str:
+            self.variant = sys.intern(self.variant)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "gene": self.gene,
@@ -118,12 +148,13 @@ class VariantEntry:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolUsageEntry:
     """A planned bio-tool execution."""
     tool_name: str
     priority: ToolPriority = ToolPriority.MEDIUM
-    variants_to_query: List[str] = field(default_factory=list)
+    # May be a tuple shared with other entries of the plan (never mutate)
+    variants_to_query: Sequence[str] = field(default_factory=list)
     expected_evidence: str = ""
     timeout_seconds: int = 30
     parameters: Dict[str, Any] = field(default_factory=dict)
@@ -132,14 +163,14 @@ class ToolUsageEntry:
         return {
             "tool_name": self.tool_name,
             "priority": self.priority.value,
-            "variants_to_query": self.variants_to_query,
+            "variants_to_query": list(self.variants_to_query),
             "expected_evidence": self.expected_evidence,
             "timeout_seconds": self.timeout_seconds,
             "parameters": self.parameters,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class StructuringOutput:
     """Complete output from Structuring Agent."""
     diagnostic_table: List[DiagnosisEntry]
@@ -163,6 +194,275 @@ class StructuringOutput:
             },
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize to UTF-8 JSON, equivalent to dumping to_dict().
+
+        With orjson installed the entry dataclasses and their enums are
+        encoded natively, without building per-entry dicts first.
+        """
+        if orjson is None:
+            return json.dumps(self.to_dict()).encode()
+        return orjson.dumps({
+            "diagnostic_table": self.diagnostic_table,
+            "variants_table": self.variants_table,
+            "tool_usage_plan": self.tool_usage_plan,
+            "reasoning": {
+                "phenotype_analysis": self.phenotype_analysis,
+                "variant_interpretation": self.variant_interpretation,
+                "tool_selection_rationale": self.tool_selection_rationale,
+            },
+        })
+
+
+if msgspec is not None:
+    # Typed mirrors of the entries for msgspec's schema-specialized
+    # decoder. Required fields are those STRUCTURING_JSON_SCHEMA requires,
+    # so grammar-constrained output always decodes; anything else raises
+    # and goes through the tolerant parser instead.
+    class _DiagnosisMsg(msgspec.Struct, kw_only=True):
+        diagnosis: str
+        omim_id: Optional[str] = None
+        confidence: float
+        inheritance: Optional[str] = None
+        supporting_evidence: List[str] = []
+        contradicting_evidence: List[str] = []
+        rank: int
+
+    class _VariantMsg(msgspec.Struct, kw_only=True):
+        gene: str
+        variant: str
+        protein_change: Optional[str] = None
+        zygosity: str = "unknown"
+        pathogenicity_class: PathogenicityClass
+        priority: int
+        rationale: str = ""
+        associated_diagnoses: List[str] = []
+
+    class _ToolUsageMsg(msgspec.Struct, kw_only=True):
+        tool_name: str
+        priority: ToolPriority
+        variants_to_query: List[str]
+        expected_evidence: str = ""
+        timeout_seconds: int = 30
+        parameters: Dict[str, Any] = {}
+
+    class _ReasoningMsg(msgspec.Struct, frozen=True):
+        phenotype_analysis: str = ""
+        variant_interpretation: str = ""
+        tool_selection_rationale: str = ""
+
+    class _StructuringMsg(msgspec.Struct):
+        diagnostic_table: List[_DiagnosisMsg]
+        variants_table: List[_VariantMsg] = []
+        tool_usage_plan: List[_ToolUsageMsg] = []
+        reasoning: _ReasoningMsg = _ReasoningMsg()
+
+    _STRUCTURING_DECODER = msgspec.json.Decoder(_StructuringMsg)
+
+
+def _decode_structuring(response: str) -> Optional[StructuringOutput]:
+    """
+    StructuringOutput from schema-conformant JSON via msgspec.
+
+    None if msgspec is not installed, the response is not exactly the
+    schema's JSON, or the diagnostic table is empty.
+    """
+    if msgspec is None:
+        return None
+    try:
+        msg = _STRUCTURING_DECODER.decode(response)
+    except (msgspec.DecodeError, msgspec.ValidationError):
+        return None
+    if not msg.diagnostic_table:
+        return None
+    asdict = msgspec.structs.asdict
+    return StructuringOutput(
+        diagnostic_table=[DiagnosisEntry(**asdict(d)) for d in msg.diagnostic_table],
+        variants_table=[VariantEntry(**asdict(v)) for v in msg.variants_table],
+        tool_usage_plan=[ToolUsageEntry(**asdict(t)) for t in msg.tool_usage_plan],
+        phenotype_analysis=msg.reasoning.phenotype_analysis,
+        variant_interpretation=msg.reasoning.variant_interpretation,
+        tool_selection_rationale=msg.reasoning.tool_selection_rationale,
+    )
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _normalize_text(value: Any) -> Any:
+    """value with every string lowercased and its whitespace collapsed."""
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {k: _normalize_text(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_text(v) for v in value]
+    return value
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@functools.lru_cache(maxsize=4)
+def _tools_text(tools: Tuple[str, ...]) -> str:
+    """The {available_tools} prompt text, rendered once per tool list."""
+    return str(list(tools))
+
+_Entry = TypeVar("_Entry")
+
+# Parse defaults where they differ from the dataclass defaults ("rank" and
+# "priority" default to the row position)
+_DIAGNOSIS_DEFAULTS: Dict[str, Any] = {"diagnosis": "Unknown", "confidence": 0.5}
+_VARIANT_DEFAULTS: Dict[str, Any] = {"gene": "UNKNOWN", "variant": ""}
+_TOOL_DEFAULTS: Dict[str, Any] = {"tool_name": ""}
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> FrozenSet[str]:
+    return frozenset(f.name for f in fields(cls))
+
+
+def _entry_from_dict(cls: Type[_Entry], data: Dict[str, Any], defaults: Dict[str, Any]) -> _Entry:
+    """
+    Build a table entry from an LLM row in one merge.
+
+    Keys the LLM left out take `defaults`, then the dataclass defaults;
+    keys the entry does not have are dropped.
+    """
+    known = _field_names(cls)
+    return cls(**{**defaults, **{k: v for k, v in data.items() if k in known}})
+
+
+def _tool_entry(data: Dict[str, Any]) -> ToolUsageEntry:
+    """ToolUsageEntry from an LLM row, with an unknown priority read as medium."""
+    entry = _entry_from_dict(ToolUsageEntry, data, _TOOL_DEFAULTS)
+    priority = entry.priority
+    entry.priority = (
+        _TOOL_PRIORITY_BY_VALUE.get(priority, ToolPriority.MEDIUM)
+        if isinstance(priority, str) else ToolPriority.MEDIUM
+    )
+    return entry
+
+
+class StructuringCache:
+    """
+    Reuses structuring outputs across repeated patient contexts.
+
+    RLHF re-runs typically resubmit the same case. A lookup hits only
+    when everything that can change the differential is identical: every
+    field of every variant (zygosity included), demographics, family
+    history, previous tool results and the clinical text, compared as a
+    hash of its case- and whitespace-normalized JSON.
+
+    Near matches are opt-in: with `min_similarity` set, a context whose
+    clinical text differs but has a word-set Jaccard similarity of at
+    least `min_similarity` with a stored one also hits. Word sets ignore
+    negation and word order ("no cardiomyopathy" matches
+    "cardiomyopathy"), so leave it off unless the edits being tolerated
+    are known to be cosmetic.
+
+    Outputs are stored as JSON, so callers get their own copy to edit.
+    At most `maxsize` contexts are kept, least recently used evicted.
+    """
+
+    def __init__(self, maxsize: int = 256, min_similarity: Optional[float] = None):
+        self.maxsize = maxsize
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.misses = 0
+        # non-text key -> [(text hash, clinical words, output JSON)],
+        # buckets in LRU order
+        self._buckets: "OrderedDict[Tuple, List[Tuple[bytes, FrozenSet[str], bytes]]]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def _features(
+        patient_context: Dict[str, Any], previous_tool_results: Any
+    ) -> Tuple[Tuple, bytes, FrozenSet[str]]:
+        """(non-text key, clinical text hash, clinical words) of a context."""
+        variants = tuple(sorted(
+            json.dumps(v, sort_keys=True, default=str)
+            for v in patient_context.get("variants", [])
+        ))
+        presentation = patient_context.get("clinical_presentation")
+        family_history = (
+            presentation.get("family_history") if isinstance(presentation, dict) else None
+        )
+        key = (
+            variants,
+            json.dumps(patient_context.get("demographics"), sort_keys=True, default=str),
+            json.dumps(family_history, sort_keys=True, default=str),
+            json.dumps(previous_tool_results, sort_keys=True, default=str),
+        )
+        text = json.dumps(
+            _normalize_text([presentation, patient_context.get("physical_exam")]),
+            sort_keys=True,
+            default=str,
+        )
+        text_hash = hashlib.sha256(text.encode()).digest()
+        return key, text_hash, frozenset(_WORD_RE.findall(text))
+
+    def lookup(
+        self, patient_context: Dict[str, Any], previous_tool_results: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """Cached output for a matching context, or None (not counted)."""
+        key, text_hash, words = self._features(patient_context, previous_tool_results or [])
+        bucket = self._buckets.get(key)
+        if not bucket:
+            return None
+        best = next((out for h, _, out in bucket if h == text_hash), None)
+        if best is None and self.min_similarity is not None:
+            best_similarity = self.min_similarity
+            for _, cached_words, output_json in bucket:
+                union = len(words | cached_words)
+                similarity = len(words & cached_words) / union if union else 1.0
+                if similarity >= best_similarity:
+                    best, best_similarity = output_json, similarity
+        if best is None:
+            return None
+        self._buckets.move_to_end(key)
+        return _json_loads(best)
+
+    def get(
+        self, patient_context: Dict[str, Any], previous_tool_results: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """lookup(), counted in hits/misses."""
+        output = self.lookup(patient_context, previous_tool_results)
+        if output is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return output
+
+    def set(
+        self,
+        patient_context: Dict[str, Any],
+        previous_tool_results: Any,
+        output: Union[Dict[str, Any], bytes],
+    ) -> None:
+        """Store an output dict, or its already-encoded JSON bytes."""
+        if not isinstance(output, bytes):
+            output = json.dumps(output).encode()
+        key, text_hash, words = self._features(patient_context, previous_tool_results or [])
+        self._buckets.setdefault(key, []).append((text_hash, words, output))
+        self._buckets.move_to_end(key)
+        self._size += 1
+        while self._size > self.maxsize:
+            oldest = next(iter(self._buckets.values()))
+            oldest.pop(0)
+            self._size -= 1
+            if not oldest:
+                self._buckets.popitem(last=False)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
 
 class StructuringAgent(BaseAgent):
     """
@@ -181,6 +481,21 @@ class StructuringAgent(BaseAgent):
     DEFAULT_TEMPERATURE = 0.3  # Moderate for reasoning
     DEFAULT_MEMORY_GB = 10.0
 
+    # Context sizing (see _context_length): the smallest window loaded
+    MIN_CONTEXT_LENGTH = 4096
+
+    # vLLM serves a w8a8 checkpoint on Linux GPUs (INT8 tensor cores, half
+    # the weight bytes per decoded token of fp16); the factory falls back
+    # to the Q4_K_M GGUF via llama.cpp if vllm is not installed
+    DEFAULT_BACKEND = "vllm" if platform.system() == "Linux" else "llama.cpp"
+
+    # JSON scaffolding, enum values, OMIM IDs and variant IDs copied from
+    # the prompt are easy to predict, so speculative decoding accepts most
+    # drafted tokens. vLLM drafts with Qwen 2.5 0.5B (same tokenizer as the
+    # 14B); llama.cpp drafts from the prompt itself
+    DEFAULT_DRAFT_MODEL = "Qwen/Qwen2.5-0.5B-Instruct"
+    DEFAULT_NUM_DRAFT_TOKENS = 5
+
     # Available bio-tools for planning
     AVAILABLE_TOOLS = [
         "clinvar",
@@ -191,6 +506,40 @@ class StructuringAgent(BaseAgent):
         "omim",
     ]
 
+    def __init__(
+        self,
+        config: Optional[AgentConfig] = None,
+        cache_size: int = 256,
+        cache_similarity: Optional[float] = None,
+        on_tool: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize the Structuring Agent.
+
+        Args:
+            config: Agent configuration. If None, uses defaults.
+            cache_size: Max LLM outputs kept for repeated patient
+                        contexts (0 disables the cache; see StructuringCache)
+            cache_similarity: If set, also reuse outputs for contexts whose
+                              clinical text has at least this word-set
+                              similarity (off by default: word sets
+                              ignore negation)
+            on_tool: Called with each tool_usage_plan entry (as in
+                     ToolUsageEntry.to_dict()) as soon as the LLM has
+                     generated it, so tool calls can start while the
+                     reasoning section is still being decoded. Not called
+                     for stub runs or cache hits.
+        """
+        super().__init__(config)
+        self.on_tool = on_tool
+        # Kept across runs; only successfully parsed LLM outputs are stored
+        self._cache = (
+            StructuringCache(cache_size, cache_similarity) if cache_size > 0 else None
+        )
+        # (inputs, prompt) rendered by _context_length(), taken by the
+        # _execute() that run() calls next with the same inputs
+        self._sized_prompt: Optional[Tuple[Dict[str, Any], str]] = None
+
     def _default_config(self) -> AgentConfig:
         """Create default configuration for Structuring Agent."""
         return AgentConfig(
@@ -198,10 +547,14 @@ class StructuringAgent(BaseAgent):
             agent_type=self.AGENT_TYPE,
             model=ModelConfig(
                 name=self.DEFAULT_MODEL,
+                backend=self.DEFAULT_BACKEND,
                 quantization=self.DEFAULT_QUANTIZATION,
                 context_length=self.DEFAULT_CONTEXT_LENGTH,
                 temperature=self.DEFAULT_TEMPERATURE,
-                memory_gb=self.DEFAULT_MEMORY_GB,
+                # The vLLM draft model adds ~0.5 GB to the budget
+                memory_gb=self.DEFAULT_MEMORY_GB + 0.5,
+                draft_model=self.DEFAULT_DRAFT_MODEL,
+                num_draft_tokens=self.DEFAULT_NUM_DRAFT_TOKENS,
             ),
             prompt=PromptConfig(
                 template_path="prompts/structuring_v1.yaml",
@@ -242,41 +595,146 @@ class StructuringAgent(BaseAgent):
         This is where the core medical reasoning happens.
         """
         patient_context = inputs["patient_context"]
-        use_stub = inputs.get("use_stub", False)
         previous_tool_results = inputs.get("previous_tool_results", [])
+        use_stub = inputs.get("use_stub", False)
+        sized, self._sized_prompt = self._sized_prompt, None
+
+        # The same context was already structured by the LLM
+        if not use_stub and self._cache is not None:
+            cached = self._cache.get(patient_context, previous_tool_results)
+            if cached is not None:
+                return self._outputs(cached, input_tokens=0, output_tokens=0, cache_hit=True)
+
+        # Build comprehensive prompt with patient data (already rendered
+        # if run() sized the context window for these inputs)
+        if sized is not None and sized[0] is inputs:
+            prompt = sized[1]
+        else:
+            prompt = self._build_prompt(inputs)
+        output: Optional[Dict[str, Any]] = None
 
-        # Build comprehensive prompt with patient data
-        prompt = self.render_prompt({
-            "patient_context": patient_context,
-            "available_tools": self.AVAILABLE_TOOLS,
-            "previous_tool_results": previous_tool_results,
-        })
-
-        # Call LLM via LangChain LlamaCpp
+        # Call LLM via LangChain (LlamaCpp or VLLM)
         if use_stub or self._model is None:
             # Fall back to stub if model not loaded or explicitly requested
             structuring_output = self._stub_structuring(patient_context)
+            output_tokens = 0
+            metrics: Dict[str, Any] = {}
         else:
-            # Invoke LLM and parse JSON response
-            llm_response = self.invoke_llm(prompt)
-            structuring_output = self._parse_llm_response(llm_response, patient_context)
+            # Invoke LLM (streamed, for TTFT/TPOT and on_tool) and parse
+            # the JSON response
+            on_chunk = None
+            if self.on_tool is not None:
+                from code.llm import JSONFieldStream
+
+                on_chunk = JSONFieldStream(
+                    on_item=self._emit_tool, item_keys=("tool_usage_plan",)
+                ).feed
+            llm_response, metrics = self.invoke_llm_with_metrics(prompt, on_chunk)
+            output_tokens = self.count_tokens(llm_response)
+            structuring_output = self._parse_llm_json(llm_response)
+            if structuring_output is None:
+                structuring_output = self._stub_structuring(patient_context)
+            elif self._cache is not None:
+                # Encode once: the cache keeps the bytes and the outputs
+                # are decoded from them
+                output_json = structuring_output.to_json_bytes()
+                self._cache.set(patient_context, previous_tool_results, output_json)
+                output = _json_loads(output_json)
+
+        return self._outputs(
+            output if output is not None else structuring_output.to_dict(),
+            input_tokens=metrics.get("prefill_tokens") or self.count_prompt_tokens(prompt),
+            output_tokens=output_tokens,
+            metrics=metrics,
+            cache_hit=False,
+        )
+
+    def _emit_tool(self, key: str, item: Any) -> None:
+        """Pass a streamed tool_usage_plan entry to on_tool, normalized."""
+        if isinstance(item, dict):
+            self.on_tool(_tool_entry(item).to_dict())
 
+    @staticmethod
+    def _outputs(output: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+        """Agent outputs for a StructuringOutput.to_dict() result."""
         return {
-            "structuring_output": structuring_output.to_dict(),
-            "diagnostic_table": [d.to_dict() for d in structuring_output.diagnostic_table],
-            "variants_table": [v.to_dict() for v in structuring_output.variants_table],
-            "tool_usage_plan": [t.to_dict() for t in structuring_output.tool_usage_plan],
-            "input_tokens": len(prompt.split()),
-            "output_tokens": 2000,  # Placeholder
+            "structuring_output": output,
+            "diagnostic_table": output["diagnostic_table"],
+            "variants_table": output["variants_table"],
+            "tool_usage_plan": output["tool_usage_plan"],
+            **extra,
         }
 
+    def _needs_llm(self, inputs: Dict[str, Any]) -> bool:
+        """Stub runs and cache hits skip the LLM."""
+        if not super()._needs_llm(inputs):
+            return False
+        patient_context = inputs.get("patient_context")
+        return not (
+            self._cache is not None
+            and isinstance(patient_context, dict)
+            and self._cache.lookup(
+                patient_context, inputs.get("previous_tool_results", [])
+            ) is not None
+        )
+
+    def _context_length(self, inputs: Dict[str, Any]) -> int:
+        """
+        Smallest power-of-two window holding the prompt and the output.
+
+        Room is kept for the model's max_tokens, the output limit passed
+        on every call, so a long differential is not cut off by the window.
+
+        Typical prompts need well under the 32K the model supports, and
+        llama.cpp allocates (and MLX grows) the KV cache per context
+        token. Windows are powers of two between MIN_CONTEXT_LENGTH and
+        context_length, so the shared model is reloaded only when a
+        prompt needs a larger window than the resident one. vLLM pages
+        its KV cache on demand and restarting its engine is costly, so
+        it keeps the full window.
+        """
+        full = self.config.model.context_length
+        if self.config.model.backend == "vllm":
+            from code.llm import is_vllm_available
+
+            if is_vllm_available():
+                return full
+        # Kept for _execute(), which would otherwise render it again
+        prompt = self._build_prompt(inputs)
+        self._sized_prompt = (inputs, prompt)
+        # The tokenizer is not loaded yet; ~3 characters per token
+        # overestimates the token count of English and JSON
+        needed = len(prompt) // 3 + self.config.model.max_tokens
+        return min(max(1 << (needed - 1).bit_length(), self.MIN_CONTEXT_LENGTH), full)
+
+    def _output_json_schema(self) -> Optional[Dict[str, Any]]:
+        """Constrain llama.cpp/vLLM decoding to the structuring JSON."""
+        from code.llm import STRUCTURING_JSON_SCHEMA
+
+        return STRUCTURING_JSON_SCHEMA
+
+    def _build_prompt(self, inputs: Dict[str, Any]) -> str:
+        """Render the structuring prompt from patient context and prior tool results."""
+        return self.render_prompt({
+            "patient_context": inputs["patient_context"],
+            "available_tools": _tools_text(tuple(self.AVAILABLE_TOOLS)),
+            "previous_tool_results": inputs.get("previous_tool_results", []),
+        })
+
     def _parse_llm_response(
         self, response: str, patient_context: Dict[str, Any]
     ) -> StructuringOutput:
+        """Parse LLM JSON response, falling back to the stub if it is unusable."""
+        return self._parse_llm_json(response) or self._stub_structuring(patient_context)
+
+    def _parse_llm_json(self, response: str) -> Optional[StructuringOutput]:
         """
-        Parse LLM JSON response into StructuringOutput.
+        Parse LLM JSON response into StructuringOutput (None if unusable).
 
-        Uses the robust JSON extractor with multiple fallback strategies.
+        Grammar-constrained responses (llama.cpp, vLLM) are plain JSON and
+        parse directly, with msgspec's typed decoder when it is installed;
+        otherwise the robust JSON extractor with multiple fallback
+        strategies is used.
         """
         from code.llm import extract_json, STRUCTURING_SCHEMA
         import logging
@@ -284,70 +742,51 @@ class StructuringAgent(BaseAgent):
 
         logger.debug(f"Raw LLM response length: {len(response)} chars")
 
-        # Use robust JSON extractor
-        expected_keys = ["diagnostic_table", "variants_table", "tool_usage_plan"]
-        data, confidence, warnings = extract_json(
-            response,
-            expected_keys=expected_keys,
-            default=STRUCTURING_SCHEMA.copy(),
-        )
+        decoded = _decode_structuring(response)
+        if decoded is not None:
+            return decoded
+
+        try:
+            data = json.loads(response)
+        except ValueError:
+            data = None
+
+        if isinstance(data, dict) and data.get("diagnostic_table"):
+            confidence, warnings = 1.0, []
+        else:
+            # Use robust JSON extractor
+            expected_keys = ["diagnostic_table", "variants_table", "tool_usage_plan"]
+            data, confidence, warnings = extract_json(
+                response,
+                expected_keys=expected_keys,
+                default=STRUCTURING_SCHEMA.copy(),
+            )
         logger.info(f"JSON extraction confidence: {confidence:.2f}")
 
-        # If extraction failed significantly, fall back to stub
+        # If extraction failed significantly, the caller falls back to stub
         if confidence < 0.3 or not data.get("diagnostic_table"):
             logger.warning(f"JSON extraction confidence {confidence:.2f}, falling back to stub. Warnings: {warnings}")
-            return self._stub_structuring(patient_context)
+            return None
 
         # Parse diagnostic table
-        diagnostic_table = []
-        for i, d in enumerate(data.get("diagnostic_table", [])):
-            diagnostic_table.append(DiagnosisEntry(
-                diagnosis=d.get("diagnosis", "Unknown"),
-                omim_id=d.get("omim_id"),
-                confidence=d.get("confidence", 0.5),
-                inheritance=d.get("inheritance"),
-                supporting_evidence=d.get("supporting_evidence", []),
-                contradicting_evidence=d.get("contradicting_evidence", []),
-                rank=d.get("rank", i + 1),
-            ))
+        diagnostic_table = [
+            _entry_from_dict(DiagnosisEntry, d, {**_DIAGNOSIS_DEFAULTS, "rank": i + 1})
+            for i, d in enumerate(data.get("diagnostic_table", []))
+        ]
 
         # Parse variants table
         variants_table = []
         for i, v in enumerate(data.get("variants_table", [])):
-            path_class = v.get("pathogenicity_class", "uncertain_significance")
-            try:
-                classification = PathogenicityClass(path_class)
-            except ValueError:
-                classification = PathogenicityClass.VUS
-
-            variants_table.append(VariantEntry(
-                gene=v.get("gene", "UNKNOWN"),
-                variant=v.get("variant", ""),
-                protein_change=v.get("protein_change"),
-                zygosity=v.get("zygosity", "unknown"),
-                pathogenicity_class=classification,
-                priority=v.get("priority", i + 1),
-                rationale=v.get("rationale", ""),
-                associated_diagnoses=v.get("associated_diagnoses", []),
-            ))
+            entry = _entry_from_dict(VariantEntry, v, {**_VARIANT_DEFAULTS, "priority": i + 1})
+            path_class = entry.pathogenicity_class
+            entry.pathogenicity_class = (
+                _PATHOGENICITY_BY_VALUE.get(path_class, PathogenicityClass.VUS)
+                if isinstance(path_class, str) else PathogenicityClass.VUS
+            )
+            variants_table.append(entry)
 
         # Parse tool usage plan
-        tool_usage_plan = []
-        for t in data.get("tool_usage_plan", []):
-            priority_str = t.get("priority", "medium")
-            try:
-                priority = ToolPriority(priority_str)
-            except ValueError:
-                priority = ToolPriority.MEDIUM
-
-            tool_usage_plan.append(ToolUsageEntry(
-                tool_name=t.get("tool_name", ""),
-                priority=priority,
-                variants_to_query=t.get("variants_to_query", []),
-                expected_evidence=t.get("expected_evidence", ""),
-                timeout_seconds=t.get("timeout_seconds", 30),
-                parameters=t.get("parameters", {}),
-            ))
+        tool_usage_plan = [_tool_entry(t) for t in data.get("tool_usage_plan", [])]
 
         # Get reasoning sections
         reasoning = data.get("reasoning", {})
@@ -556,11 +995,13 @@ class StructuringAgent(BaseAgent):
                 rationale = "[STUB] Requires further analysis"
                 associated = []
 
+            variant_id = v.get("variant", f"{v.get('chromosome', '')}:{v.get('position', '')}")
+            protein_change = v.get("protein_change")
             variants_table.append(
                 VariantEntry(
                     gene=gene,
-                    variant=v.get("variant", f"{v.get('chromosome', '')}:{v.get('position', '')}"),
-                    protein_change=v.get("protein_change"),
+                    variant=variant_id,
+                    protein_change=protein_change,
                     zygosity=v.get("zygosity", "unknown"),
                     pathogenicity_class=path_class,
                     priority=i + 1,
@@ -569,33 +1010,37 @@ class StructuringAgent(BaseAgent):
                 )
             )
 
+        # Tool-plan variant lists, built once and shared between entries
+        variant_ids = tuple(v.variant for v in variants_table)
+        protein_variant_ids = tuple(v.variant for v in variants_table if v.protein_change)
+
         # Create stub tool usage plan
         tool_usage_plan = [
             ToolUsageEntry(
                 tool_name="clinvar",
                 priority=ToolPriority.HIGH,
-                variants_to_query=[v.variant for v in variants_table],
+                variants_to_query=variant_ids,
                 expected_evidence="Clinical significance annotations",
                 timeout_seconds=30,
             ),
             ToolUsageEntry(
                 tool_name="spliceai",
                 priority=ToolPriority.HIGH,
-                variants_to_query=[v.variant for v in variants_table],
+                variants_to_query=variant_ids,
                 expected_evidence="Splice site impact predictions",
                 timeout_seconds=30,
             ),
             ToolUsageEntry(
                 tool_name="alphamissense",
                 priority=ToolPriority.MEDIUM,
-                variants_to_query=[v.variant for v in variants_table if v.protein_change],
+                variants_to_query=protein_variant_ids,
                 expected_evidence="Missense pathogenicity scores",
                 timeout_seconds=30,
             ),
             ToolUsageEntry(
                 tool_name="revel",
                 priority=ToolPriority.MEDIUM,
-                variants_to_query=[v.variant for v in variants_table],
+                variants_to_query=variant_ids,
                 expected_evidence="Ensemble pathogenicity scores",
                 timeout_seconds=30,
             ),
@@ -45,7 +45,7 @@ Temperature: 0.4 (moderate for fluent, creative writing)
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .base_agent import (
     BaseAgent,
@@ -215,7 +215,50 @@ class SynthesisAgent(BaseAgent):
         """
         patient_context = inputs["patient_context"]
         use_stub = inputs.get("use_stub", False)
+        diagnostic_table, variants_table, tool_results = self._gather_evidence(inputs)
 
+        patient_id = inputs.get("patient_id", patient_context.get("patient_id", "UNKNOWN"))
+
+        # Build comprehensive prompt
+        prompt = self._build_prompt(inputs, (diagnostic_table, variants_table, tool_results))
+
+        # Call LLM via LangChain LlamaCpp
+        if use_stub or self._model is None:
+            # Fall back to stub if model not loaded or explicitly requested
+            report = self._generate_stub_report(
+                patient_id,
+                {"diagnostic_table": diagnostic_table, "variants_table": variants_table},
+                {"tool_results": tool_results}
+            )
+            output_tokens = 0
+        else:
+            # Invoke LLM and parse markdown response
+            llm_response = self.invoke_llm(prompt)
+            output_tokens = self.count_tokens(llm_response)
+            report = self._parse_llm_response(
+                llm_response, patient_id, diagnostic_table, variants_table, tool_results
+            )
+
+        return {
+            "report": report.to_dict(),
+            "report_markdown": report.to_markdown(),
+            "diagnostic_report": report.to_markdown(),  # Alias for LangGraph state
+            "report_id": report.report_id,
+            "confidence_score": report.confidence_score,
+            "confidence_scores": {"overall": report.confidence_score},  # For LangGraph
+            "recommendations": self._extract_recommendations(report),
+            "input_tokens": self.count_prompt_tokens(prompt),
+            "output_tokens": output_tokens,
+        }
+
+    def _gather_evidence(
+        self, inputs: Dict[str, Any]
+    ) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        Collect diagnostic table, variants table and tool results.
+
+        Supports both structured and flat (LangGraph node) input formats.
+        """
         # Support both structured and flat input formats
         structuring_output = inputs.get("structuring_output", {})
         executor_output = inputs.get("executor_output", {})
@@ -233,17 +276,30 @@ class SynthesisAgent(BaseAgent):
             "tool_results",
             executor_output.get("tool_results", [])
         )
+        return diagnostic_table, variants_table, tool_results
 
-        patient_id = inputs.get("patient_id", patient_context.get("patient_id", "UNKNOWN"))
+    def _build_prompt(
+        self,
+        inputs: Dict[str, Any],
+        evidence: Optional[Tuple[List[Dict], List[Dict], List[Dict]]] = None,
+    ) -> str:
+        """
+        Render the report prompt with evidence formatted as readable text.
+
+        evidence is the _gather_evidence() result, if the caller already
+        has it; otherwise it is gathered from inputs.
+        """
+        if evidence is None:
+            evidence = self._gather_evidence(inputs)
+        diagnostic_table, variants_table, tool_results = evidence
 
         # Format tool results into readable text for the prompt
         tool_results_text = self._format_tool_results_for_prompt(tool_results)
         diagnostic_summary = self._format_diagnostic_summary(diagnostic_table)
         variants_summary = self._format_variants_summary(variants_table)
 
-        # Build comprehensive prompt
-        prompt = self.render_prompt({
-            "patient_context": patient_context,
+        return self.render_prompt({
+            "patient_context": inputs["patient_context"],
             "diagnostic_table": diagnostic_table,
             "variants_table": variants_table,
             "tool_results": tool_results,
@@ -252,33 +308,6 @@ class SynthesisAgent(BaseAgent):
             "variants_summary": variants_summary,
         })
 
-        # Call LLM via LangChain LlamaCpp
-        if use_stub or self._model is None:
-            # Fall back to stub if model not loaded or explicitly requested
-            report = self._generate_stub_report(
-                patient_id,
-                {"diagnostic_table": diagnostic_table, "variants_table": variants_table},
-                {"tool_results": tool_results}
-            )
-        else:
-            # Invoke LLM and parse markdown response
-            llm_response = self.invoke_llm(prompt)
-            report = self._parse_llm_response(
-                llm_response, patient_id, diagnostic_table, variants_table, tool_results
-            )
-
-        return {
-            "report": report.to_dict(),
-            "report_markdown": report.to_markdown(),
-            "diagnostic_report": report.to_markdown(),  # Alias for LangGraph state
-            "report_id": report.report_id,
-            "confidence_score": report.confidence_score,
-            "confidence_scores": {"overall": report.confidence_score},  # For LangGraph
-            "recommendations": self._extract_recommendations(report),
-            "input_tokens": len(prompt.split()),
-            "output_tokens": 3000,  # Placeholder
-        }
-
     def _parse_llm_response(
         self,
         response: str,
@@ -8,6 +8,7 @@ that feed into the Reinforcement Learning from Human Feedback (RLHF) pipeline.
 Components:
 - FeedbackCollector: Central aggregator for all feedback sources
 - FeedbackItem: Individual feedback record
+- FeedbackStore: Columnar index of feedback items for aggregation
 - AggregatedFeedback: Summary of all feedback for a run
 - FeedbackType, FeedbackSource: Enums for categorization
 
@@ -22,6 +23,7 @@ __author__ = "Stanley Lab / RareResearch"
 from .feedback_collector import (
     FeedbackCollector,
     FeedbackItem,
+    FeedbackStore,
     AggregatedFeedback,
     FeedbackType,
     FeedbackSource,
@@ -33,6 +35,7 @@ __all__ = [
     '__author__',
     'FeedbackCollector',
     'FeedbackItem',
+    'FeedbackStore',
     'AggregatedFeedback',
     'FeedbackType',
     'FeedbackSource',
@@ -20,16 +20,72 @@ Date: November 2025
 Version: 2.0.0 - Added export_arena_bundle() for federated learning
 """
 
+import functools
 import json
+import os
+import re
 import zipfile
 import base64
+import dataclasses
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoder
+    orjson = None
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode obj as UTF-8 JSON (2-space indented if `indent`).
+
+    orjson (when installed) emits bytes directly; the stdlib fallback
+    produces equivalent JSON.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+# A top-level "patient_id" written as the object's first key (the layout
+# PatientContext.to_dict() produces), readable without parsing the rest
+_LEADING_PATIENT_ID = re.compile(rb'\A\s*\{\s*"patient_id"\s*:\s*("(?:[^"\\]|\\.)*")')
+_PATIENT_ID_PROBE_BYTES = 8192
+
+
+@functools.lru_cache(maxsize=64)
+def _load_patient_id(path: str, mtime_ns: int) -> Any:
+    """
+    Read the top-level "patient_id" of a JSON output, memoized on (path, mtime).
+
+    Only the first 8 KiB are read when the ID is the document's first key;
+    any other layout falls back to parsing the whole file. Returns
+    "unknown" when the field is absent.
+    """
+    with open(path, "rb") as f:
+        head = f.read(_PATIENT_ID_PROBE_BYTES)
+        match = _LEADING_PATIENT_ID.match(head)
+        if match:
+            return json.loads(match.group(1))
+        raw = head + f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return data.get("patient_id", "unknown")
+
+
+# export_arena_bundle() compression presets -> DEFLATE level. Bundles are
+# mostly JSON text, where level 1 is several times faster than the zlib
+# default (6) for a slightly larger archive.
+_BUNDLE_COMPRESSLEVELS = {"fast": 1, "small": 9}
+
 
 class FeedbackType(Enum):
     """Types of feedback that can be collected."""
@@ -49,9 +105,37 @@ class FeedbackSource(Enum):
     SYNTHESIS = "04_synthesis"
 
 
-@dataclass
+# Small-int codes for the enums, used by the FeedbackStore columns.
+# Members are numbered in definition order; the *_BY_VALUE dicts map
+# .value strings back to members for deserialization.
+_SOURCE_BY_CODE = tuple(FeedbackSource)
+_CODE_BY_SOURCE = {s: i for i, s in enumerate(_SOURCE_BY_CODE)}
+_SOURCE_BY_VALUE = {s.value: s for s in _SOURCE_BY_CODE}
+_TYPE_BY_CODE = tuple(FeedbackType)
+_CODE_BY_TYPE = {t: i for i, t in enumerate(_TYPE_BY_CODE)}
+_TYPE_BY_VALUE = {t.value: t for t in _TYPE_BY_CODE}
+
+# FeedbackItem fields that FeedbackStore columns are derived from
+_INDEXED_FIELDS = frozenset({
+    "feedback_type", "source", "reviewer_id", "is_correct",
+    "confidence_original", "confidence_adjusted", "corrections", "notes",
+    "chosen_response", "rejected_response",
+})
+
+# Assignments to _INDEXED_FIELDS of items some FeedbackStore has indexed.
+# A store whose last sync() saw a different count re-reads its items.
+_indexed_item_edits = 0
+
+
+@dataclass(slots=True, init=False)
 class FeedbackItem:
-    """A single piece of feedback from an expert reviewer."""
+    """
+    A single piece of feedback from an expert reviewer.
+
+    Items stay mutable after they are collected: assigning a field that
+    FeedbackStore indexes marks the stores for a re-read. Mutating a
+    `corrections` dict in place is not seen; assign a new dict instead.
+    """
     feedback_id: str
     feedback_type: FeedbackType
     source: FeedbackSource
@@ -74,6 +158,54 @@ class FeedbackItem:
     chosen_response: Optional[str] = None
     rejected_response: Optional[str] = None
 
+    # Set once a FeedbackStore has written a row for this item
+    _indexed: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __init__(
+        self,
+        feedback_id: str,
+        feedback_type: FeedbackType,
+        source: FeedbackSource,
+        timestamp: str,
+        reviewer_id: Optional[str] = None,
+        original_content: Optional[Dict[str, Any]] = None,
+        is_correct: bool = True,
+        confidence_original: float = 0.0,
+        confidence_adjusted: float = 0.0,
+        corrections: Optional[Dict[str, Any]] = None,
+        notes: str = "",
+        chosen_response: Optional[str] = None,
+        rejected_response: Optional[str] = None,
+    ):
+        # Written through the slot descriptors, past __setattr__:
+        # constructing an item is not an edit, and from_dict() builds
+        # thousands of them
+        for set_slot, value in zip(_ITEM_SLOT_SETTERS, (
+            feedback_id, feedback_type, source, timestamp, reviewer_id,
+            {} if original_content is None else original_content,
+            is_correct, confidence_original, confidence_adjusted,
+            {} if corrections is None else corrections,
+            notes, chosen_response, rejected_response, False,
+        )):
+            set_slot(self, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # getattr: unpickling restores the slots in no particular order
+        if name in _INDEXED_FIELDS and getattr(self, "_indexed", False):
+            global _indexed_item_edits
+            _indexed_item_edits += 1
+
+    @property
+    def source_code(self) -> int:
+        """Integer code of source (index into _SOURCE_BY_CODE)."""
+        return _CODE_BY_SOURCE[self.source]
+
+    @property
+    def type_code(self) -> int:
+        """Integer code of feedback_type (index into _TYPE_BY_CODE)."""
+        return _CODE_BY_TYPE[self.feedback_type]
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "feedback_id": self.feedback_id,
@@ -93,24 +225,32 @@ class FeedbackItem:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "FeedbackItem":
+        # Positional, in field order: from_dict() runs once per stored item
         return cls(
-            feedback_id=data["feedback_id"],
-            feedback_type=FeedbackType(data["feedback_type"]),
-            source=FeedbackSource(data["source"]),
-            timestamp=data["timestamp"],
-            reviewer_id=data.get("reviewer_id"),
-            original_content=data.get("original_content", {}),
-            is_correct=data.get("is_correct", True),
-            confidence_original=data.get("confidence_original", 0.0),
-            confidence_adjusted=data.get("confidence_adjusted", 0.0),
-            corrections=data.get("corrections", {}),
-            notes=data.get("notes", ""),
-            chosen_response=data.get("chosen_response"),
-            rejected_response=data.get("rejected_response"),
+            data["feedback_id"],
+            # Enum constructors only run (and raise) for unknown values
+            _TYPE_BY_VALUE.get(data["feedback_type"]) or FeedbackType(data["feedback_type"]),
+            _SOURCE_BY_VALUE.get(data["source"]) or FeedbackSource(data["source"]),
+            data["timestamp"],
+            data.get("reviewer_id"),
+            data.get("original_content", {}),
+            data.get("is_correct", True),
+            data.get("confidence_original", 0.0),
+            data.get("confidence_adjusted", 0.0),
+            data.get("corrections", {}),
+            data.get("notes", ""),
+            data.get("chosen_response"),
+            data.get("rejected_response"),
         )
 
 
-@dataclass
+# __set__ of each FeedbackItem slot, in field order (for __init__)
+_ITEM_SLOT_SETTERS = tuple(
+    getattr(FeedbackItem, f.name).__set__ for f in dataclasses.fields(FeedbackItem)
+)
+
+
+@dataclass(slots=True)
 class AggregatedFeedback:
     """Aggregated feedback for a complete pipeline run."""
     run_id: str
@@ -152,6 +292,233 @@ class AggregatedFeedback:
         }
 
 
+def _list_dir(directory: Path) -> frozenset:
+    """
+    Names in directory that Path.exists() would accept (empty if the
+    directory does not exist). One scandir() call; the is_file/is_dir
+    checks use the directory entry and only stat symlinks.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(
+                entry.name for entry in entries if entry.is_file() or entry.is_dir()
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+
+def _unindexing(method: Any) -> Any:
+    """Wrap a list method so calling it makes the owning store re-index."""
+    @functools.wraps(method)
+    def wrapper(self: "_ItemList", *args: Any) -> Any:
+        try:
+            return method(self, *args)
+        finally:
+            self._store._stale = True
+    return wrapper
+
+
+class _ItemList(list):
+    """
+    The item list of a FeedbackStore.
+
+    append() and extend() write the new rows straight away; any other
+    change (insert, delete, replace, reorder) marks the store stale so
+    its next sync() re-reads every item.
+    """
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store: "FeedbackStore", items: Iterable[FeedbackItem] = ()):
+        super().__init__(items)
+        self._store = store
+
+    def append(self, item: FeedbackItem) -> None:
+        super().append(item)
+        self._store._index_new()
+
+    def extend(self, items: Iterable[FeedbackItem]) -> None:
+        super().extend(items)
+        self._store._index_new()
+
+    def __iadd__(self, items: Iterable[FeedbackItem]) -> "_ItemList":
+        self.extend(items)
+        return self
+
+    insert = _unindexing(list.insert)
+    pop = _unindexing(list.pop)
+    remove = _unindexing(list.remove)
+    clear = _unindexing(list.clear)
+    sort = _unindexing(list.sort)
+    reverse = _unindexing(list.reverse)
+    __setitem__ = _unindexing(list.__setitem__)
+    __delitem__ = _unindexing(list.__delitem__)
+    __imul__ = _unindexing(list.__imul__)
+
+
+class FeedbackStore:
+    """
+    Columnar (structure-of-arrays) index over a list of FeedbackItems.
+
+    The per-item scalars that aggregation reads are kept in parallel
+    NumPy arrays, so each metric is one vectorized pass over a contiguous
+    column instead of a walk over item objects:
+
+    - is_correct, has_corrections, has_preference, has_reviewer,
+      has_notes: bool
+    - confidence_original, confidence_adjusted: float64
+    - source_code, type_code: int8 (index into SOURCES / TYPES)
+
+    The item list stays the source of truth and holds the variable-length
+    fields. add() (or appending to `items`) writes the item's row into
+    the buffers, which grow by doubling. Items may also be removed,
+    reordered or edited: sync() then re-reads every item, and otherwise
+    only publishes the rows already written.
+    """
+
+    SOURCES = _SOURCE_BY_CODE
+    TYPES = _TYPE_BY_CODE
+    _COLUMNS = {
+        "is_correct": "?",
+        "confidence_original": "f8",
+        "confidence_adjusted": "f8",
+        "source_code": "i1",
+        "type_code": "i1",
+        "has_corrections": "?",
+        "has_preference": "?",
+        "has_reviewer": "?",
+        "has_notes": "?",
+    }
+
+    def __init__(self, items: Iterable[FeedbackItem] = ()):
+        # Distinct reviewer IDs, in first-seen order
+        self.reviewers: Dict[str, None] = {}
+        self._buffers: Dict[str, "np.ndarray"] = {}
+        self._columns: tuple = ()
+        self._size = 0  # rows written, for items[:_size]
+        self._capacity = 0
+        self._stale = False  # items changed other than by appending
+        self._edits = _indexed_item_edits  # item edits seen by the rows
+        self.items: List[FeedbackItem] = _ItemList(self)
+        self.items.extend(items)
+
+        # Column views of the indexed rows (set by sync())
+        self.is_correct: "np.ndarray"
+        self.confidence_original: "np.ndarray"
+        self.confidence_adjusted: "np.ndarray"
+        self.source_code: "np.ndarray"
+        self.type_code: "np.ndarray"
+        self.has_corrections: "np.ndarray"
+        self.has_preference: "np.ndarray"
+        self.has_reviewer: "np.ndarray"
+        self.has_notes: "np.ndarray"
+
+    def add(self, item: FeedbackItem) -> None:
+        """Append an item and write its row."""
+        self.items.append(item)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def sync(self) -> int:
+        """
+        Bring the columns up to date with the items; returns the row count.
+
+        Rows are re-read only if the list was changed by anything but
+        append/extend, or an indexed item was edited, since the last sync.
+        """
+        if self._stale or self._edits != _indexed_item_edits:
+            self._stale = False
+            self._edits = _indexed_item_edits
+            self._size = 0
+            self.reviewers = {}
+        self._index_new()
+        n = self._size
+        for name, buffer in self._buffers.items():
+            setattr(self, name, buffer[:n])
+        return n
+
+    def _index_new(self) -> None:
+        """Write rows for the items past the last written row."""
+        if self._stale:
+            return
+        start, stop = self._size, len(self.items)
+        if stop > self._capacity or not self._buffers:
+            self._grow(stop)
+        if stop - start == 1:
+            self._write(start, self.items[start])
+        else:
+            self._fill(start, stop)
+        self._size = stop
+
+    def _grow(self, n: int) -> None:
+        import numpy as np
+
+        capacity = max(16, self._capacity)
+        while capacity < n:
+            capacity *= 2
+        self._capacity = capacity
+        for name, dtype in self._COLUMNS.items():
+            buffer = np.zeros(capacity, dtype=dtype)
+            old = self._buffers.get(name)
+            if old is not None:
+                buffer[:self._size] = old[:self._size]
+            self._buffers[name] = buffer
+        # The same buffers in _COLUMNS order, for _write()
+        self._columns = tuple(self._buffers.values())
+
+    def _write(self, row: int, item: FeedbackItem) -> None:
+        """Write one item's row (the per-add path of _fill)."""
+        (
+            is_correct, confidence_original, confidence_adjusted, source_code,
+            type_code, has_corrections, has_preference, has_reviewer, has_notes,
+        ) = self._columns
+        is_correct[row] = bool(item.is_correct)
+        confidence_original[row] = item.confidence_original
+        confidence_adjusted[row] = item.confidence_adjusted
+        source_code[row] = _CODE_BY_SOURCE[item.source]
+        type_code[row] = _CODE_BY_TYPE[item.feedback_type]
+        has_corrections[row] = bool(item.corrections)
+        has_preference[row] = bool(item.chosen_response and item.rejected_response)
+        has_reviewer[row] = bool(item.reviewer_id)
+        has_notes[row] = bool(item.notes)
+        if item.reviewer_id:
+            self.reviewers[item.reviewer_id] = None
+        object.__setattr__(item, "_indexed", True)
+
+    def _fill(self, start: int, stop: int) -> None:
+        new = self.items[start:stop]
+        if not new:
+            return
+        columns = self._buffers
+        columns["is_correct"][start:stop] = [bool(i.is_correct) for i in new]
+        columns["confidence_original"][start:stop] = [i.confidence_original for i in new]
+        columns["confidence_adjusted"][start:stop] = [i.confidence_adjusted for i in new]
+        columns["source_code"][start:stop] = [i.source_code for i in new]
+        columns["type_code"][start:stop] = [i.type_code for i in new]
+        columns["has_corrections"][start:stop] = [bool(i.corrections) for i in new]
+        columns["has_preference"][start:stop] = [
+            bool(i.chosen_response and i.rejected_response) for i in new
+        ]
+        columns["has_reviewer"][start:stop] = [bool(i.reviewer_id) for i in new]
+        columns["has_notes"][start:stop] = [bool(i.notes) for i in new]
+        set_indexed = object.__setattr__
+        for item in new:
+            if item.reviewer_id:
+                self.reviewers[item.reviewer_id] = None
+            set_indexed(item, "_indexed", True)
+
+    def by_source(self) -> tuple:
+        """Items as of the last sync(), bucketed by source code, each in insertion order."""
+        import numpy as np
+
+        codes = self.source_code
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(self.SOURCES)))[:-1]
+        get = self.items.__getitem__
+        return tuple(list(map(get, rows.tolist())) for rows in np.split(order, bounds))
+
+
 class FeedbackCollector:
     """
     Central aggregator for collecting and managing RLHF feedback.
@@ -188,8 +555,10 @@ class FeedbackCollector:
         self.reviewer_id = reviewer_id
         self.run_id = self._generate_run_id()
 
-        # Feedback storage
-        self.feedback_items: List[FeedbackItem] = []
+        # Feedback storage: the item list plus its columnar index
+        self._store = FeedbackStore()
+        # Raw ID -> pseudonym, for this collector's anonymization only
+        self._hash_cache: Dict[str, str] = {}
 
         # Known feedback file patterns
         self.feedback_patterns = {
@@ -198,11 +567,32 @@ class FeedbackCollector:
             FeedbackSource.EXECUTOR: ["tool_validation.json"],
             FeedbackSource.SYNTHESIS: ["report_feedback.json", "section_feedback.json"],
         }
+        # File name -> source, for classifying the shared feedback/ directory
+        self._pattern_to_source: Dict[str, FeedbackSource] = {
+            pattern: source
+            for source, patterns in self.feedback_patterns.items()
+            for pattern in patterns
+        }
 
         # Auto-detect patient ID if not provided
         if not self.patient_id:
             self._detect_patient_id()
 
+    @property
+    def feedback_items(self) -> List[FeedbackItem]:
+        """
+        Collected items, as a list owned by the FeedbackStore.
+
+        Appended items are indexed immediately; other changes to the
+        list or its items are picked up by the next statistics call.
+        """
+        return self._store.items
+
+    @feedback_items.setter
+    def feedback_items(self, items: Iterable[FeedbackItem]) -> None:
+        """Replace the collection with a new store over a copy of `items`."""
+        self._store = FeedbackStore(items)
+
     def _generate_run_id(self) -> str:
         """Generate a unique run ID based on directory and timestamp."""
         content = f"{self.run_dir}_{datetime.now().isoformat()}"
@@ -210,21 +600,17 @@ class FeedbackCollector:
 
     def _detect_patient_id(self):
         """Try to detect patient ID from pipeline outputs."""
-        # Check ingestion output
-        ingestion_file = self.run_dir / "01_ingestion" / "patient_context.json"
-        if ingestion_file.exists():
-            with open(ingestion_file) as f:
-                data = json.load(f)
-                self.patient_id = data.get("patient_id", "unknown")
-                return
-
-        # Check synthesis output
-        synthesis_file = self.run_dir / "04_synthesis" / "clinical_report.json"
-        if synthesis_file.exists():
-            with open(synthesis_file) as f:
-                data = json.load(f)
-                self.patient_id = data.get("patient_id", "unknown")
-                return
+        # Ingestion output first, then synthesis output
+        for stage_file in (
+            self.run_dir / "01_ingestion" / "patient_context.json",
+            self.run_dir / "04_synthesis" / "clinical_report.json",
+        ):
+            try:
+                mtime_ns = stage_file.stat().st_mtime_ns
+            except OSError:
+                continue
+            self.patient_id = _load_patient_id(str(stage_file), mtime_ns)
+            return
 
         self.patient_id = "unknown"
 
@@ -237,23 +623,23 @@ class FeedbackCollector:
         """
         found_files: Dict[str, List[Path]] = {}
 
+        # One directory listing per directory instead of a stat per
+        # candidate file. The shared feedback/ directory is listed and
+        # classified by source once, in pattern order.
+        feedback_dir = self.run_dir / "feedback"
+        feedback_names = _list_dir(feedback_dir)
+        feedback_hits: Dict[FeedbackSource, List[Path]] = {}
+        for pattern, source in self._pattern_to_source.items():
+            if pattern in feedback_names:
+                feedback_hits.setdefault(source, []).append(feedback_dir / pattern)
+
         for source, patterns in self.feedback_patterns.items():
             source_dir = self.run_dir / source.value
-            found = []
-
-            if source_dir.exists():
-                for pattern in patterns:
-                    feedback_file = source_dir / pattern
-                    if feedback_file.exists():
-                        found.append(feedback_file)
+            source_names = _list_dir(source_dir)
+            found = [source_dir / pattern for pattern in patterns if pattern in source_names]
 
             # Also check feedback subdirectory
-            feedback_dir = self.run_dir / "feedback"
-            if feedback_dir.exists():
-                for pattern in patterns:
-                    feedback_file = feedback_dir / pattern
-                    if feedback_file.exists():
-                        found.append(feedback_file)
+            found.extend(feedback_hits.get(source, ()))
 
             if found:
                 found_files[source.value] = found
@@ -354,7 +740,7 @@ class FeedbackCollector:
 
     def add_feedback(self, item: FeedbackItem):
         """Add a feedback item to the collection."""
-        self.feedback_items.append(item)
+        self._store.add(item)
 
     def add_diagnosis_correction(
         self,
@@ -386,7 +772,7 @@ class FeedbackCollector:
             confidence_adjusted=adjusted_confidence,
             notes=notes,
         )
-        self.feedback_items.append(item)
+        self.add_feedback(item)
 
     def aggregate(self) -> AggregatedFeedback:
         """
@@ -395,36 +781,33 @@ class FeedbackCollector:
         Returns:
             AggregatedFeedback object with all feedback organized by source
         """
+        return self._aggregate(self._compute_all_stats())
+
+    def _aggregate(self, stats: Dict[str, Any]) -> AggregatedFeedback:
+        """aggregate() from stats computed by _compute_all_stats()."""
         aggregated = AggregatedFeedback(
             run_id=self.run_id,
             patient_id=self.patient_id or "unknown",
             timestamp=datetime.now().isoformat(),
         )
 
+        store = self._store
+
         # Organize by source
-        for item in self.feedback_items:
-            if item.source == FeedbackSource.INGESTION:
-                aggregated.ingestion_feedback.append(item)
-            elif item.source == FeedbackSource.STRUCTURING:
-                aggregated.structuring_feedback.append(item)
-            elif item.source == FeedbackSource.EXECUTOR:
-                aggregated.executor_feedback.append(item)
-            elif item.source == FeedbackSource.SYNTHESIS:
-                aggregated.synthesis_feedback.append(item)
+        aggregated.total_items = stats["total"]
+        (
+            aggregated.ingestion_feedback,
+            aggregated.structuring_feedback,
+            aggregated.executor_feedback,
+            aggregated.synthesis_feedback,
+        ) = store.by_source()
 
         # Calculate metrics
-        aggregated.total_items = len(self.feedback_items)
-        aggregated.correct_items = sum(1 for item in self.feedback_items if item.is_correct)
-        aggregated.items_with_corrections = sum(
-            1 for item in self.feedback_items if item.corrections
-        )
+        aggregated.correct_items = stats["correct"]
+        aggregated.items_with_corrections = stats["with_corrections"]
 
         # Track reviewers
-        reviewers = set()
-        for item in self.feedback_items:
-            if item.reviewer_id:
-                reviewers.add(item.reviewer_id)
-        aggregated.reviewers = list(reviewers)
+        aggregated.reviewers = list(store.reviewers)
 
         return aggregated
 
@@ -445,8 +828,8 @@ class FeedbackCollector:
 
         aggregated = self.aggregate()
 
-        with open(output_path, 'w') as f:
-            json.dump(aggregated.to_dict(), f, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(_dumps(aggregated.to_dict(), indent=True))
 
         return output_path
 
@@ -463,13 +846,12 @@ class FeedbackCollector:
         self.run_id = data.get("run_id", self.run_id)
         self.patient_id = data.get("patient_id", self.patient_id)
 
-        # Load all feedback items
-        self.feedback_items = []
-
-        for source_key in ["ingestion", "structuring", "executor", "synthesis"]:
-            items_data = data.get("feedback", {}).get(source_key, [])
-            for item_data in items_data:
-                self.feedback_items.append(FeedbackItem.from_dict(item_data))
+        # Load all feedback items (indexed in one pass by the new store)
+        self.feedback_items = [
+            FeedbackItem.from_dict(item_data)
+            for source_key in ["ingestion", "structuring", "executor", "synthesis"]
+            for item_data in data.get("feedback", {}).get(source_key, [])
+        ]
 
     def export_for_training(
         self,
@@ -529,12 +911,13 @@ class FeedbackCollector:
         output_path = Path(output_path)
 
         if format == "jsonl":
-            with open(output_path, 'w') as f:
+            with open(output_path, 'wb') as f:
                 for record in training_data:
-                    f.write(json.dumps(record) + "\n")
+                    f.write(_dumps(record))
+                    f.write(b"\n")
         else:
-            with open(output_path, 'w') as f:
-                json.dump(training_data, f, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(_dumps(training_data, indent=True))
 
         return output_path
 
@@ -544,6 +927,7 @@ class FeedbackCollector:
         include_pipeline_outputs: bool = False,
         anonymize: bool = True,
         institution_id: Optional[str] = None,
+        compression: str = "fast",
     ) -> Path:
         """
         Export feedback as a federated learning contribution bundle.
@@ -563,6 +947,8 @@ class FeedbackCollector:
             include_pipeline_outputs: Include sanitized pipeline outputs for verification
             anonymize: Apply anonymization to all exported data (default: True)
             institution_id: Identifier for contributing institution
+            compression: "fast" (DEFLATE level 1, default) or "small"
+                (DEFLATE level 9) - the bundle is a standard zip either way
 
         Returns:
             Path to the exported bundle
@@ -576,6 +962,12 @@ class FeedbackCollector:
             ... )
             >>> print(f"Bundle ready for federation: {bundle_path}")
         """
+        if compression not in _BUNDLE_COMPRESSLEVELS:
+            raise ValueError(
+                f"Unknown compression {compression!r}; "
+                f"expected one of {sorted(_BUNDLE_COMPRESSLEVELS)}"
+            )
+
         # Set default output path
         if output_path is None:
             arena_dir = self.run_dir / "arena"
@@ -599,51 +991,60 @@ class FeedbackCollector:
             },
         }
 
+        # Every section reads the same snapshot of the items
+        stats = self._compute_all_stats()
+
         # Prepare anonymized feedback
-        anonymized_feedback = self._anonymize_feedback() if anonymize else self.aggregate().to_dict()
+        anonymized_feedback = (
+            self._anonymize_feedback(stats) if anonymize else self._aggregate(stats).to_dict()
+        )
 
         # Calculate contribution metrics
-        contribution_metrics = self._calculate_contribution_metrics()
+        contribution_metrics = self._calculate_contribution_metrics(stats)
 
         # Build gradient summary (simulated - in real system this would be actual gradients)
-        gradient_summary = self._build_gradient_summary()
+        gradient_summary = self._build_gradient_summary(stats)
 
         # Create the zip bundle
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        with zipfile.ZipFile(
+            output_path,
+            'w',
+            zipfile.ZIP_DEFLATED,
+            compresslevel=_BUNDLE_COMPRESSLEVELS[compression],
+        ) as zf:
             # Write manifest
             zf.writestr(
                 "manifest.json",
-                json.dumps(bundle_manifest, indent=2)
+                _dumps(bundle_manifest, indent=True)
             )
 
             # Write anonymized feedback
             zf.writestr(
                 "feedback/aggregated_feedback.json",
-                json.dumps(anonymized_feedback, indent=2)
+                _dumps(anonymized_feedback, indent=True)
             )
 
-            # Write training-ready data
-            training_data = []
-            for item in self.feedback_items:
-                training_record = self._feedback_to_training_record(item, anonymize)
-                if training_record:
-                    training_data.append(training_record)
-
-            zf.writestr(
-                "training/training_data.jsonl",
-                "\n".join(json.dumps(record) for record in training_data)
-            )
+            # Write training-ready data, streamed record by record so the
+            # whole JSONL is never held in memory
+            with zf.open("training/training_data.jsonl", "w", force_zip64=True) as entry:
+                separator = b""
+                for item in self.feedback_items:
+                    training_record = self._feedback_to_training_record(item, anonymize)
+                    if training_record:
+                        entry.write(separator)
+                        entry.write(_dumps(training_record))
+                        separator = b"\n"
 
             # Write contribution metrics
             zf.writestr(
                 "metrics/contribution_metrics.json",
-                json.dumps(contribution_metrics, indent=2)
+                _dumps(contribution_metrics, indent=True)
             )
 
             # Write gradient summary
             zf.writestr(
                 "gradients/gradient_summary.json",
-                json.dumps(gradient_summary, indent=2)
+                _dumps(gradient_summary, indent=True)
             )
 
             # Optionally include sanitized pipeline outputs
@@ -651,12 +1052,12 @@ class FeedbackCollector:
                 sanitized_outputs = self._sanitize_pipeline_outputs()
                 zf.writestr(
                     "verification/pipeline_outputs.json",
-                    json.dumps(sanitized_outputs, indent=2)
+                    _dumps(sanitized_outputs, indent=True)
                 )
 
         return output_path
 
-    def _anonymize_feedback(self) -> Dict[str, Any]:
+    def _anonymize_feedback(self, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Anonymize feedback data for federated sharing.
 
@@ -665,24 +1066,21 @@ class FeedbackCollector:
         - Reviewer ID hashing
         - Removal of free-text notes that might contain PHI
         - Generalization of rare conditions
+
+        Args:
+            stats: _compute_all_stats() result to reuse (computed if None)
         """
-        aggregated = self.aggregate()
+        aggregated = self._aggregate(stats if stats is not None else self._compute_all_stats())
         anon_dict = aggregated.to_dict()
 
         # Hash patient ID
         if anon_dict.get("patient_id"):
-            anon_dict["patient_id"] = hashlib.sha256(
-                anon_dict["patient_id"].encode()
-            ).hexdigest()[:16]
+            anon_dict["patient_id"] = self._hash16(anon_dict["patient_id"])
 
         # Hash reviewer IDs
-        anon_reviewers = []
-        for reviewer in anon_dict.get("reviewers", []):
-            if reviewer:
-                anon_reviewers.append(
-                    hashlib.sha256(reviewer.encode()).hexdigest()[:16]
-                )
-        anon_dict["reviewers"] = anon_reviewers
+        anon_dict["reviewers"] = [
+            self._hash16(reviewer) for reviewer in anon_dict.get("reviewers", []) if reviewer
+        ]
 
         # Anonymize feedback items
         for source_key in ["ingestion", "structuring", "executor", "synthesis"]:
@@ -690,9 +1088,7 @@ class FeedbackCollector:
             for item in items:
                 # Hash reviewer
                 if item.get("reviewer_id"):
-                    item["reviewer_id"] = hashlib.sha256(
-                        item["reviewer_id"].encode()
-                    ).hexdigest()[:16]
+                    item["reviewer_id"] = self._hash16(item["reviewer_id"])
                 # Remove free-text notes (potential PHI)
                 item["notes"] = "[REDACTED]" if item.get("notes") else ""
                 # Generalize rare disease names
@@ -703,6 +1099,19 @@ class FeedbackCollector:
 
         return anon_dict
 
+    def _hash16(self, value: str) -> str:
+        """
+        16-hex-digit SHA-256 pseudonym of an identifier.
+
+        Memoized per collector: a bundle repeats the same few reviewer
+        IDs on every item, so each distinct ID is hashed once. The cache
+        is not shared between collectors (patients).
+        """
+        hashed = self._hash_cache.get(value)
+        if hashed is None:
+            hashed = self._hash_cache[value] = hashlib.sha256(value.encode()).hexdigest()[:16]
+        return hashed
+
     def _is_rare_condition(self, disease_name: str) -> bool:
         """Check if a condition is rare enough to be potentially identifying."""
         # In a real system, this would check against a rare disease database
@@ -714,88 +1123,129 @@ class FeedbackCollector:
         disease_lower = disease_name.lower()
         return any(indicator in disease_lower for indicator in rare_indicators)
 
-    def _calculate_contribution_metrics(self) -> Dict[str, Any]:
+    def _calculate_contribution_metrics(
+        self, stats: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Calculate metrics that describe the value of this contribution.
 
         These metrics help the federated aggregator weight contributions
         appropriately.
+
+        Args:
+            stats: _compute_all_stats() result to reuse (computed if None)
         """
-        stats = self.get_statistics()
+        if stats is None:
+            stats = self._compute_all_stats()
+        total = stats["total"]
+        count_by_source = stats["count_by_source"]
 
         return {
-            "total_feedback_items": stats.get("total_items", 0),
-            "correction_rate": (
-                stats.get("items_with_corrections", 0) / stats.get("total_items", 1)
-                if stats.get("total_items", 0) > 0 else 0
-            ),
-            "expert_reviewer_count": stats.get("unique_reviewers", 0),
-            "feedback_quality_score": self._calculate_quality_score(),
+            "total_feedback_items": total,
+            "correction_rate": stats["with_corrections"] / total if total > 0 else 0,
+            "expert_reviewer_count": stats["unique_reviewers"],
+            "feedback_quality_score": stats["quality_score"],
             "coverage": {
-                "ingestion": len(stats.get("by_source", {}).get("01_ingestion", {}).get("count", 0)) > 0,
-                "structuring": len(stats.get("by_source", {}).get("02_structuring", {}).get("count", 0)) > 0,
-                "executor": len(stats.get("by_source", {}).get("03_executor", {}).get("count", 0)) > 0,
-                "synthesis": len(stats.get("by_source", {}).get("04_synthesis", {}).get("count", 0)) > 0,
+                source.name.lower(): count_by_source[source] > 0
+                for source in FeedbackStore.SOURCES
             },
-            "confidence_calibration": stats.get("confidence_adjustments", {}),
+            "confidence_calibration": (
+                self._confidence_adjustments(stats) if total > 0 else {}
+            ),
         }
 
     def _calculate_quality_score(self) -> float:
         """
         Calculate a quality score for this feedback contribution.
 
-        Higher scores indicate more valuable training signal.
+        Higher scores indicate more valuable training signal. Each item
+        earns 0.3 for corrections, 0.3 for a confidence adjustment, 0.2
+        for reviewer attribution and 0.2 for being marked correct; the
+        score is the mean.
         """
-        if not self.feedback_items:
-            return 0.0
-
-        score = 0.0
-        max_score = 0.0
-
-        for item in self.feedback_items:
-            max_score += 1.0
-
-            # Points for having corrections (indicates engaged review)
-            if item.corrections:
-                score += 0.3
-
-            # Points for confidence adjustment (indicates calibration data)
-            if item.confidence_adjusted != item.confidence_original:
-                score += 0.3
+        return self._compute_all_stats()["quality_score"]
 
-            # Points for reviewer attribution
-            if item.reviewer_id:
-                score += 0.2
+    def _compute_all_stats(self) -> Dict[str, Any]:
+        """
+        Every counter the aggregation and export paths report, at once.
 
-            # Points for items marked as correct (validates AI output)
-            if item.is_correct:
-                score += 0.2
+        Computed in one vectorized pass over the FeedbackStore columns,
+        re-indexed from the items on every call so edits to them are
+        picked up. An export computes it once and passes the result to
+        each section. Per-source counts are keyed by FeedbackSource,
+        per-type counts by FeedbackType.
+        """
+        import numpy as np
+
+        store = self._store
+        n = store.sync()
+
+        changed = store.confidence_adjusted != store.confidence_original
+        sources, types = FeedbackStore.SOURCES, FeedbackStore.TYPES
+        source_code = store.source_code
+
+        def by_source(weights: Optional["np.ndarray"] = None) -> Dict[FeedbackSource, int]:
+            counts = np.bincount(source_code, weights=weights, minlength=len(sources))
+            return {source: int(count) for source, count in zip(sources, counts)}
+
+        type_counts = np.bincount(store.type_code, minlength=len(types))
+        quality = (
+            0.3 * store.has_corrections
+            + 0.3 * changed
+            + 0.2 * store.has_reviewer
+            + 0.2 * store.is_correct
+        ).sum()
+
+        stats = {
+            "total": n,
+            "correct": int(store.is_correct.sum()),
+            "with_corrections": int(store.has_corrections.sum()),
+            "with_notes": int(store.has_notes.sum()),
+            "with_preference_pair": int(store.has_preference.sum()),
+            "with_confidence_delta": int(changed.sum()),
+            "with_reviewer": int(store.has_reviewer.sum()),
+            "unique_reviewers": len(store.reviewers),
+            "count_by_source": by_source(),
+            "correct_by_source": by_source(store.is_correct),
+            "corrections_by_source": by_source(store.has_corrections),
+            "count_by_type": {ftype: int(count) for ftype, count in zip(types, type_counts)},
+            "confidence_deltas": (store.confidence_adjusted - store.confidence_original)[changed],
+            "quality_score": float(quality / n) if n else 0.0,
+        }
+        return stats
 
-        return score / max_score if max_score > 0 else 0.0
+    @staticmethod
+    def _confidence_adjustments(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """The "confidence_adjustments" block of get_statistics()."""
+        deltas = stats["confidence_deltas"]
+        return {
+            "count": len(deltas),
+            "mean_delta": float(deltas.mean()) if len(deltas) else 0,
+            "positive_adjustments": int((deltas > 0).sum()),
+            "negative_adjustments": int((deltas < 0).sum()),
+        }
 
-    def _build_gradient_summary(self) -> Dict[str, Any]:
+    def _build_gradient_summary(self, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Build a summary of model gradient updates (simulated).
 
         In a real federated learning system, this would contain actual
         gradient tensors from local training. For now, we create a
         summary that describes what the gradients would represent.
+
+        Args:
+            stats: _compute_all_stats() result to reuse (computed if None)
         """
+        if stats is None:
+            stats = self._compute_all_stats()
+
         return {
             "gradient_type": "feedback_signal",
             "update_type": "preference_based",
-            "num_preference_pairs": sum(
-                1 for item in self.feedback_items
-                if item.chosen_response and item.rejected_response
-            ),
-            "num_corrections": sum(
-                1 for item in self.feedback_items if item.corrections
-            ),
-            "num_confidence_adjustments": sum(
-                1 for item in self.feedback_items
-                if item.confidence_adjusted != item.confidence_original
-            ),
-            "signal_strength": self._calculate_quality_score(),
+            "num_preference_pairs": stats["with_preference_pair"],
+            "num_corrections": stats["with_corrections"],
+            "num_confidence_adjustments": stats["with_confidence_delta"],
+            "signal_strength": stats["quality_score"],
             "compatible_models": [
                 "UH2025-CDS-Agent",
                 "Rare-Disease-Diagnostic-LLM",
@@ -864,50 +1314,41 @@ class FeedbackCollector:
         Returns:
             Dict with feedback statistics
         """
-        if not self.feedback_items:
+        stats = self._compute_all_stats()
+        total = stats["total"]
+        if not total:
             return {
                 "total_items": 0,
                 "message": "No feedback collected yet"
             }
 
-        by_source = {}
-        for source in FeedbackSource:
-            items = [i for i in self.feedback_items if i.source == source]
-            if items:
-                by_source[source.value] = {
-                    "count": len(items),
-                    "correct": sum(1 for i in items if i.is_correct),
-                    "with_corrections": sum(1 for i in items if i.corrections),
-                }
-
-        by_type = {}
-        for ftype in FeedbackType:
-            items = [i for i in self.feedback_items if i.feedback_type == ftype]
-            if items:
-                by_type[ftype.value] = len(items)
+        by_source = {
+            source.value: {
+                "count": count,
+                "correct": stats["correct_by_source"][source],
+                "with_corrections": stats["corrections_by_source"][source],
+            }
+            for source, count in stats["count_by_source"].items()
+            if count
+        }
 
-        confidence_deltas = [
-            item.confidence_adjusted - item.confidence_original
-            for item in self.feedback_items
-            if item.confidence_adjusted != item.confidence_original
-        ]
+        by_type = {
+            ftype.value: count
+            for ftype, count in stats["count_by_type"].items()
+            if count
+        }
 
         return {
-            "total_items": len(self.feedback_items),
-            "total_correct": sum(1 for i in self.feedback_items if i.is_correct),
-            "total_incorrect": sum(1 for i in self.feedback_items if not i.is_correct),
-            "items_with_corrections": sum(1 for i in self.feedback_items if i.corrections),
-            "items_with_notes": sum(1 for i in self.feedback_items if i.notes),
-            "accuracy_rate": sum(1 for i in self.feedback_items if i.is_correct) / len(self.feedback_items),
+            "total_items": total,
+            "total_correct": stats["correct"],
+            "total_incorrect": total - stats["correct"],
+            "items_with_corrections": stats["with_corrections"],
+            "items_with_notes": stats["with_notes"],
+            "accuracy_rate": stats["correct"] / total,
             "by_source": by_source,
             "by_type": by_type,
-            "confidence_adjustments": {
-                "count": len(confidence_deltas),
-                "mean_delta": sum(confidence_deltas) / len(confidence_deltas) if confidence_deltas else 0,
-                "positive_adjustments": sum(1 for d in confidence_deltas if d > 0),
-                "negative_adjustments": sum(1 for d in confidence_deltas if d < 0),
-            },
-            "unique_reviewers": len(set(i.reviewer_id for i in self.feedback_items if i.reviewer_id)),
+            "confidence_adjustments": self._confidence_adjustments(stats),
+            "unique_reviewers": stats["unique_reviewers"],
         }
 
     def __repr__(self) -> str:
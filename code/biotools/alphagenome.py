@@ -201,6 +201,7 @@ class AlphaGenomeTool(BaseTool):
         cache_dir: Optional[str] = None,
         default_tissue: str = "brain",
         context_size: int = 1000,
+        client: Optional[Any] = None,
     ):
         """
         Initialize AlphaGenome tool.
@@ -210,8 +211,9 @@ class AlphaGenomeTool(BaseTool):
             cache_dir: Directory for Zarr cache
             default_tissue: Default tissue for predictions
             context_size: Context window size in bp
+            client: Shared HTTP session (e.g. requests.Session) for connection reuse
         """
-        super().__init__()
+        super().__init__(client=client)
         self.api_key = api_key or os.environ.get("ALPHAGENOME_API_KEY")
         self.default_tissue = default_tissue
         self.context_size = context_size
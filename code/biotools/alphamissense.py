@@ -84,14 +84,15 @@ class AlphaMissenseTool(BaseTool):
     rate_limit_per_second = 100
     rate_limit_per_minute = 1000
 
-    def __init__(self, database_path: Optional[str] = None):
+    def __init__(self, database_path: Optional[str] = None, client: Optional[Any] = None):
         """
         Initialize AlphaMissense tool.
 
         Args:
             database_path: Path to AlphaMissense TSV or SQLite database.
+            client: Shared HTTP session (e.g. requests.Session) for connection reuse
         """
-        super().__init__()
+        super().__init__(client=client)
         self.database_path = database_path or os.environ.get("ALPHAMISSENSE_DB_PATH")
         self._db_connection = None
 
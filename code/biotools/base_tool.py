@@ -16,9 +16,12 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import asyncio
+import contextlib
 import hashlib
 import json
+import threading
 
 
 class ToolStatus(Enum):
@@ -28,6 +31,38 @@ class ToolStatus(Enum):
     ERROR = "error"
     RATE_LIMITED = "rate_limited"
     TIMEOUT = "timeout"
+    UNAVAILABLE = "unavailable"  # HTTP 5xx or connection failure
+
+
+def transient_status(exc: BaseException) -> Optional[ToolStatus]:
+    """
+    ToolStatus for a failure worth retrying, or None for anything else.
+
+    HTTP 429 is RATE_LIMITED, timeouts are TIMEOUT, and HTTP 5xx and
+    connection failures are UNAVAILABLE. Tools re-raise these instead of
+    substituting fallback data, so callers can retry and back off.
+    """
+    status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    if status_code == 429:
+        return ToolStatus.RATE_LIMITED
+    if status_code is not None and status_code >= 500:
+        return ToolStatus.UNAVAILABLE
+
+    timeouts: tuple = (TimeoutError,)
+    connection_errors: tuple = (ConnectionError,)
+    try:
+        import requests
+
+        timeouts += (requests.Timeout,)
+        connection_errors += (requests.ConnectionError,)
+    except ImportError:
+        pass
+    # ConnectTimeout is both; it is reported as a timeout
+    if isinstance(exc, timeouts):
+        return ToolStatus.TIMEOUT
+    if isinstance(exc, connection_errors):
+        return ToolStatus.UNAVAILABLE
+    return None
 
 
 @dataclass
@@ -142,6 +177,36 @@ class ToolResult:
         }
 
 
+class _AdmittedClient:
+    """
+    HTTP client wrapper that calls `admit()` before each request.
+
+    Used by BaseTool.aquery_batch() so rate limiters count the requests
+    actually sent (a query may send several, a cache hit none).
+    """
+
+    __slots__ = ("_client", "_admit")
+
+    def __init__(self, client: Any, admit: Callable[[], None]):
+        self._client = client
+        self._admit = admit
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        self._admit()
+        return self._client.get(*args, **kwargs)
+
+    def post(self, *args: Any, **kwargs: Any) -> Any:
+        self._admit()
+        return self._client.post(*args, **kwargs)
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        self._admit()
+        return self._client.request(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
 class BaseTool(ABC):
     """
     Abstract base class for all bio-informatics tools.
@@ -191,10 +256,37 @@ class BaseTool(ABC):
     # Timeout
     timeout_seconds: int = 30
 
-    def __init__(self):
-        """Initialize tool with optional configuration."""
+    # Set True in subclasses whose query_batch() sends one batched request
+    supports_batch: bool = False
+
+    def __init__(self, client: Optional[Any] = None):
+        """
+        Initialize tool with optional configuration.
+
+        Args:
+            client: Shared HTTP session (e.g. requests.Session) for
+                    connection reuse across tools; None uses the
+                    module-level `requests` functions
+        """
+        self.client = client
         self._cache: Dict[str, ToolResult] = {}
         self._last_query_times: List[datetime] = []
+        # Queries may run concurrently in worker threads (aquery_batch)
+        self._rate_lock = threading.Lock()
+        # Per worker thread: callback admitting each request (aquery_batch)
+        self._admission = threading.local()
+
+    @property
+    def http(self) -> Any:
+        """HTTP client for API calls: the shared session, or `requests`."""
+        client = self.client
+        if client is None:
+            import requests
+            client = requests
+        admit = getattr(self._admission, "admit", None)
+        if admit is not None:
+            return _AdmittedClient(client, admit)
+        return client
 
     def query(self, variant: Variant) -> ToolResult:
         """
@@ -229,8 +321,8 @@ class BaseTool(ABC):
                 query_time=start_time,
             )
 
-        # Check rate limiting
-        if not self._check_rate_limit():
+        # Check rate limiting (unless external limiters admit each request)
+        if getattr(self._admission, "admit", None) is None and not self._check_rate_limit():
             return ToolResult(
                 tool_name=self.name,
                 variant=variant,
@@ -260,21 +352,17 @@ class BaseTool(ABC):
 
             return result
 
-        except TimeoutError:
-            return ToolResult(
-                tool_name=self.name,
-                variant=variant,
-                status=ToolStatus.TIMEOUT,
-                error_message=f"Query timed out after {self.timeout_seconds}s",
-                query_time=start_time,
-            )
-
         except Exception as e:
+            status = transient_status(e) or ToolStatus.ERROR
+            if status == ToolStatus.TIMEOUT and isinstance(e, TimeoutError):
+                message = f"Query timed out after {self.timeout_seconds}s"
+            else:
+                message = str(e)
             return ToolResult(
                 tool_name=self.name,
                 variant=variant,
-                status=ToolStatus.ERROR,
-                error_message=str(e),
+                status=status,
+                error_message=message,
                 query_time=start_time,
             )
 
@@ -292,8 +380,69 @@ class BaseTool(ABC):
         """
         return [self.query(v) for v in variants]
 
+    async def aquery_batch(
+        self,
+        variants: List[Variant],
+        limiters: Sequence[Any] = (),
+        bulkhead: Optional[asyncio.Semaphore] = None,
+    ) -> List[ToolResult]:
+        """
+        Query multiple variants without blocking the event loop.
+
+        Tools with a native batch endpoint (supports_batch) are called
+        once through query_batch(); otherwise the variants are queried
+        concurrently, each in a worker thread.
+
+        Args:
+            variants: List of variants to query
+            limiters: Async rate limiters (objects with `await acquire()`)
+                      that must admit each HTTP request right before it
+                      is sent through `http`. Cached results send none.
+                      They replace the tool's own per-query rate check.
+            bulkhead: Optional semaphore capping this tool's in-flight
+                      queries; held for the duration of each query
+
+        Returns:
+            List of ToolResults, in the order of `variants`
+        """
+        bulkhead = bulkhead or contextlib.nullcontext()
+        loop = asyncio.get_running_loop()
+
+        def admit() -> None:
+            # Worker thread: wait on the event loop for every limiter
+            for limiter in limiters:
+                acquire = limiter.acquire()
+                try:
+                    future = asyncio.run_coroutine_threadsafe(acquire, loop)
+                except RuntimeError:
+                    # Loop closed: the caller stopped waiting for this query
+                    acquire.close()
+                    raise
+                future.result()
+
+        def run(method: Callable[[Any], Any], arg: Any) -> Any:
+            self._admission.admit = admit if limiters else None
+            try:
+                return method(arg)
+            finally:
+                self._admission.admit = None
+
+        if self.supports_batch:
+            async with bulkhead:
+                return await asyncio.to_thread(run, self.query_batch, variants)
+
+        async def _query(variant: Variant) -> ToolResult:
+            async with bulkhead:
+                return await asyncio.to_thread(run, self.query, variant)
+
+        return list(await asyncio.gather(*[_query(v) for v in variants]))
+
     def _check_rate_limit(self) -> bool:
         """Check if we're within rate limits."""
+        with self._rate_lock:
+            return self._check_rate_limit_locked()
+
+    def _check_rate_limit_locked(self) -> bool:
         now = datetime.now()
 
         # Clean old timestamps
@@ -29,7 +29,7 @@ import logging
 
 import requests
 
-from .base_tool import BaseTool, ToolResult, ToolStatus, Variant
+from .base_tool import BaseTool, ToolResult, ToolStatus, Variant, transient_status
 
 logger = logging.getLogger(__name__)
 
@@ -75,15 +75,21 @@ class ClinVarTool(BaseTool):
         "no_assertion_criteria_provided": 0,
     }
 
-    def __init__(self, api_key: Optional[str] = None, use_stub: bool = False):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_stub: bool = False,
+        client: Optional[Any] = None,
+    ):
         """
         Initialize ClinVar tool.
 
         Args:
             api_key: NCBI API key (optional but recommended for higher rate limits)
             use_stub: If True, use stub data instead of real API (for testing)
+            client: Shared HTTP session (e.g. requests.Session) for connection reuse
         """
-        super().__init__()
+        super().__init__(client=client)
         self.api_key = api_key or os.environ.get("NCBI_API_KEY")
         self.use_stub = use_stub or os.environ.get("CLINVAR_USE_STUB", "").lower() == "true"
         self._last_request_time = 0.0
@@ -127,7 +133,9 @@ class ClinVarTool(BaseTool):
         Query ClinVar for a single variant using NCBI E-utilities.
 
         Uses esearch to find ClinVar IDs, then esummary to fetch details.
-        Falls back to stub data if API fails or use_stub is True.
+        Falls back to stub data if use_stub is True or the API fails
+        permanently; transient failures (429, 5xx, timeouts, connection
+        errors) are raised so the caller can retry.
         """
         # Use stub data if configured
         if self.use_stub:
@@ -160,6 +168,8 @@ class ClinVarTool(BaseTool):
                 return self._not_found_result(variant)
 
         except requests.RequestException as e:
+            if transient_status(e) is not None:
+                raise
             logger.error(f"ClinVar API request failed: {e}")
             # Fall back to stub on network errors
             logger.info("Falling back to stub data due to API error")
@@ -175,13 +185,15 @@ class ClinVarTool(BaseTool):
 
     def _rate_limit(self) -> None:
         """Enforce rate limiting between API requests."""
-        min_interval = 1.0 / self.rate_limit_per_second
-        elapsed = time.time() - self._last_request_time
-        if elapsed < min_interval:
-            sleep_time = min_interval - elapsed
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.3f}s")
-            time.sleep(sleep_time)
-        self._last_request_time = time.time()
+        # Held while sleeping so concurrent queries are spaced out too
+        with self._rate_lock:
+            min_interval = 1.0 / self.rate_limit_per_second
+            elapsed = time.time() - self._last_request_time
+            if elapsed < min_interval:
+                sleep_time = min_interval - elapsed
+                logger.debug(f"Rate limiting: sleeping {sleep_time:.3f}s")
+                time.sleep(sleep_time)
+            self._last_request_time = time.time()
 
     def _esearch(self, query: str) -> List[str]:
         """
@@ -204,7 +216,7 @@ class ClinVarTool(BaseTool):
         if self.api_key:
             params["api_key"] = self.api_key
 
-        response = requests.get(self.ESEARCH_URL, params=params, timeout=30)
+        response = self.http.get(self.ESEARCH_URL, params=params, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -239,7 +251,7 @@ class ClinVarTool(BaseTool):
         if self.api_key:
             params["api_key"] = self.api_key
 
-        response = requests.get(self.ESUMMARY_URL, params=params, timeout=30)
+        response = self.http.get(self.ESUMMARY_URL, params=params, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -429,7 +441,7 @@ class ClinVarTool(BaseTool):
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            response = requests.get(einfo_url, params=params, timeout=30)
+            response = self.http.get(einfo_url, params=params, timeout=30)
             response.raise_for_status()
 
             data = response.json()
@@ -15,8 +15,7 @@ https://gnomad.broadinstitute.org/api
 """
 
 from typing import Any, Dict, Optional
-import requests
-from .base_tool import BaseTool, Variant
+from .base_tool import BaseTool, Variant, transient_status
 
 class GnomADTool(BaseTool):
     name = "gnomad"
@@ -60,11 +59,13 @@ class GnomADTool(BaseTool):
         """
         
         try:
-            response = requests.post(
+            response = self.http.post(
                 "https://gnomad.broadinstitute.org/api",
                 json={"query": query, "variables": {"variantId": variant_id}},
                 timeout=5
             )
+            if response.status_code == 429 or response.status_code >= 500:
+                response.raise_for_status()  # transient: let the caller retry
             if response.status_code != 200:
                 return {"error": f"API Error {response.status_code}", "source": "gnomAD"}
 
@@ -90,5 +91,7 @@ class GnomADTool(BaseTool):
             }
             
         except Exception as e:
+            if transient_status(e) is not None:
+                raise
             return {"error": str(e), "source": "gnomAD (failed)"}
 
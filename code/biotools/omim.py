@@ -33,7 +33,7 @@ import logging
 
 import requests
 
-from .base_tool import BaseTool, ToolResult, ToolStatus, Variant
+from .base_tool import BaseTool, ToolResult, ToolStatus, Variant, transient_status
 
 logger = logging.getLogger(__name__)
 
@@ -133,7 +133,12 @@ class OMIMTool(BaseTool):
     rate_limit_per_second = 4  # OMIM recommends max 4 requests/second
     rate_limit_per_minute = 240
 
-    def __init__(self, api_key: Optional[str] = None, use_stub: bool = False):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_stub: bool = False,
+        client: Optional[Any] = None,
+    ):
         """
         Initialize OMIM tool.
 
@@ -141,8 +146,9 @@ class OMIMTool(BaseTool):
             api_key: OMIM API key. Required for full access.
                     Register at https://www.omim.org/api
             use_stub: If True, use stub data instead of real API (for testing)
+            client: Shared HTTP session (e.g. requests.Session) for connection reuse
         """
-        super().__init__()
+        super().__init__(client=client)
         self.api_key = api_key or os.environ.get("OMIM_API_KEY")
         self.use_stub = use_stub or os.environ.get("OMIM_USE_STUB", "").lower() == "true"
         self._last_request_time = 0.0
@@ -170,6 +176,8 @@ class OMIMTool(BaseTool):
         Query OMIM for gene-disease relationships.
 
         Uses real OMIM API if API key is available, otherwise returns stub data.
+        Transient API failures (429, 5xx, timeouts, connection errors) are
+        raised so the caller can retry; other API errors fall back to stub.
         """
         gene = variant.gene
 
@@ -182,6 +190,8 @@ class OMIMTool(BaseTool):
         try:
             return self._query_api(gene)
         except requests.RequestException as e:
+            if transient_status(e) is not None:
+                raise
             logger.error(f"OMIM API request failed: {e}")
             stub_result = self._stub_query(gene)
             stub_result["data_source"] = f"STUB - API error: {str(e)}"
@@ -194,13 +204,15 @@ class OMIMTool(BaseTool):
 
     def _rate_limit(self) -> None:
         """Enforce rate limiting between API requests."""
-        min_interval = 1.0 / self.rate_limit_per_second
-        elapsed = time.time() - self._last_request_time
-        if elapsed < min_interval:
-            sleep_time = min_interval - elapsed
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.3f}s")
-            time.sleep(sleep_time)
-        self._last_request_time = time.time()
+        # Held while sleeping so concurrent queries are spaced out too
+        with self._rate_lock:
+            min_interval = 1.0 / self.rate_limit_per_second
+            elapsed = time.time() - self._last_request_time
+            if elapsed < min_interval:
+                sleep_time = min_interval - elapsed
+                logger.debug(f"Rate limiting: sleeping {sleep_time:.3f}s")
+                time.sleep(sleep_time)
+            self._last_request_time = time.time()
 
     def _query_api(self, gene: str) -> Dict[str, Any]:
         """
@@ -222,7 +234,7 @@ class OMIMTool(BaseTool):
             "apiKey": self.api_key,
         }
 
-        response = requests.get(self.GENEINFO_URL, params=params, timeout=30)
+        response = self.http.get(self.GENEINFO_URL, params=params, timeout=30)
         response.raise_for_status()
 
         data = response.json()
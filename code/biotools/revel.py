@@ -103,14 +103,15 @@ class REVELTool(BaseTool):
         "phastCons",
     ]
 
-    def __init__(self, database_path: Optional[str] = None):
+    def __init__(self, database_path: Optional[str] = None, client: Optional[Any] = None):
         """
         Initialize REVEL tool.
 
         Args:
             database_path: Path to dbNSFP database (tabix-indexed TSV).
+            client: Shared HTTP session (e.g. requests.Session) for connection reuse
         """
-        super().__init__()
+        super().__init__(client=client)
         self.database_path = database_path or os.environ.get("DBNSFP_PATH")
         self._db_connection = None
 
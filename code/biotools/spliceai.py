@@ -25,7 +25,7 @@ from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 import os
 
-from .base_tool import BaseTool, ToolResult, ToolStatus, Variant
+from .base_tool import BaseTool, ToolResult, ToolStatus, Variant, transient_status
 
 
 @dataclass
@@ -100,15 +100,16 @@ class SpliceAITool(BaseTool):
     MODERATE_IMPACT_THRESHOLD = 0.5
     LOW_IMPACT_THRESHOLD = 0.2
 
-    def __init__(self, database_path: Optional[str] = None):
+    def __init__(self, database_path: Optional[str] = None, client: Optional[Any] = None):
         """
         Initialize SpliceAI tool.
 
         Args:
             database_path: Path to pre-computed SpliceAI scores database.
                           If None, will use API lookup.
+            client: Shared HTTP session (e.g. requests.Session) for connection reuse
         """
-        super().__init__()
+        super().__init__(client=client)
         self.database_path = database_path or os.environ.get("SPLICEAI_DB_PATH")
         self._db_connection = None
 
@@ -153,8 +154,6 @@ class SpliceAITool(BaseTool):
         Query Broad Institute SpliceAI API.
         Reference: https://spliceailookup-api.broadinstitute.org/
         """
-        import requests
-
         # Construct variant string: CHR-POS-REF-ALT
         chrom = str(variant.chromosome).replace("chr", "")
         variant_str = f"{chrom}-{variant.position}-{variant.reference}-{variant.alternate}"
@@ -169,7 +168,7 @@ class SpliceAITool(BaseTool):
         }
         
         try:
-            response = requests.get(url, params=params, timeout=5)
+            response = self.http.get(url, params=params, timeout=5)
             response.raise_for_status()
             data = response.json()
             
@@ -224,6 +223,9 @@ class SpliceAITool(BaseTool):
             }
 
         except Exception as e:
+            # Transient API failures are retried by the caller
+            if transient_status(e) is not None:
+                raise
             # Fail silently to stub for reliability during development
             return self._stub_query(variant)
 
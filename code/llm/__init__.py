@@ -2,12 +2,13 @@
 LLM Package: HIPAA-Safe Local Language Model Integration
 
 This package provides LangChain-compatible LLM interfaces
-using ONLY local execution backends (llama.cpp).
+using ONLY local execution backends (llama.cpp, MLX on Apple Silicon, or vLLM on CUDA GPUs).
 
 NO cloud APIs are permitted - all inference runs locally.
 
 Components:
 - LLMFactory: Factory for creating local LLM instances
+- MLXLLM: LangChain wrapper for mlx-lm (Apple Silicon)
 - PromptAdapter: Convert prompts to LangChain templates
 - HIPAAViolationError: Raised when cloud APIs are detected
 
@@ -23,6 +24,13 @@ from .llm_factory import (
     MODEL_REGISTRY,
     AGENT_MODEL_DEFAULTS,
     get_llm,
+    get_shared_factory,
+    is_vllm_available,
+)
+from .mlx_llm import (
+    MLXLLM,
+    MLXPrefixCache,
+    is_mlx_available,
 )
 from .prompt_adapter import (
     PromptAdapter,
@@ -32,8 +40,11 @@ from .json_extractor import (
     extract_json,
     enforce_schema,
     JSONExtractionError,
+    JSONFieldStream,
     INGESTION_SCHEMA,
+    INGESTION_JSON_SCHEMA,
     STRUCTURING_SCHEMA,
+    STRUCTURING_JSON_SCHEMA,
     SYNTHESIS_SCHEMA,
 )
 
@@ -41,6 +52,11 @@ __all__ = [
     # Factory
     "LLMFactory",
     "get_llm",
+    "get_shared_factory",
+    "MLXLLM",
+    "MLXPrefixCache",
+    "is_mlx_available",
+    "is_vllm_available",
     # Error types
     "HIPAAViolationError",
     "JSONExtractionError",
@@ -55,7 +71,10 @@ __all__ = [
     # JSON extraction
     "extract_json",
     "enforce_schema",
+    "JSONFieldStream",
     "INGESTION_SCHEMA",
+    "INGESTION_JSON_SCHEMA",
     "STRUCTURING_SCHEMA",
+    "STRUCTURING_JSON_SCHEMA",
     "SYNTHESIS_SCHEMA",
 ]
@@ -17,7 +17,28 @@ Date: November 2025
 
 import json
 import re
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON decoder
+    orjson = None
+
+
+def _loads(text: str) -> Any:
+    """
+    json.loads, via orjson when installed.
+
+    orjson is stricter (no NaN/Infinity, 64-bit integers only), so its
+    rejections are re-checked with the stdlib parser. Errors are
+    json.JSONDecodeError either way (orjson's is a subclass).
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
 
 
 class JSONExtractionError(Exception):
@@ -102,7 +123,7 @@ def _try_direct_parse(text: str) -> Tuple[Optional[Dict[str, Any]], float]:
     cleaned = text.strip()
 
     try:
-        result = json.loads(cleaned)
+        result = _loads(cleaned)
         if isinstance(result, dict):
             return result, 1.0
         elif isinstance(result, list):
@@ -128,7 +149,7 @@ def _extract_from_code_blocks(text: str) -> Tuple[Optional[Dict[str, Any]], floa
         for match in matches:
             cleaned = match.strip()
             try:
-                result = json.loads(cleaned)
+                result = _loads(cleaned)
                 if isinstance(result, dict):
                     return result, 0.95
                 elif isinstance(result, list):
@@ -182,7 +203,7 @@ def _extract_json_pattern(text: str) -> Tuple[Optional[Dict[str, Any]], float]:
 
     for start, end, candidate in candidates[:5]:  # Try top 5
         try:
-            result = json.loads(candidate)
+            result = _loads(candidate)
             if isinstance(result, dict):
                 return result, 0.85
         except json.JSONDecodeError:
@@ -193,7 +214,7 @@ def _extract_json_pattern(text: str) -> Tuple[Optional[Dict[str, Any]], float]:
                 for trim_len in range(1, min(50, len(candidate))):
                     trimmed = candidate[:-trim_len]
                     if trimmed.endswith('}'):
-                        result = json.loads(trimmed)
+                        result = _loads(trimmed)
                         if isinstance(result, dict):
                             return result, 0.75
             except json.JSONDecodeError:
@@ -227,7 +248,7 @@ def _try_repair_json(text: str) -> Tuple[Optional[Dict[str, Any]], float]:
     candidate = re.sub(r':\s*([a-zA-Z_][a-zA-Z0-9_\s]*[a-zA-Z0-9_])(\s*[,}\]])', r': "\1"\2', candidate)
 
     try:
-        result = json.loads(candidate)
+        result = _loads(candidate)
         if isinstance(result, dict):
             return result, 0.7
     except json.JSONDecodeError:
@@ -236,6 +257,114 @@ def _try_repair_json(text: str) -> Tuple[Optional[Dict[str, Any]], float]:
     return None, 0.0
 
 
+class JSONFieldStream:
+    """
+    Incremental scanner for a streamed JSON object.
+
+    feed() takes response chunks as they arrive and calls
+    on_field(key, value) for each top-level field as soon as its value
+    is complete, so consumers can act on e.g. chief_complaint before
+    the rest of the object has been generated. For top-level arrays
+    named in item_keys, on_item(key, item) is also called for each
+    element as soon as it closes. Text before the first "{" is ignored;
+    values that do not parse are skipped (the full response is still
+    parsed afterwards).
+    """
+
+    __slots__ = (
+        "_on_field", "_on_item", "_item_keys", "_text", "_pos", "_depth",
+        "_done", "_in_string", "_escape", "_key_start", "_key",
+        "_value_start", "_item_start",
+    )
+
+    def __init__(
+        self,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+        on_item: Optional[Callable[[str, Any], None]] = None,
+        item_keys: Iterable[str] = (),
+    ):
+        self._on_field = on_field
+        self._on_item = on_item
+        self._item_keys = frozenset(item_keys) if on_item is not None else frozenset()
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._key_start = 0
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> None:
+        if self._done:
+            return
+        self._text += chunk
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._value_start is None:
+                        self._key = text[self._key_start + 1:i]
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = i
+            elif ch == ":":
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = i + 1
+            elif ch == "{" or ch == "[":
+                if ch == "[" and self._depth == 1 and self._key in self._item_keys:
+                    self._item_start = i + 1
+                self._depth += 1
+            elif ch == "," or ch == "}" or ch == "]":
+                if self._depth == 2 and self._item_start is not None:
+                    self._emit_item(text[self._item_start:i])
+                    self._item_start = i + 1 if ch == "," else None
+                elif self._depth == 1 and self._value_start is not None:
+                    self._emit(text[self._value_start:i])
+                if ch != ",":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._done = True
+                        break
+        self._pos = len(text)
+
+    def _emit(self, raw_value: str) -> None:
+        key, self._key, self._value_start = self._key, None, None
+        if key is None or self._on_field is None:
+            return
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            return
+        self._on_field(key, value)
+
+    def _emit_item(self, raw_item: str) -> None:
+        if not raw_item.strip():  # empty array
+            return
+        try:
+            item = json.loads(raw_item)
+        except ValueError:
+            return
+        self._on_item(self._key, item)
+
+
 def enforce_schema(
     data: Dict[str, Any],
     schema: Dict[str, Any],
@@ -279,6 +408,42 @@ INGESTION_SCHEMA = {
     "warnings": [],
 }
 
+# JSON Schema of the ingestion output, for grammar-constrained decoding
+# (llama.cpp turns it into a GBNF grammar, so output always parses)
+_NULLABLE_STRING = {"type": ["string", "null"]}
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+_EXAM_SYSTEMS = (
+    "general", "neurological", "musculoskeletal",
+    "cardiovascular", "respiratory", "other",
+)
+INGESTION_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "patient_id": {"type": "string"},
+        "demographics": {
+            "type": "object",
+            "properties": {
+                "age": {"type": ["integer", "null"]},
+                "sex": {"enum": ["male", "female", None]},
+                "ethnicity": _NULLABLE_STRING,
+            },
+            "required": ["age", "sex", "ethnicity"],
+        },
+        "chief_complaint": {"type": "string"},
+        "history_present_illness": {"type": "string"},
+        "past_medical_history": _STRING_LIST,
+        "family_history": {"type": "string"},
+        "physical_exam": {
+            "type": "object",
+            "properties": {name: {"type": "string"} for name in _EXAM_SYSTEMS},
+            "required": list(_EXAM_SYSTEMS),
+        },
+        "confidence": {"type": "number"},
+        "warnings": _STRING_LIST,
+    },
+    "required": list(INGESTION_SCHEMA),
+}
+
 STRUCTURING_SCHEMA = {
     "diagnostic_table": [],
     "variants_table": [],
@@ -290,6 +455,76 @@ STRUCTURING_SCHEMA = {
     },
 }
 
+# JSON Schema of the structuring output (llama.cpp grammar / vLLM guided
+# decoding); at least one diagnosis, since an empty table is a failed run
+STRUCTURING_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "diagnostic_table": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "diagnosis": {"type": "string"},
+                    "omim_id": _NULLABLE_STRING,
+                    "confidence": {"type": "number"},
+                    "inheritance": _NULLABLE_STRING,
+                    "supporting_evidence": _STRING_LIST,
+                    "contradicting_evidence": _STRING_LIST,
+                    "rank": {"type": "integer"},
+                },
+                "required": ["diagnosis", "confidence", "rank"],
+            },
+        },
+        "variants_table": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "gene": {"type": "string"},
+                    "variant": {"type": "string"},
+                    "protein_change": _NULLABLE_STRING,
+                    "zygosity": {"type": "string"},
+                    "pathogenicity_class": {
+                        "enum": [
+                            "pathogenic", "likely_pathogenic", "uncertain_significance",
+                            "likely_benign", "benign",
+                        ],
+                    },
+                    "priority": {"type": "integer"},
+                    "rationale": {"type": "string"},
+                    "associated_diagnoses": _STRING_LIST,
+                },
+                "required": ["gene", "variant", "pathogenicity_class", "priority"],
+            },
+        },
+        "tool_usage_plan": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "tool_name": {"type": "string"},
+                    "priority": {"enum": ["high", "medium", "low"]},
+                    "variants_to_query": _STRING_LIST,
+                    "expected_evidence": {"type": "string"},
+                    "timeout_seconds": {"type": "integer"},
+                    "parameters": {"type": "object"},
+                },
+                "required": ["tool_name", "priority", "variants_to_query"],
+            },
+        },
+        "reasoning": {
+            "type": "object",
+            "properties": {
+                name: {"type": "string"} for name in STRUCTURING_SCHEMA["reasoning"]
+            },
+            "required": list(STRUCTURING_SCHEMA["reasoning"]),
+        },
+    },
+    "required": list(STRUCTURING_SCHEMA),
+}
+
 SYNTHESIS_SCHEMA = {
     "sections": {
         "executive_summary": {"title": "Executive Summary", "content": ""},
@@ -5,12 +5,14 @@ This module provides a factory for creating LangChain LLM instances
 using ONLY local execution backends. NO cloud APIs are permitted.
 
 HIPAA Compliance:
-- All inference runs locally via llama-cpp-python
+- All inference runs locally via llama-cpp-python (or mlx-lm, vLLM)
 - No data leaves the machine
 - No cloud API keys required or accepted
 
 Supported Backends:
 - llama.cpp (via langchain_community.llms.LlamaCpp)
+- mlx (via mlx-lm, Apple Silicon only; see mlx_llm.py)
+- vllm (via langchain_community.llms.VLLM, CUDA GPUs)
 
 FORBIDDEN (will raise HIPAAViolationError):
 - langchain_openai
@@ -22,14 +24,21 @@ Date: November 2025
 """
 
 import gc
+import importlib.util
 import os
+import re
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from langchain_core.language_models.llms import BaseLLM
 
+from .mlx_llm import MLX_MODEL_REPOS, MLX_MODEL_REPOS_3BIT, is_mlx_available
+
+# Quantization tag at the end of a GGUF filename ("...-Q4_K_M.gguf")
+_QUANT_TAG_RE = re.compile(r"(?<=-)Q\d\w*(?=\.gguf$)")
+
 
 class HIPAAViolationError(Exception):
     """Raised when attempting to use a cloud-based LLM provider."""
@@ -89,6 +98,46 @@ MODEL_CHAT_FORMATS: Dict[str, str] = {
     "qwen-2.5-32b-instruct": "chatml",
 }
 
+# Registry model names -> compressed-tensors checkpoints served by vLLM.
+# w8a8 (INT8 weights and activations) uses INT8 tensor cores; w4a16
+# moves a quarter of the fp16 weight bytes per decoded token.
+VLLM_MODEL_REPOS: Dict[str, str] = {
+    "qwen-2.5-14b-instruct": "neuralmagic-ent/Qwen2.5-14B-Instruct-quantized.w8a8",
+}
+
+VLLM_MODEL_REPOS_W4A16: Dict[str, str] = {
+    "qwen-2.5-14b-instruct": "neuralmagic-ent/Qwen2.5-14B-Instruct-quantized.w4a16",
+}
+
+# Original checkpoints, quantized to FP8 by vLLM at load time (opt-in with
+# quantization="fp8"). FP8 tensor cores (Ada/Hopper, compute capability
+# 8.9+) run the matmuls natively and a 14B model then takes ~15GB, but the
+# bf16 weights (~30GB) are read onto the GPU before quantizing, so loading
+# needs a GPU that holds them: a 24GB card should stay on w8a8.
+VLLM_MODEL_REPOS_FP8: Dict[str, str] = {
+    "qwen-2.5-14b-instruct": "Qwen/Qwen2.5-14B-Instruct",
+}
+
+# Lowest CUDA compute capability with FP8 tensor cores
+FP8_MIN_COMPUTE_CAPABILITY = (8, 9)
+
+
+def is_vllm_available() -> bool:
+    """True with vllm installed (it needs a CUDA GPU to load models)."""
+    return importlib.util.find_spec("vllm") is not None
+
+
+def cuda_compute_capability() -> Optional[Tuple[int, int]]:
+    """(major, minor) of the first CUDA GPU, or None without one (or torch)."""
+    try:
+        import torch
+    except ImportError:
+        return None
+    if not torch.cuda.is_available():
+        return None
+    return tuple(torch.cuda.get_device_capability(0))
+
+
 # Aliases for flexible model naming
 MODEL_ALIASES: Dict[str, str] = {
     "qwen2.5-14b-instruct": "qwen-2.5-14b-instruct",
@@ -160,6 +209,16 @@ class LLMFactory:
 
         self._current_model: Optional[BaseLLM] = None
         self._current_model_name: Optional[str] = None
+        self._current_backend: Optional[str] = None
+        self._current_n_ctx: int = 0
+        self._current_quantization: Optional[str] = None
+        self._requested_quantization: Optional[str] = None
+        self._current_draft_model: Optional[str] = None
+
+        # Number of agents currently holding each model (see get_or_create)
+        # and the callbacks that make them drop it when it is unloaded
+        self._refcounts: Dict[str, int] = {}
+        self._evict_callbacks: Dict[str, List[Callable[[], None]]] = {}
 
     def _enforce_hipaa_compliance(self) -> None:
         """
@@ -181,8 +240,14 @@ class LLMFactory:
         """Resolve model aliases to canonical names."""
         return MODEL_ALIASES.get(model_name, model_name)
 
-    def _get_model_path(self, model_name: str) -> Path:
-        """Get the full path to a model file."""
+    def _get_model_path(self, model_name: str, quantization: Optional[str] = None) -> Path:
+        """
+        Get the full path to a model file.
+
+        With `quantization` (e.g. "Q3_K_S"), the registry filename's
+        quantization tag is swapped for it; if that file has not been
+        downloaded, the registry file is used instead.
+        """
         # Resolve aliases first
         model_name = self._resolve_model_name(model_name)
 
@@ -195,6 +260,13 @@ class LLMFactory:
         spec = MODEL_REGISTRY[model_name]
         model_path = self.models_dir / spec.filename
 
+        if quantization:
+            variant_path = self.models_dir / _QUANT_TAG_RE.sub(quantization, spec.filename)
+            if variant_path.exists():
+                return variant_path
+            if variant_path != model_path:
+                print(f"[LLMFactory] {variant_path.name} not found, using {spec.filename}")
+
         if not model_path.exists():
             raise FileNotFoundError(
                 f"Model file not found: {model_path}\n"
@@ -213,11 +285,28 @@ class LLMFactory:
         top_p: float = 0.9,
         top_k: int = 40,
         repeat_penalty: float = 1.1,
+        n_ctx: Optional[int] = None,
+        use_mmap: bool = True,
+        use_mlock: bool = False,
+        compute_dtype: str = "float16",
+        n_threads: Optional[int] = None,
+        n_gpu_layers: Optional[int] = None,
+        n_batch: Optional[int] = None,
+        backend: str = "llama.cpp",
+        quantization: Optional[str] = None,
+        draft_model: Optional[str] = None,
+        num_draft_tokens: int = 3,
         **kwargs: Any,
     ) -> BaseLLM:
         """
         Create a LangChain LLM instance for local inference.
 
+        The sampling arguments (temperature, max_tokens, top_p, top_k,
+        repeat_penalty) are the defaults of a newly loaded model. A
+        resident model that is reused keeps the defaults it was loaded
+        with, since other callers may hold it; pass per-call values to
+        invoke()/generate() instead (as BaseAgent._llm_kwargs() does).
+
         Args:
             agent_type: Agent type (ingestion, structuring, synthesis).
                        Uses default model for that agent type.
@@ -227,10 +316,46 @@ class LLMFactory:
             top_p: Nucleus sampling probability
             top_k: Top-k sampling
             repeat_penalty: Penalty for repeated tokens
-            **kwargs: Additional arguments passed to LlamaCpp
+            n_ctx: Context window to allocate (defaults to the model's
+                   full context length). The KV cache scales linearly with
+                   it, so right-sizing this is the main load-time memory knob.
+            use_mmap: Memory-map the GGUF file (zero-copy, page-cache shared)
+            use_mlock: Lock model pages in RAM
+            compute_dtype: KV-cache precision. GGUF weights stay quantized
+                   in llama.cpp (no dequantize-at-load step), so this is
+                   the dtype that decides runtime memory: "float16" or
+                   "bfloat16" keep a half-precision KV cache, "float32"
+                   doubles it.
+            n_threads: CPU threads for llama.cpp (None = library default)
+            n_gpu_layers: Layers to offload to the GPU for this model
+                   (-1 = all; None = the factory's n_gpu_layers)
+            n_batch: Prompt-processing batch size (None = the factory's)
+            backend: "llama.cpp", "mlx" or "vllm". MLX is used only on
+                   Apple Silicon with mlx-lm installed and MLX weights
+                   known for the model (MLX_MODEL_REPOS); vLLM only with
+                   vllm installed and a checkpoint in VLLM_MODEL_REPOS.
+                   Otherwise llama.cpp.
+            quantization: GGUF quantization tag to load instead of the
+                   registry default (e.g. "Q3_K_S": smaller file, so
+                   faster bandwidth-bound decode). Falls back to the
+                   registry file if that variant is not downloaded. On
+                   MLX, "Q3*" selects the 3-bit weights; on vLLM, "w4a16"
+                   selects the 4-bit weight checkpoint and "fp8" quantizes
+                   the original weights at load (see
+                   VLLM_MODEL_REPOS_FP8); default w8a8.
+            draft_model: Enable speculative decoding. On MLX and vLLM this
+                   is the draft model (repo id, or directory name under
+                   models_dir), which must share the main model's
+                   tokenizer. llama-cpp-python cannot run a second GGUF
+                   as draft, so on llama.cpp any value enables prompt-
+                   lookup decoding (drafts copied from the prompt, which
+                   suits extraction output).
+            num_draft_tokens: Tokens drafted per verification step
+            **kwargs: Additional arguments passed to LlamaCpp (or to
+                   VLLM, e.g. tensor_parallel_size)
 
         Returns:
-            LangChain BaseLLM instance (LlamaCpp)
+            LangChain BaseLLM instance (LlamaCpp, MLXLLM or VLLM)
 
         Raises:
             HIPAAViolationError: If cloud LLM modules are detected
@@ -251,23 +376,102 @@ class LLMFactory:
         # Resolve aliases to canonical names
         model_name = self._resolve_model_name(model_name)
 
-        # Unload current model if different
-        if self._current_model_name and self._current_model_name != model_name:
+        if backend not in ("llama.cpp", "mlx", "vllm"):
+            raise ValueError(f"Unknown backend: {backend}. Available: llama.cpp, mlx, vllm")
+        if backend == "mlx" and not (model_name in MLX_MODEL_REPOS and is_mlx_available()):
+            backend = "llama.cpp"
+        if backend == "vllm" and not (model_name in VLLM_MODEL_REPOS and is_vllm_available()):
+            backend = "llama.cpp"
+
+        # Context window: requested size, capped at the model's trained length
+        spec = MODEL_REGISTRY.get(model_name)
+        if spec is not None:
+            n_ctx = min(n_ctx or spec.context_length, spec.context_length)
+
+        # Unload current model if different (name, backend, quantization or
+        # draft model),
+        # or if its context is too small
+        if self._current_model_name and (
+            self._current_model_name != model_name
+            or self._current_backend != backend
+            or (n_ctx or 0) > self._current_n_ctx
+            or (
+                quantization
+                and quantization not in (self._requested_quantization, self._current_quantization)
+            )
+            or draft_model != self._current_draft_model
+        ):
+            # Holders that registered on_evict drop the model with it; any
+            # other holder would keep using (and pinning) an unloaded model
+            current = self._current_model_name
+            holders = self._refcounts.get(current, 0)
+            if holders > len(self._evict_callbacks.get(current, ())):
+                raise RuntimeError(
+                    f"Cannot load {model_name}: {current} is still held by "
+                    f"{holders} caller(s); release() it first"
+                )
             self.unload()
 
         # Return cached model if same
         if self._current_model_name == model_name and self._current_model is not None:
             return self._current_model
 
+        if backend == "mlx":
+            return self._create_mlx(
+                model_name,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=top_p,
+                top_k=top_k,
+                repeat_penalty=repeat_penalty,
+                n_ctx=n_ctx,
+                quantization=quantization,
+                draft_model=draft_model,
+                num_draft_tokens=num_draft_tokens,
+            )
+
+        if backend == "vllm":
+            return self._create_vllm(
+                model_name,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=top_p,
+                top_k=top_k,
+                n_ctx=n_ctx,
+                quantization=quantization,
+                compute_dtype=compute_dtype,
+                draft_model=draft_model,
+                num_draft_tokens=num_draft_tokens,
+                **kwargs,
+            )
+
         # Load new model
-        model_path = self._get_model_path(model_name)
+        model_path = self._get_model_path(model_name, quantization)
         spec = MODEL_REGISTRY[model_name]
 
         print(f"[LLMFactory] Loading model: {model_name}")
         print(f"  Path: {model_path}")
-        print(f"  Context: {spec.context_length} tokens")
+        print(f"  Context: {n_ctx} tokens (max {spec.context_length})")
         print(f"  Memory: ~{spec.memory_gb} GB")
 
+        if n_gpu_layers is None:
+            n_gpu_layers = self.n_gpu_layers
+        if n_batch is None:
+            n_batch = self.n_batch
+        print(f"  GPU layers: {'all' if n_gpu_layers < 0 else n_gpu_layers}, batch: {n_batch}")
+
+        if draft_model:
+            try:
+                from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+            except ImportError:
+                print("  Speculative: unavailable in this llama-cpp-python build")
+            else:
+                kwargs["model_kwargs"] = {
+                    **kwargs.get("model_kwargs", {}),
+                    "draft_model": LlamaPromptLookupDecoding(num_pred_tokens=num_draft_tokens),
+                }
+                print(f"  Speculative: prompt lookup ({num_draft_tokens} draft tokens)")
+
         # Import LlamaCpp from langchain_community
         from langchain_community.llms import LlamaCpp
 
@@ -278,9 +482,9 @@ class LLMFactory:
 
         self._current_model = LlamaCpp(
             model_path=str(model_path),
-            n_ctx=spec.context_length,
-            n_gpu_layers=self.n_gpu_layers,
-            n_batch=self.n_batch,
+            n_ctx=n_ctx,
+            n_gpu_layers=n_gpu_layers,
+            n_batch=n_batch,
             temperature=temperature,
             max_tokens=max_tokens,
             top_p=top_p,
@@ -288,13 +492,198 @@ class LLMFactory:
             repeat_penalty=repeat_penalty,
             verbose=self.verbose,
             chat_format=chat_format,  # Enable proper chat template formatting
+            use_mmap=use_mmap,
+            use_mlock=use_mlock,
+            f16_kv=compute_dtype != "float32",
+            logits_all=False,  # Only last-token logits; avoids an n_ctx x vocab buffer
+            n_threads=n_threads,
             **kwargs,
         )
         self._current_model_name = model_name
+        self._current_backend = backend
+        self._current_n_ctx = n_ctx
+        self._current_quantization = _QUANT_TAG_RE.search(model_path.name).group()
+        self._requested_quantization = quantization
+        self._current_draft_model = draft_model
+
+        print(f"[LLMFactory] Model loaded successfully")
+        return self._current_model
+
+    def _create_mlx(
+        self,
+        model_name: str,
+        n_ctx: Optional[int],
+        quantization: Optional[str] = None,
+        draft_model: Optional[str] = None,
+        **params: Any,
+    ) -> BaseLLM:
+        """
+        Load `model_name` with mlx-lm (see create()).
+
+        MLX weights are taken from models_dir/<repo name> when present,
+        otherwise from the Hugging Face cache by repo id.
+        """
+        from .mlx_llm import MLXLLM
+
+        repo = MLX_MODEL_REPOS[model_name]
+        if quantization and quantization.startswith("Q3"):
+            repo = MLX_MODEL_REPOS_3BIT.get(model_name, repo)
+        model_path = self._hf_model_path(repo)
+
+        print(f"[LLMFactory] Loading model: {model_name} (MLX)")
+        print(f"  Path: {model_path}")
+        if draft_model:
+            draft_model_path = self._hf_model_path(draft_model)
+            print(f"  Draft model: {draft_model_path}")
+            params["draft_model_path"] = draft_model_path
+
+        self._current_model = MLXLLM(model_path=model_path, **params)
+        self._current_model_name = model_name
+        self._current_backend = "mlx"
+        self._current_n_ctx = n_ctx or 0
+        self._current_quantization = "mlx-" + repo.rsplit("-", 1)[-1]
+        self._requested_quantization = quantization
+        self._current_draft_model = draft_model
+
+        print(f"[LLMFactory] Model loaded successfully")
+        return self._current_model
+
+    def _create_vllm(
+        self,
+        model_name: str,
+        n_ctx: Optional[int],
+        max_tokens: int,
+        quantization: Optional[str] = None,
+        compute_dtype: str = "float16",
+        draft_model: Optional[str] = None,
+        num_draft_tokens: int = 3,
+        tensor_parallel_size: int = 1,
+        **params: Any,
+    ) -> BaseLLM:
+        """
+        Load `model_name` with vLLM (see create()).
+
+        Checkpoints are taken from models_dir/<repo name> when present,
+        otherwise from the Hugging Face cache by repo id. vLLM batches
+        the prompts of one generate() call on the GPU and reuses the KV
+        cache of shared prompt prefixes across calls.
+        """
+        from langchain_community.llms import VLLM
+
+        if quantization == "fp8" and model_name in VLLM_MODEL_REPOS_FP8:
+            repo = VLLM_MODEL_REPOS_FP8[model_name]
+            vllm_quantization, quantization_tag = "fp8", "fp8"
+            if (cuda_compute_capability() or (0, 0)) < FP8_MIN_COMPUTE_CAPABILITY:
+                print("  FP8: no FP8 tensor cores on this GPU, weight-only FP8")
+        else:
+            repo = VLLM_MODEL_REPOS[model_name]
+            if quantization == "w4a16":
+                repo = VLLM_MODEL_REPOS_W4A16.get(model_name, repo)
+            vllm_quantization, quantization_tag = "compressed-tensors", repo.rsplit(".", 1)[-1]
+        model_path = self._hf_model_path(repo)
+
+        print(f"[LLMFactory] Loading model: {model_name} (vLLM, {quantization_tag})")
+        print(f"  Path: {model_path}")
+        print(f"  Context: {n_ctx} tokens, tensor parallel: {tensor_parallel_size}")
+
+        vllm_kwargs = {
+            "quantization": vllm_quantization,
+            "max_model_len": n_ctx,
+            "enable_prefix_caching": True,
+        }
+        if draft_model:
+            draft_model_path = self._hf_model_path(draft_model)
+            print(f"  Draft model: {draft_model_path} ({num_draft_tokens} draft tokens)")
+            vllm_kwargs["speculative_config"] = {
+                "model": draft_model_path,
+                "num_speculative_tokens": num_draft_tokens,
+            }
+
+        self._current_model = VLLM(
+            model=model_path,
+            max_new_tokens=max_tokens,
+            tensor_parallel_size=tensor_parallel_size,
+            dtype="bfloat16" if compute_dtype == "bfloat16" else "float16",
+            vllm_kwargs=vllm_kwargs,
+            **params,
+        )
+        self._current_model_name = model_name
+        self._current_backend = "vllm"
+        self._current_n_ctx = n_ctx or 0
+        self._current_quantization = quantization_tag
+        self._requested_quantization = quantization
+        self._current_draft_model = draft_model
 
         print(f"[LLMFactory] Model loaded successfully")
         return self._current_model
 
+    def _hf_model_path(self, repo: str) -> str:
+        """models_dir/<repo name> if downloaded there, else the repo id."""
+        local_dir = self.models_dir / repo.split("/")[-1]
+        return str(local_dir) if local_dir.is_dir() else repo
+
+    def get_or_create(
+        self,
+        agent_type: Optional[str] = None,
+        model_name: Optional[str] = None,
+        on_evict: Optional[Callable[[], None]] = None,
+        **kwargs: Any,
+    ) -> BaseLLM:
+        """
+        Acquire a model, reusing the resident one when it matches.
+
+        Same arguments as create(), but also records that a caller holds
+        the model. Pair each call with release().
+
+        Args:
+            agent_type: See create()
+            model_name: See create()
+            on_evict: Called if the model is unloaded while still held
+                   (e.g. another caller needs a different model), so the
+                   holder drops its reference and reacquires on next use.
+                   Without it, create() refuses to replace the model until
+                   the holder releases it.
+            **kwargs: See create()
+
+        Returns:
+            LangChain BaseLLM instance
+        """
+        llm = self.create(agent_type=agent_type, model_name=model_name, **kwargs)
+        name = self._current_model_name
+        self._refcounts[name] = self._refcounts.get(name, 0) + 1
+        if on_evict is not None:
+            self._evict_callbacks.setdefault(name, []).append(on_evict)
+        return llm
+
+    def release(
+        self,
+        model_name: str,
+        force: bool = False,
+        on_evict: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Release a model acquired with get_or_create().
+
+        By default the model stays resident so the next agent using the
+        same GGUF skips the load; it is replaced when a different model is
+        requested. With force=True the model is unloaded once no other
+        caller holds it.
+
+        Args:
+            model_name: Model name passed to get_or_create()
+            force: Unload the model if this was the last holder
+            on_evict: Callback passed to get_or_create(), if any
+        """
+        model_name = self._resolve_model_name(model_name)
+        remaining = max(self._refcounts.get(model_name, 0) - 1, 0)
+        self._refcounts[model_name] = remaining
+        callbacks = self._evict_callbacks.get(model_name)
+        if on_evict is not None and callbacks and on_evict in callbacks:
+            callbacks.remove(on_evict)
+
+        if force and remaining == 0 and self._current_model_name == model_name:
+            self.unload()
+
     def create_for_agent(
         self,
         agent_type: str,
@@ -329,15 +718,26 @@ class LLMFactory:
         Unload current model and free memory.
 
         Important for sequential model loading on memory-constrained systems.
-        Call this before loading a different model size.
+        Call this before loading a different model size. Callers still
+        holding the model are notified through their on_evict callback.
         """
         if self._current_model is not None:
             print(f"[LLMFactory] Unloading model: {self._current_model_name}")
 
+            # Holders drop their references, so the weights are freed here
+            self._refcounts.pop(self._current_model_name, None)
+            for on_evict in self._evict_callbacks.pop(self._current_model_name, []):
+                on_evict()
+
             # Delete the model
             del self._current_model
             self._current_model = None
             self._current_model_name = None
+            self._current_backend = None
+            self._current_n_ctx = 0
+            self._current_quantization = None
+            self._requested_quantization = None
+            self._current_draft_model = None
 
             # Force garbage collection
             gc.collect()
@@ -392,6 +792,11 @@ class LLMFactory:
         """Get the name of the currently loaded model."""
         return self._current_model_name
 
+    @property
+    def current_quantization(self) -> Optional[str]:
+        """Quantization of the loaded weights ("Q4_K_M", "mlx-3bit", ...)."""
+        return self._current_quantization
+
     def __enter__(self) -> "LLMFactory":
         """Context manager entry."""
         return self
@@ -407,6 +812,23 @@ class LLMFactory:
         )
 
 
+# Process-wide factory shared by all agents (see get_shared_factory)
+_SHARED_FACTORY: Optional[LLMFactory] = None
+
+
+def get_shared_factory() -> LLMFactory:
+    """
+    Get the process-wide LLMFactory, creating it on first use.
+
+    Agents acquire models through this factory so that a GGUF model
+    stays loaded across agent instances that use it.
+    """
+    global _SHARED_FACTORY
+    if _SHARED_FACTORY is None:
+        _SHARED_FACTORY = LLMFactory()
+    return _SHARED_FACTORY
+
+
 # Convenience function for quick access
 def get_llm(
     agent_type: str,
@@ -0,0 +1,247 @@
+"""
+MLX LLM: LangChain wrapper for mlx-lm on Apple Silicon
+
+MLX runs quantized models on the unified-memory Metal kernels of
+M-series chips and is typically faster than llama.cpp there for small
+models. This module exposes mlx-lm as a LangChain LLM so agents can use
+it through the same invoke()/generate() interface as LlamaCpp.
+
+HIPAA Compliance:
+- Inference runs locally via mlx-lm
+- Weights are read from models_dir when present, otherwise from the
+  local Hugging Face cache (downloaded once, no patient data sent)
+
+mlx-lm is optional; LLMFactory falls back to llama.cpp when it is not
+installed or the machine is not Apple Silicon.
+
+Author: Stanley Lab / RareResearch
+Date: November 2025
+"""
+
+import importlib.util
+import platform
+import threading
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+from pydantic import PrivateAttr
+
+
+# Registry model names -> MLX-converted weights (Hugging Face repo ids)
+MLX_MODEL_REPOS = {
+    "llama-3.2-3b-instruct": "mlx-community/Llama-3.2-3B-Instruct-4bit",
+}
+
+# 3-bit weights, used when a Q3 quantization is requested (less memory
+# bandwidth per token, slightly higher perplexity)
+MLX_MODEL_REPOS_3BIT = {
+    "llama-3.2-3b-instruct": "mlx-community/Llama-3.2-3B-Instruct-3bit",
+}
+
+# Sampling settings that invoke()/stream()/generate() may override per call
+_SAMPLING_PARAMS = ("temperature", "top_p", "top_k", "max_tokens", "repeat_penalty")
+
+
+def is_mlx_available() -> bool:
+    """True on Apple Silicon with mlx-lm installed."""
+    return (
+        platform.system() == "Darwin"
+        and platform.machine() == "arm64"
+        and importlib.util.find_spec("mlx_lm") is not None
+    )
+
+
+class MLXPrefixCache:
+    """
+    KV cache prefilled with a fixed prompt prefix.
+
+    Created by MLXLLM.make_prefix_cache(); pass it as prefix_cache= to
+    invoke()/generate() and prompts starting with the prefix only prefill
+    the remaining tokens. The cache is trimmed back to the prefix after
+    each call, so one instance serves any number of prompts.
+    """
+
+    __slots__ = ("prefix", "cache", "num_tokens", "lock")
+
+    def __init__(self, prefix: str, cache: List[Any], num_tokens: int):
+        self.prefix = prefix
+        self.cache = cache
+        self.num_tokens = num_tokens
+        # The cache is mutated during generation; one call at a time
+        self.lock = threading.Lock()
+
+
+class MLXLLM(LLM):
+    """
+    LangChain LLM backed by mlx-lm.
+
+    Usage:
+        llm = MLXLLM(model_path="mlx-community/Llama-3.2-3B-Instruct-4bit")
+        response = llm.invoke("Extract the demographics from ...")
+
+        # Reuse the KV cache of a shared prompt prefix across calls
+        cache = llm.make_prefix_cache(system_prompt)
+        response = llm.invoke(system_prompt + user_message, prefix_cache=cache)
+
+    With draft_model_path set, generation is speculative: the small
+    draft model proposes num_draft_tokens tokens and the main model
+    verifies them in one forward pass. The draft must share the main
+    model's tokenizer (e.g. Llama 3.2 1B for Llama 3.2 3B).
+    """
+
+    model_path: str
+    temperature: float = 0.3
+    max_tokens: int = 4096
+    top_p: float = 0.9
+    top_k: int = 40
+    repeat_penalty: float = 1.1
+    draft_model_path: Optional[str] = None
+    num_draft_tokens: int = 3
+
+    _model: Any = PrivateAttr(default=None)
+    _tokenizer: Any = PrivateAttr(default=None)
+    _draft_model: Any = PrivateAttr(default=None)
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        from mlx_lm import load
+
+        self._model, self._tokenizer = load(self.model_path)
+        if self.draft_model_path:
+            self._draft_model, _ = load(self.draft_model_path)
+
+    @property
+    def _llm_type(self) -> str:
+        return "mlx"
+
+    def get_num_tokens(self, text: str) -> int:
+        return len(self._tokenizer.encode(text))
+
+    def make_prefix_cache(self, prefix: str) -> MLXPrefixCache:
+        """Prefill a KV cache with prefix (e.g. the static system prompt)."""
+        import mlx.core as mx
+        from mlx_lm.models.cache import make_prompt_cache
+
+        tokens = mx.array(self._tokenizer.encode(prefix))[None]
+        cache = make_prompt_cache(self._model)
+        self._model(tokens, cache=cache)
+        if self._draft_model is not None:
+            # Speculative generation expects the draft's cache appended
+            draft_cache = make_prompt_cache(self._draft_model)
+            self._draft_model(tokens, cache=draft_cache)
+            cache += draft_cache
+        mx.eval([c.state for c in cache])
+        return MLXPrefixCache(prefix, cache, tokens.shape[1])
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> str:
+        return "".join(
+            chunk.text for chunk in self._stream(prompt, stop, run_manager, **kwargs)
+        )
+
+    def _stream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Iterator[GenerationChunk]:
+        # mlx-lm has no stop-sequence support: hold back enough text to
+        # spot a stop sequence spanning two pieces, and end generation at
+        # the first one
+        stop = stop or ()
+        holdback = max((len(seq) for seq in stop), default=1) - 1
+        text = ""
+        emitted = 0
+
+        # Per-call sampling settings override the load-time defaults
+        sampling = {name: kwargs[name] for name in _SAMPLING_PARAMS if name in kwargs}
+        pieces = self._generate_pieces(prompt, kwargs.get("prefix_cache"), **sampling)
+        try:
+            for piece in pieces:
+                text += piece
+                cut = min(
+                    (idx for idx in (text.find(seq, emitted) for seq in stop) if idx != -1),
+                    default=-1,
+                )
+                end = cut if cut != -1 else len(text) - holdback
+                if end > emitted:
+                    chunk = GenerationChunk(text=text[emitted:end])
+                    emitted = end
+                    if run_manager is not None:
+                        run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+                if cut != -1:
+                    return
+        finally:
+            pieces.close()
+
+        if len(text) > emitted:
+            yield GenerationChunk(text=text[emitted:])
+
+    def _generate_pieces(
+        self,
+        prompt: str,
+        prefix_cache: Optional[MLXPrefixCache],
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        top_k: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        repeat_penalty: Optional[float] = None,
+    ) -> Iterator[str]:
+        """Yield generated text pieces, reusing prefix_cache when it applies."""
+        from mlx_lm import stream_generate
+        from mlx_lm.sample_utils import make_logits_processors, make_sampler
+
+        params = dict(
+            max_tokens=self.max_tokens if max_tokens is None else max_tokens,
+            sampler=make_sampler(
+                temp=self.temperature if temperature is None else temperature,
+                top_p=self.top_p if top_p is None else top_p,
+                top_k=self.top_k if top_k is None else top_k,
+            ),
+            logits_processors=make_logits_processors(
+                repetition_penalty=(
+                    self.repeat_penalty if repeat_penalty is None else repeat_penalty
+                )
+            ),
+        )
+        if self._draft_model is not None:
+            params["draft_model"] = self._draft_model
+            params["num_draft_tokens"] = self.num_draft_tokens
+
+        # Only the part after a cached prefix needs prefilling
+        if (
+            prefix_cache is None
+            or len(prompt) <= len(prefix_cache.prefix)
+            or not prompt.startswith(prefix_cache.prefix)
+        ):
+            for response in stream_generate(
+                self._model, self._tokenizer, prompt=prompt, **params
+            ):
+                yield response.text
+            return
+
+        suffix = self._tokenizer.encode(
+            prompt[len(prefix_cache.prefix):], add_special_tokens=False
+        )
+        with prefix_cache.lock:
+            try:
+                for response in stream_generate(
+                    self._model,
+                    self._tokenizer,
+                    prompt=suffix,
+                    prompt_cache=prefix_cache.cache,
+                    **params,
+                ):
+                    yield response.text
+            finally:
+                # Per layer: main and draft caches can end at different offsets
+                for layer_cache in prefix_cache.cache:
+                    layer_cache.trim(layer_cache.offset - prefix_cache.num_tokens)
@@ -18,8 +18,14 @@ Date: November 2025
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
+import re
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from langchain_core.prompts import (
     ChatPromptTemplate,
     HumanMessagePromptTemplate,
@@ -72,6 +78,9 @@ class PromptAdapter:
         result = chain.invoke({"patient_data": "..."})
     """
 
+    # Matches {variable_name} placeholders in user templates
+    _VAR_RE = re.compile(r'\{(\w+)\}')
+
     # Model-specific chat templates
     MODEL_TEMPLATES = {
         "llama": {
@@ -145,7 +154,7 @@ class PromptAdapter:
             raise FileNotFoundError(f"Prompt template not found: {template_path}")
 
         with open(template_path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader)
 
         # Extract variables from user template
         user_template = data.get("user", "")
@@ -165,9 +174,7 @@ class PromptAdapter:
 
     def _extract_variables(self, template: str) -> List[str]:
         """Extract variable names from a template string."""
-        import re
-        # Match {variable_name} patterns
-        return re.findall(r'\{(\w+)\}', template)
+        return self._VAR_RE.findall(template)
 
     def to_langchain(
         self,
@@ -248,10 +255,13 @@ class PromptAdapter:
                         f"{fmt['assistant_prefix']}{example['assistant']}{fmt['assistant_suffix']}"
                     )
 
-        # User message with variable substitution
-        user_content = template.user_template
-        for key, value in variables.items():
-            user_content = user_content.replace(f"{{{key}}}", str(value))
+        # User message with variable substitution (single regex pass;
+        # placeholders without a value are left untouched)
+        def _substitute(match: re.Match) -> str:
+            name = match.group(1)
+            return str(variables[name]) if name in variables else match.group(0)
+
+        user_content = self._VAR_RE.sub(_substitute, template.user_template)
 
         parts.append(f"{fmt['user_prefix']}{user_content}{fmt['user_suffix']}")
 
@@ -73,7 +73,7 @@ def ingestion_node(state: UH2025AgentState) -> Dict[str, Any]:
     print(f"  - Confidence: {confidence:.2f}")
     print(f"  - Warnings: {len(warnings_list)}")
 
-    # Unload model to free memory
+    # Release model (stays resident for reuse until a different model is needed)
     agent.unload_model()
 
     return {
@@ -143,7 +143,7 @@ def structuring_node(state: UH2025AgentState) -> Dict[str, Any]:
     # Determine if we need more tools or can proceed to synthesis
     needs_more = len(tool_plan) > 0 and iteration < max_iterations
 
-    # Unload model to free memory
+    # Release model (stays resident for reuse until a different model is needed)
     agent.unload_model()
 
     return {
@@ -192,10 +192,13 @@ def executor_node(state: UH2025AgentState) -> Dict[str, Any]:
     # Create and run executor agent
     agent = ExecutorAgent()
 
-    result = agent.run({
-        "tool_usage_plan": tool_plan,
-        "variants_table": state.get("variants_table", []),
-    })
+    try:
+        result = agent.run({
+            "tool_usage_plan": tool_plan,
+            "variants_table": state.get("variants_table", []),
+        })
+    finally:
+        agent.close()
 
     # Handle errors (executor shouldn't fail, just report tool failures)
     if result.get("status") == "failed":
@@ -286,8 +289,8 @@ def synthesis_node(state: UH2025AgentState) -> Dict[str, Any]:
     else:
         duration = 0.0
 
-    # Unload model
-    agent.unload_model()
+    # Last LLM stage: unload model to free memory
+    agent.unload_model(force=True)
 
     return {
         "diagnostic_report": report,
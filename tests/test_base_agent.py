@@ -0,0 +1,189 @@
+"""
+Unit tests for BaseAgent (code/agents/base_agent.py) that run without a
+model: prompt rendering, and batching through a fake LLM.
+
+Usage:
+    pytest tests/test_base_agent.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+yaml = pytest.importorskip("yaml")
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.agents.base_agent import AgentConfig, BaseAgent, ModelConfig, PromptConfig
+
+
+class _EchoAgent(BaseAgent):
+    """Minimal agent: the output is the LLM response to the rendered prompt."""
+
+    AGENT_TYPE = "echo"
+
+    def _execute(self, inputs):
+        return {"response": self.invoke_llm(self._build_prompt(inputs))}
+
+    def _validate_input(self, inputs):
+        return None if inputs.get("text") else "text is required"
+
+    def _get_feedback_schema(self):
+        return {}
+
+
+class _FakeLLM:
+    """Answers "echo:<prompt>", recording every backend call."""
+
+    _llm_type = "fake"
+
+    def __init__(self):
+        self.generate_calls = []
+        self.invoke_calls = []
+
+    def generate(self, prompts, **kwargs):
+        self.generate_calls.append(list(prompts))
+        return SimpleNamespace(
+            generations=[[SimpleNamespace(text=f"echo:{p}")] for p in prompts]
+        )
+
+    def invoke(self, prompt, **kwargs):
+        self.invoke_calls.append(prompt)
+        return f"echo:{prompt}"
+
+
+def _agent(tmp_path, system, user, **config):
+    template = tmp_path / "echo.yaml"
+    template.write_text(yaml.safe_dump({"system": system, "user": user}))
+    return _EchoAgent(AgentConfig(
+        agent_id="echo_test",
+        agent_type="echo",
+        model=ModelConfig(name="llama-3.2-3b-instruct"),
+        prompt=PromptConfig(template_path=str(template)),
+        collect_rlhf=False,
+        **config,
+    ))
+
+
+def _loaded(agent):
+    """Give the agent a resident fake model with room for any prompt."""
+    agent._model = _FakeLLM()
+    agent._is_loaded = True
+    agent._n_ctx = 1 << 20
+    return agent._model
+
+
+def _baseline_render(system, user, inputs):
+    """render_prompt() as originally written: replace, then strip."""
+    for key, value in inputs.items():
+        user = user.replace(f"{{{key}}}", str(value))
+    if system:
+        return f"{system.strip()}\n\n{user.strip()}"
+    return user.strip()
+
+
+class TestRenderPrompt:
+    """The rendered user message is stripped, as it always was."""
+
+    @pytest.mark.parametrize("system", ["", "You are a parser.", "  You are a parser.\n"])
+    @pytest.mark.parametrize("user", [
+        "Summary: {text}",
+        "\n  Summary: {text}\n\n",
+        "{text}",
+        "  {text}  ",
+        "{text}\nNotes: {notes}\n",
+        "",
+    ])
+    @pytest.mark.parametrize("text", ["A 5 year-old boy", "  padded value \n", ""])
+    def test_matches_replace_then_strip(self, tmp_path, system, user, text):
+        agent = _agent(tmp_path, system, user)
+        inputs = {"text": text, "notes": " none "}
+        assert agent.render_prompt(inputs) == _baseline_render(system, user, inputs)
+
+    def test_unknown_variables_are_kept(self, tmp_path):
+        agent = _agent(tmp_path, "", "{text} {missing}")
+        assert agent.render_prompt({"text": "x"}) == "x {missing}"
+
+
+class TestRunBatch:
+    """run_batch() sends all prompts in one generate() call."""
+
+    def test_one_generate_call_in_input_order(self, tmp_path):
+        agent = _agent(tmp_path, "", "Summary: {text}")
+        llm = _loaded(agent)
+        results = agent.run_batch([{"text": "a"}, {"text": "b"}, {"text": "c"}])
+
+        assert llm.generate_calls == [["Summary: a", "Summary: b", "Summary: c"]]
+        assert llm.invoke_calls == []
+        assert [r.outputs["response"] for r in results] == [
+            "echo:Summary: a", "echo:Summary: b", "echo:Summary: c",
+        ]
+
+    def test_identical_prompts_generated_once(self, tmp_path):
+        agent = _agent(tmp_path, "", "Summary: {text}")
+        llm = _loaded(agent)
+        results = agent.run_batch([{"text": "a"}, {"text": "a"}])
+
+        assert llm.generate_calls == [["Summary: a"]]
+        assert [r.outputs["response"] for r in results] == ["echo:Summary: a"] * 2
+
+    def test_invalid_inputs_are_not_sent(self, tmp_path):
+        agent = _agent(tmp_path, "", "Summary: {text}")
+        llm = _loaded(agent)
+        results = agent.run_batch([{"text": ""}, {"text": "a"}])
+
+        assert llm.generate_calls == [["Summary: a"]]
+        assert results[0].error_message == "text is required"
+        assert results[1].outputs["response"] == "echo:Summary: a"
+
+    def test_batched_responses_are_dropped_afterwards(self, tmp_path):
+        agent = _agent(tmp_path, "", "Summary: {text}")
+        llm = _loaded(agent)
+        agent.run_batch([{"text": "a"}])
+        agent.run({"text": "a"})
+
+        assert agent._batched_responses == {}
+        assert llm.invoke_calls == ["Summary: a"]
+
+
+class TestArun:
+    """Concurrent arun() calls share run_batch() calls."""
+
+    @staticmethod
+    def _gather(agent, texts):
+        async def scenario():
+            return await asyncio.gather(*[agent.arun({"text": t}) for t in texts])
+
+        return asyncio.run(scenario())
+
+    def test_concurrent_calls_share_one_batch(self, tmp_path):
+        agent = _agent(tmp_path, "", "{text}", batch_window_ms=50)
+        llm = _loaded(agent)
+        results = self._gather(agent, ["a", "b", "c"])
+
+        assert llm.generate_calls == [["a", "b", "c"]]
+        assert [r.outputs["response"] for r in results] == ["echo:a", "echo:b", "echo:c"]
+
+    def test_batches_capped_at_max_batch_size(self, tmp_path):
+        agent = _agent(tmp_path, "", "{text}", batch_window_ms=50, max_batch_size=2)
+        llm = _loaded(agent)
+        results = self._gather(agent, ["a", "b", "c"])
+
+        assert llm.generate_calls == [["a", "b"], ["c"]]
+        assert [r.outputs["response"] for r in results] == ["echo:a", "echo:b", "echo:c"]
+
+    def test_failed_batch_fails_every_caller(self, tmp_path, monkeypatch):
+        agent = _agent(tmp_path, "", "{text}", batch_window_ms=50)
+        _loaded(agent)
+
+        def broken(inputs_list):
+            raise RuntimeError("backend crashed")
+
+        monkeypatch.setattr(agent, "run_batch", broken)
+        with pytest.raises(RuntimeError, match="backend crashed"):
+            self._gather(agent, ["a", "b"])
@@ -0,0 +1,103 @@
+"""
+Unit tests for tool-plan scheduling in the Executor Agent
+(ExecutorAgent._plan_dependencies, code/agents/executor_agent.py).
+
+Usage:
+    pytest tests/test_executor_plan.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.agents.executor_agent import ExecutorAgent
+
+
+plan_dependencies = ExecutorAgent._plan_dependencies
+
+
+def _entry(tool_name, priority="medium", **kwargs):
+    return {"tool_name": tool_name, "variants_to_query": [], "priority": priority, **kwargs}
+
+
+class TestPriorityWaves:
+    """Without depends_on, priorities run high -> medium -> low."""
+
+    def test_waves_follow_priority(self):
+        plan = [
+            _entry("spliceai", "low"),
+            _entry("clinvar", "high"),
+            _entry("gnomad", "medium"),
+            _entry("omim", "high"),
+        ]
+        waves, predecessors = plan_dependencies(plan)
+
+        assert waves == [[1, 3], [2], [0]]
+        assert predecessors == {1: [], 3: [], 2: [1, 3], 0: [2]}
+
+    def test_missing_priority_is_medium(self):
+        plan = [{"tool_name": "clinvar", "variants_to_query": []}, _entry("omim", "high")]
+        waves, _ = plan_dependencies(plan)
+        assert waves == [[1], [0]]
+
+    def test_empty_levels_are_skipped(self):
+        waves, predecessors = plan_dependencies([_entry("clinvar", "low")])
+        assert waves == [[0]]
+        assert predecessors == {0: []}
+
+    def test_unknown_priority_raises(self):
+        with pytest.raises(ValueError, match="unknown priority"):
+            plan_dependencies([_entry("clinvar", "urgent")])
+
+    def test_empty_plan(self):
+        assert plan_dependencies([]) == ([], {})
+
+
+class TestDependsOn:
+    """With depends_on, the plan is scheduled as a DAG."""
+
+    def test_dependencies_override_priority(self):
+        plan = [
+            _entry("omim", "high", depends_on=["clinvar"]),
+            _entry("clinvar", "low"),
+            _entry("gnomad", "low"),
+        ]
+        waves, predecessors = plan_dependencies(plan)
+
+        assert waves == [[1, 2], [0]]
+        assert predecessors == {0: [1], 1: [], 2: []}
+
+    def test_chain_and_fan_in(self):
+        plan = [
+            _entry("clinvar"),
+            _entry("gnomad", depends_on="clinvar"),
+            _entry("spliceai", depends_on=["clinvar"]),
+            _entry("omim", depends_on=["gnomad", "spliceai"]),
+        ]
+        waves, predecessors = plan_dependencies(plan)
+
+        assert waves == [[0], [1, 2], [3]]
+        assert predecessors[3] == [1, 2]
+
+    def test_depends_on_every_entry_of_a_tool(self):
+        plan = [_entry("clinvar"), _entry("clinvar"), _entry("omim", depends_on=["clinvar"])]
+        _, predecessors = plan_dependencies(plan)
+        assert predecessors[2] == [0, 1]
+
+    def test_unknown_dependency_raises(self):
+        with pytest.raises(ValueError, match="not in the plan"):
+            plan_dependencies([_entry("omim", depends_on=["clinvar"])])
+
+    def test_cycle_raises(self):
+        plan = [
+            _entry("clinvar", depends_on=["omim"]),
+            _entry("omim", depends_on=["clinvar"]),
+            _entry("gnomad"),
+        ]
+        with pytest.raises(ValueError, match="Cyclic depends_on between tools: clinvar, omim"):
+            plan_dependencies(plan)
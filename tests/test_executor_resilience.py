@@ -0,0 +1,471 @@
+"""
+Resilience tests for the Executor Agent (code/agents/executor_agent.py).
+
+Faults are injected into the shared HTTP session (ChaosRule /
+ChaosSession, or a scripted session), so the real ClinVar wrapper runs
+and no request leaves the machine. The tests check that transient
+failures reach the executor: they are retried, counted, and trip the
+circuit breaker.
+
+Usage:
+    pytest tests/test_executor_resilience.py -v
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.agents.executor_agent import (
+    AdmissionController,
+    ChaosRule,
+    CircuitBreaker,
+    ExecutorAgent,
+)
+from code.biotools.base_tool import Variant
+from code.biotools.clinvar import ClinVarTool
+
+
+VARIANT = "chr1:156137204:C>T"
+
+PLAN = [{"tool_name": "clinvar", "variants_to_query": [VARIANT], "priority": "high"}]
+
+VARIANTS_TABLE = [{
+    "variant": VARIANT,
+    "gene": "LMNA",
+    "chromosome": "chr1",
+    "position": 156137204,
+    "reference": "C",
+    "alternate": "T",
+}]
+
+
+@pytest.fixture(autouse=True)
+def real_clinvar(monkeypatch):
+    """Run the ClinVar wrapper against the (faulty) session, not its stub."""
+    monkeypatch.delenv("CLINVAR_USE_STUB", raising=False)
+
+
+class _FlakySession:
+    """
+    HTTP session that fails the first `failures` requests, then answers
+    ClinVar's esearch/esummary with one pathogenic record.
+    """
+
+    def __init__(self, failures, fault="http_5xx"):
+        self.failures = failures
+        self.fault = fault
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        if self.requests <= self.failures:
+            if self.fault == "timeout":
+                raise requests.Timeout(f"Scripted timeout: {url}")
+            return self._response(url, 503, {})
+        if "esearch" in url:
+            return self._response(url, 200, {"esearchresult": {"idlist": ["1"]}})
+        if "esummary" in url:
+            return self._response(url, 200, {"result": {"1": {
+                "accession": "VCV000000001",
+                "clinical_significance": {"description": "Pathogenic"},
+            }}})
+        return self._response(url, 404, {})
+
+    @staticmethod
+    def _response(url, status_code, payload):
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = url
+        response._content = json.dumps(payload).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def _flaky_executor(session, **kwargs):
+    executor = ExecutorAgent(retry_base_delay=0.001, cache_size=0, **kwargs)
+    for tool in executor._tools.values():
+        tool.client = session
+    return executor
+
+
+def _run(executor):
+    output = executor.run({"tool_usage_plan": PLAN, "variants_table": VARIANTS_TABLE})
+    return output["tool_results"][0], output["executor_output"]
+
+
+def _chaos_executor(fault, **kwargs):
+    kwargs.setdefault("max_retries", 2)
+    return ExecutorAgent(
+        chaos=ChaosRule(fault_rate=1.0, faults={fault: 1.0}),
+        retry_base_delay=0.001,
+        cache_size=0,
+        **kwargs,
+    )
+
+
+class TestInjectedFaults:
+    """With every request failing, ClinVar must fail, not return stub data."""
+
+    @pytest.mark.parametrize("fault", ["http_5xx", "http_429", "timeout"])
+    def test_fault_fails_tool_after_retries(self, fault):
+        executor = _chaos_executor(fault)
+        result, output = _run(executor)
+
+        assert result["status"] == "failed"
+        assert result["retry_count"] == 2
+        assert result["api_calls"] == 3
+        assert result["annotations"][0]["status"] != "success"
+        assert output["chaos_faults"][fault] >= 1
+
+    def test_429_marks_result_rate_limited(self):
+        result, _ = _run(_chaos_executor("http_429"))
+        assert result["rate_limited"] is True
+        assert "429" in result["error_message"]
+
+    def test_5xx_is_not_rate_limited(self):
+        result, _ = _run(_chaos_executor("http_5xx", max_retries=0))
+        assert result["rate_limited"] is False
+        assert result["annotations"][0]["status"] == "unavailable"
+
+
+class TestRetry:
+    """Transient failures are retried with backoff until they succeed."""
+
+    @pytest.mark.parametrize("fault", ["http_5xx", "timeout"])
+    def test_transient_failure_is_retried(self, fault):
+        session = _FlakySession(failures=1, fault=fault)
+        result, output = _run(_flaky_executor(session, max_retries=2))
+
+        assert result["status"] == "completed"
+        assert result["retry_count"] == 1
+        assert result["annotations"][0]["status"] == "success"
+        assert result["annotations"][0]["annotations"]["clinical_significance"] == "pathogenic"
+        assert output["circuit_breakers"]["clinvar"] == CircuitBreaker.CLOSED
+
+    def test_gives_up_after_max_retries(self):
+        session = _FlakySession(failures=10)
+        result, _ = _run(_flaky_executor(session, max_retries=1))
+
+        assert result["status"] == "failed"
+        assert result["retry_count"] == 1
+        assert session.requests == 2
+
+
+class _SlowSession(_FlakySession):
+    """Answers like _FlakySession, after blocking for `delay` seconds."""
+
+    def __init__(self, delay):
+        super().__init__(failures=0)
+        self.delay = delay
+
+    def request(self, method, url, **kwargs):
+        time.sleep(self.delay)
+        return super().request(method, url, **kwargs)
+
+
+class TestToolTimeout:
+    """run() returns at the tool timeout, not when the blocked query does."""
+
+    PLAN = [dict(PLAN[0], timeout_seconds=0.2)]
+
+    def _timed_run(self):
+        executor = _flaky_executor(_SlowSession(delay=2.0), max_retries=0)
+        t0 = time.perf_counter()
+        output = executor.run({"tool_usage_plan": self.PLAN, "variants_table": VARIANTS_TABLE})
+        return output["tool_results"][0], time.perf_counter() - t0
+
+    def test_run_is_bounded_by_timeout(self):
+        result, elapsed = self._timed_run()
+        assert result["status"] == "timeout"
+        assert elapsed < 1.0
+
+    def test_run_inside_event_loop_is_bounded_by_timeout(self):
+        async def scenario():
+            return self._timed_run()
+
+        result, elapsed = asyncio.run(scenario())
+        assert result["status"] == "timeout"
+        assert elapsed < 1.0
+
+
+def _run_tool(executor):
+    """Run the plan's one tool in a run of its own; returns (result, run)."""
+    run = executor._new_run()
+    variant_objs = executor._build_variant_objects(
+        executor._index_variants(VARIANTS_TABLE), [VARIANT]
+    )
+    result = asyncio.run(executor._aexecute_single_tool(PLAN[0], variant_objs, run))
+    return result, run
+
+
+class TestAdmissionBackoff:
+    """A 429 from a tool lowers the run's concurrency limit."""
+
+    def test_429_lowers_concurrency(self):
+        executor = _chaos_executor("http_429", max_retries=0, max_concurrent=3)
+        result, run = _run_tool(executor)
+
+        assert result.rate_limited is True
+        assert run.admission.limit == 2
+
+    def test_5xx_keeps_concurrency(self):
+        executor = _chaos_executor("http_5xx", max_retries=0, max_concurrent=3)
+        _, run = _run_tool(executor)
+        assert run.admission.limit == 3
+
+    def test_success_keeps_concurrency(self):
+        executor = _flaky_executor(_FlakySession(failures=0), max_concurrent=3)
+        result, run = _run_tool(executor)
+        assert result.rate_limited is False
+        assert run.admission.limit == 3
+
+    def test_backoff_stays_within_its_run(self):
+        executor = _chaos_executor("http_429", max_retries=0, max_concurrent=3)
+        _run_tool(executor)
+        assert executor._new_run().admission.limit == 3
+
+    def test_lowered_limit_holds_back_new_tools(self):
+        async def scenario():
+            admission = AdmissionController(2)
+            await admission.acquire()
+            await admission.acquire()
+            await admission.set_limit(1)
+            await admission.release()
+
+            # One tool still active at limit 1: the next one must wait
+            waiter = asyncio.create_task(admission.acquire())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            await admission.release()
+            await asyncio.wait_for(waiter, 1.0)
+
+        asyncio.run(scenario())
+
+
+class TestConcurrentRuns:
+    """Runs sharing one ExecutorAgent keep their own deadline."""
+
+    def test_deadline_does_not_leak_between_runs(self):
+        executor = _flaky_executor(_FlakySession(failures=0))
+
+        async def scenario():
+            return await asyncio.gather(
+                executor.arun({"tool_usage_plan": PLAN, "variants_table": VARIANTS_TABLE}),
+                executor.arun({
+                    "tool_usage_plan": PLAN,
+                    "variants_table": VARIANTS_TABLE,
+                    "deadline_seconds": 0,
+                }),
+            )
+
+        unbounded, expired = asyncio.run(scenario())
+        assert unbounded["tool_results"][0]["status"] == "completed"
+        assert expired["tool_results"][0]["status"] == "timeout"
+
+
+class _CountingLimiter:
+    """Admits everything, counting acquisitions."""
+
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self):
+        self.acquired += 1
+
+
+class TestRateLimiters:
+    """Executor limiters are charged per HTTP request, not per query."""
+
+    @staticmethod
+    def _query(tool, limiter, variants):
+        return asyncio.run(tool.aquery_batch(variants, limiters=(limiter,)))
+
+    def test_every_request_acquires_a_token(self):
+        session = _FlakySession(failures=0)
+        tool, limiter = ClinVarTool(client=session), _CountingLimiter()
+        results = self._query(tool, limiter, [Variant.from_dict(VARIANTS_TABLE[0])])
+
+        assert results[0].status.value == "success"
+        assert session.requests >= 2  # esearch + esummary
+        assert limiter.acquired == session.requests
+
+    def test_cache_hit_acquires_nothing(self):
+        session = _FlakySession(failures=0)
+        tool, limiter = ClinVarTool(client=session), _CountingLimiter()
+        variant = Variant.from_dict(VARIANTS_TABLE[0])
+        self._query(tool, limiter, [variant])
+        acquired = limiter.acquired
+
+        results = self._query(tool, limiter, [variant])
+        assert results[0].cache_hit
+        assert limiter.acquired == acquired
+
+    def test_limiters_replace_local_rate_check(self):
+        session = _FlakySession(failures=0)
+        tool = ClinVarTool(client=session)
+        tool.rate_limit_per_minute = 0  # the local check alone would refuse
+        results = self._query(tool, _CountingLimiter(), [Variant.from_dict(VARIANTS_TABLE[0])])
+        assert results[0].status.value == "success"
+        assert session.requests >= 2
+
+
+class TestCircuitBreaker:
+    """State machine: CLOSED -> OPEN -> HALF_OPEN -> CLOSED / OPEN."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=60.0)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_single_probe_while_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_released_probe_allows_next_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=60.0)
+        breaker.record_failure()
+        breaker._opened_at -= 60.0
+        assert breaker.allow_request()
+
+        breaker.release_probe()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request()
+
+    def test_lost_probe_expires(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        time.sleep(0.06)
+        # The first probe never reported back
+        assert breaker.allow_request()
+
+
+class TestHalfOpenProbe:
+    """Every way a probe can end leaves the circuit usable."""
+
+    @staticmethod
+    def _tripped_executor():
+        executor = ExecutorAgent(
+            breaker_failure_threshold=1, breaker_recovery_seconds=60.0, cache_size=0
+        )
+        breaker = executor._breakers["clinvar"]
+        breaker.record_failure()
+        breaker._opened_at -= 60.0  # recovery time has passed
+        return executor, breaker
+
+    def test_probe_with_bad_input_releases_breaker(self, monkeypatch):
+        executor, breaker = self._tripped_executor()
+
+        async def bad_input(*args):
+            raise ValueError("malformed variant")
+
+        monkeypatch.setattr(executor, "_aquery_with_retry", bad_input)
+        result, _ = _run(executor)
+        assert result["status"] == "failed"
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # The next call probes again instead of being skipped forever
+        monkeypatch.undo()
+        executor._tools["clinvar"].client = _FlakySession(failures=0)
+        result, output = _run(executor)
+        assert result["status"] == "completed"
+        assert output["circuit_breakers"]["clinvar"] == CircuitBreaker.CLOSED
+
+    def test_probe_past_deadline_releases_breaker(self):
+        executor, breaker = self._tripped_executor()
+        output = executor.run({
+            "tool_usage_plan": PLAN,
+            "variants_table": VARIANTS_TABLE,
+            "deadline_seconds": 0,
+        })
+        assert output["tool_results"][0]["status"] == "timeout"
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request()
+
+    def test_cancelled_probe_releases_breaker(self, monkeypatch):
+        executor, breaker = self._tripped_executor()
+
+        async def hang(*args):
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(executor, "_aquery_with_retry", hang)
+
+        async def scenario():
+            task = asyncio.create_task(
+                executor._aexecute_tools(PLAN, VARIANTS_TABLE)
+            )
+            await asyncio.sleep(0.05)
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request()
+
+
+class TestCircuitBreakerUnderFaults:
+
+    def test_breaker_opens_after_threshold(self):
+        executor = _chaos_executor(
+            "http_5xx", max_retries=0, breaker_failure_threshold=2
+        )
+        states = []
+        for _ in range(2):
+            result, output = _run(executor)
+            assert result["status"] == "failed"
+            states.append(output["circuit_breakers"]["clinvar"])
+        assert states == [CircuitBreaker.CLOSED, CircuitBreaker.OPEN]
+
+        result, _ = _run(executor)
+        assert result["status"] == "skipped"
+        assert result["api_calls"] == 0
+
+    def test_failed_probe_reopens_breaker(self):
+        executor = _chaos_executor(
+            "http_5xx",
+            max_retries=0,
+            breaker_failure_threshold=1,
+            breaker_recovery_seconds=0.0,
+        )
+        _run(executor)
+        assert executor._breakers["clinvar"].state == CircuitBreaker.OPEN
+
+        # Recovery time elapsed: the probe runs, fails, and re-opens
+        result, output = _run(executor)
+        assert result["status"] == "failed"
+        assert output["circuit_breakers"]["clinvar"] == CircuitBreaker.OPEN
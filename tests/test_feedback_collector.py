@@ -0,0 +1,336 @@
+"""
+Unit tests for the RLHF feedback collector (code/arena/feedback_collector.py).
+
+Statistics come from the columnar FeedbackStore; they must always match
+the items as they are when the statistics are requested.
+
+Usage:
+    pytest tests/test_feedback_collector.py -v
+"""
+
+import json
+import pickle
+import random
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.arena.feedback_collector import (
+    FeedbackCollector,
+    FeedbackItem,
+    FeedbackSource,
+    FeedbackStore,
+    FeedbackType,
+)
+
+
+@pytest.fixture
+def collector(tmp_path):
+    collector = FeedbackCollector(run_dir=tmp_path, patient_id="P1", reviewer_id="dr_a")
+    collector.add_diagnosis_correction("Emery-Dreifuss muscular dystrophy", True, 0.8, 0.9)
+    collector.add_diagnosis_correction("Limb-girdle muscular dystrophy", True, 0.5, 0.5)
+    collector.add_feedback(FeedbackItem(
+        feedback_id="rpt_000",
+        feedback_type=FeedbackType.REPORT_SECTION,
+        source=FeedbackSource.SYNTHESIS,
+        timestamp="2025-11-01T00:00:00",
+        corrections={"summary": "Add cardiology referral"},
+    ))
+    return collector
+
+
+def _random_items(n, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        original = rng.choice([0.0, 0.25, 0.5, 0.9])
+        preference = rng.random() < 0.3
+        items.append(FeedbackItem(
+            feedback_id=f"fb_{i:04d}",
+            feedback_type=rng.choice(list(FeedbackType)),
+            source=rng.choice(list(FeedbackSource)),
+            timestamp="2025-11-01T00:00:00",
+            reviewer_id=rng.choice([None, "", "dr_a", "dr_b", "dr_c"]),
+            is_correct=rng.random() < 0.6,
+            confidence_original=original,
+            confidence_adjusted=rng.choice([original, original + 0.1, original - 0.2]),
+            corrections=rng.choice([{}, {"disease": "LGMD2A"}]),
+            notes=rng.choice(["", "Reviewed with cardiology"]),
+            chosen_response="chosen" if preference else None,
+            rejected_response=rng.choice(["rejected", None]) if preference else None,
+        ))
+    return items
+
+
+def _loop_statistics(items):
+    """get_statistics() as originally written, one loop per counter."""
+    by_source = {}
+    for source in FeedbackSource:
+        matching = [i for i in items if i.source == source]
+        if matching:
+            by_source[source.value] = {
+                "count": len(matching),
+                "correct": sum(1 for i in matching if i.is_correct),
+                "with_corrections": sum(1 for i in matching if i.corrections),
+            }
+    by_type = {}
+    for ftype in FeedbackType:
+        matching = [i for i in items if i.feedback_type == ftype]
+        if matching:
+            by_type[ftype.value] = len(matching)
+    deltas = [
+        i.confidence_adjusted - i.confidence_original
+        for i in items
+        if i.confidence_adjusted != i.confidence_original
+    ]
+    return {
+        "total_items": len(items),
+        "total_correct": sum(1 for i in items if i.is_correct),
+        "total_incorrect": sum(1 for i in items if not i.is_correct),
+        "items_with_corrections": sum(1 for i in items if i.corrections),
+        "items_with_notes": sum(1 for i in items if i.notes),
+        "accuracy_rate": sum(1 for i in items if i.is_correct) / len(items),
+        "by_source": by_source,
+        "by_type": by_type,
+        "confidence_adjustments": {
+            "count": len(deltas),
+            "mean_delta": pytest.approx(sum(deltas) / len(deltas) if deltas else 0),
+            "positive_adjustments": sum(1 for d in deltas if d > 0),
+            "negative_adjustments": sum(1 for d in deltas if d < 0),
+        },
+        "unique_reviewers": len(set(i.reviewer_id for i in items if i.reviewer_id)),
+    }
+
+
+def _loop_quality_score(items):
+    """_calculate_quality_score() as originally written."""
+    score = 0.0
+    for item in items:
+        if item.corrections:
+            score += 0.3
+        if item.confidence_adjusted != item.confidence_original:
+            score += 0.3
+        if item.reviewer_id:
+            score += 0.2
+        if item.is_correct:
+            score += 0.2
+    return score / len(items) if items else 0.0
+
+
+class TestStatsParity:
+    """The columnar statistics equal the original per-item loops."""
+
+    @pytest.fixture(params=[1, 17, 500])
+    def items(self, request):
+        return _random_items(request.param, seed=request.param)
+
+    @pytest.fixture
+    def filled(self, tmp_path, items):
+        collector = FeedbackCollector(run_dir=tmp_path, patient_id="P1")
+        collector.feedback_items = items
+        return collector
+
+    def test_get_statistics(self, filled, items):
+        assert filled.get_statistics() == _loop_statistics(items)
+
+    def test_quality_score(self, filled, items):
+        assert filled._calculate_quality_score() == pytest.approx(_loop_quality_score(items))
+
+    def test_gradient_summary(self, filled, items):
+        summary = filled._build_gradient_summary()
+        assert summary["num_preference_pairs"] == sum(
+            1 for i in items if i.chosen_response and i.rejected_response
+        )
+        assert summary["num_corrections"] == sum(1 for i in items if i.corrections)
+        assert summary["num_confidence_adjustments"] == sum(
+            1 for i in items if i.confidence_adjusted != i.confidence_original
+        )
+
+    def test_aggregate(self, filled, items):
+        aggregated = filled.aggregate()
+        buckets = {
+            FeedbackSource.INGESTION: aggregated.ingestion_feedback,
+            FeedbackSource.STRUCTURING: aggregated.structuring_feedback,
+            FeedbackSource.EXECUTOR: aggregated.executor_feedback,
+            FeedbackSource.SYNTHESIS: aggregated.synthesis_feedback,
+        }
+        for source, bucket in buckets.items():
+            assert bucket == [i for i in items if i.source == source]
+        assert aggregated.total_items == len(items)
+        assert aggregated.correct_items == sum(1 for i in items if i.is_correct)
+        assert aggregated.items_with_corrections == sum(1 for i in items if i.corrections)
+        assert set(aggregated.reviewers) == {i.reviewer_id for i in items if i.reviewer_id}
+
+    def test_items_added_between_calls(self, filled, items):
+        items = list(items)
+        filled.get_statistics()
+        extra = _random_items(40, seed=99)
+        for item in extra:
+            filled.add_feedback(item)
+        assert filled.get_statistics() == _loop_statistics(items + extra)
+
+    def test_empty(self, tmp_path):
+        collector = FeedbackCollector(run_dir=tmp_path, patient_id="P1")
+        assert collector.get_statistics() == {
+            "total_items": 0,
+            "message": "No feedback collected yet",
+        }
+        assert collector._calculate_quality_score() == 0.0
+
+
+class TestStatsFollowItems:
+    """Editing an item after statistics were computed updates them."""
+
+    def test_edited_item_updates_statistics(self, collector):
+        assert collector.get_statistics()["total_correct"] == 3
+
+        collector.feedback_items[1].is_correct = False
+        stats = collector.get_statistics()
+        assert stats["total_correct"] == 2
+        assert stats["by_source"]["02_structuring"]["correct"] == 1
+
+    def test_edited_item_updates_aggregate(self, collector):
+        collector.aggregate()
+        collector.feedback_items[1].corrections = {"disease": "LGMD2A"}
+        collector.feedback_items[0].reviewer_id = "dr_b"
+
+        aggregated = collector.aggregate()
+        assert aggregated.items_with_corrections == 2
+        assert aggregated.reviewers == ["dr_b", "dr_a"]
+
+    def test_edited_item_updates_bundle(self, collector, tmp_path):
+        collector.export_arena_bundle(tmp_path / "before.zip")
+        collector.feedback_items[2].is_correct = False
+        path = collector.export_arena_bundle(tmp_path / "after.zip")
+
+        with zipfile.ZipFile(path) as zf:
+            feedback = json.loads(zf.read("feedback/aggregated_feedback.json"))
+        assert feedback["summary"]["correct_items"] == 2
+
+    def test_removed_item_updates_statistics(self, collector):
+        collector.get_statistics()
+        del collector.feedback_items[0]
+        stats = collector.get_statistics()
+        assert stats["total_items"] == 2
+        assert stats["confidence_adjustments"]["count"] == 0
+
+
+class TestEnumFields:
+    """source / feedback_type can be reassigned after construction."""
+
+    def test_reassigned_enums_are_serialized(self, collector):
+        item = collector.feedback_items[0]
+        item.source = FeedbackSource.EXECUTOR
+        item.feedback_type = FeedbackType.TOOL_RESULT
+
+        data = item.to_dict()
+        assert (data["source"], data["feedback_type"]) == ("03_executor", "tool_result")
+        assert FeedbackItem.from_dict(data) == item
+
+    def test_reassigned_source_moves_item(self, collector):
+        collector.feedback_items[0].source = FeedbackSource.EXECUTOR
+
+        aggregated = collector.aggregate()
+        assert [i.feedback_id for i in aggregated.executor_feedback] == ["dx_000"]
+        assert collector.get_statistics()["by_source"]["03_executor"]["count"] == 1
+
+    def test_reassigned_type_in_training_export(self, collector, tmp_path):
+        collector.feedback_items[2].feedback_type = FeedbackType.OVERALL_QUALITY
+        path = collector.export_for_training(tmp_path / "train.jsonl")
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert records[2]["type"] == "overall_quality"
+
+
+class TestStoreIndexing:
+    """add() writes one row; sync() re-reads only after changes."""
+
+    @pytest.fixture
+    def store(self):
+        return FeedbackStore(_random_items(50))
+
+    @pytest.fixture
+    def reads(self, store, monkeypatch):
+        """Rows written by _write() / _fill(), in call order."""
+        reads = []
+        write, fill = store._write, store._fill
+
+        def spy_write(row, item):
+            reads.append(row)
+            write(row, item)
+
+        def spy_fill(start, stop):
+            reads.extend(range(start, stop))
+            fill(start, stop)
+
+        monkeypatch.setattr(store, "_write", spy_write)
+        monkeypatch.setattr(store, "_fill", spy_fill)
+        return reads
+
+    def test_add_writes_its_row(self, store, reads):
+        store.sync()
+        for item in _random_items(3, seed=1):
+            store.add(item)
+        assert reads == [50, 51, 52]
+        assert store.sync() == 53
+        assert reads == [50, 51, 52]
+        assert store.is_correct.tolist() == [i.is_correct for i in store.items]
+
+    def test_unchanged_sync_reads_nothing(self, store, reads):
+        store.sync()
+        store.sync()
+        assert reads == []
+
+    def test_edit_rereads_rows(self, store, reads):
+        store.sync()
+        store.items[7].confidence_adjusted = 0.75
+        store.sync()
+        assert reads == list(range(50))
+        assert store.confidence_adjusted[7] == 0.75
+
+    def test_unindexed_item_edit_does_not_reread(self, store, reads):
+        store.sync()
+        FeedbackItem(
+            feedback_id="loose",
+            feedback_type=FeedbackType.OVERALL_QUALITY,
+            source=FeedbackSource.SYNTHESIS,
+            timestamp="2025-11-01T00:00:00",
+        ).is_correct = False
+        store.sync()
+        assert reads == []
+
+    @pytest.mark.parametrize("mutate", [
+        lambda items: items.insert(0, items.pop()),
+        lambda items: items.reverse(),
+        lambda items: items.remove(items[3]),
+        lambda items: items.__setitem__(slice(0, 2), items[5:7]),
+    ])
+    def test_list_mutation_rereads_rows(self, store, reads, mutate):
+        store.sync()
+        mutate(store.items)
+        n = store.sync()
+        assert reads == list(range(n))
+        assert store.source_code.tolist() == [i.source_code for i in store.items]
+
+    def test_by_source_keeps_item_order(self, store):
+        store.sync()
+        buckets = store.by_source()
+        assert len(buckets) == len(FeedbackStore.SOURCES)
+        for source, bucket in zip(FeedbackStore.SOURCES, buckets):
+            assert bucket == [i for i in store.items if i.source == source]
+
+    def test_unpickled_item_edits_are_seen(self, store):
+        store.sync()
+        copy = FeedbackStore(pickle.loads(pickle.dumps(list(store.items))))
+        copy.sync()
+        copy.items[0].is_correct = not copy.items[0].is_correct
+        copy.sync()
+        assert copy.is_correct.tolist() == [i.is_correct for i in copy.items]
@@ -0,0 +1,53 @@
+"""
+Unit tests for the Ingestion Agent (code/agents/ingestion_agent.py) that
+run without a model.
+
+Usage:
+    pytest tests/test_ingestion_agent.py -v
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.agents.ingestion_agent import _strip_code_and_json
+
+
+def _greedy_strip(text):
+    """The HPI fallback's original cleanup."""
+    text = re.sub(r'\{[\s\S]*\}', '', text)
+    return re.sub(r'```[\s\S]*```', '', text)
+
+
+class TestStripCodeAndJson:
+    """Fallback cleanup of an unparseable LLM response."""
+
+    @pytest.mark.parametrize("text", [
+        "Plain clinical prose.",
+        "unterminated {abc",
+        "Before {\"age\": 5} after",
+        "A 5 year-old {\"sex\": \"M\", \"nested\": {\"x\": 1}} with weakness",
+        "Truncated {\"history\": \"Progressive weakness {since age 3} and",
+        "Notes ```json\n{\"a\": 1}\n``` end",
+        "Unpaired ```fence and prose",
+        "",
+    ])
+    def test_matches_greedy_cleanup_for_single_blocks(self, text):
+        assert _strip_code_and_json(text) == _greedy_strip(text)
+
+    def test_keeps_prose_between_blocks(self):
+        text = "Findings {\"a\": 1} and also {\"b\": 2} noted."
+        assert _strip_code_and_json(text) == "Findings  and also  noted."
+
+    def test_segments_are_not_padded(self):
+        assert _strip_code_and_json("a{b}c```d```e") == "ace"
+
+    def test_linear_on_many_open_braces(self):
+        text = "{" * 200_000
+        assert _strip_code_and_json(text) == text
@@ -0,0 +1,109 @@
+"""
+Unit tests for incremental field scanning in the JSON extractor
+(JSONFieldStream, code/llm/json_extractor.py).
+
+Usage:
+    pytest tests/test_json_extractor.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.llm.json_extractor import JSONFieldStream
+
+
+RESPONSE = {
+    "chief_complaint": "Weakness, {worse} after \"exercise\"\\n",
+    "age": 12,
+    "demographics": {"sex": "M", "notes": ["a", "b]"]},
+    "variants": [{"gene": "LMNA", "hgvs": "c.1357C>T"}, {"gene": "DMD"}],
+    "phenotypes": [],
+    "consanguinity": None,
+}
+
+
+def _scan(chunks, item_keys=("variants", "phenotypes")):
+    fields, items = [], []
+    stream = JSONFieldStream(
+        on_field=lambda k, v: fields.append((k, v)),
+        on_item=lambda k, v: items.append((k, v)),
+        item_keys=item_keys,
+    )
+    for chunk in chunks:
+        stream.feed(chunk)
+    return fields, items
+
+
+class TestFields:
+    """Every top-level field is reported once, in order, when it closes."""
+
+    def test_whole_response(self):
+        fields, _ = _scan([json.dumps(RESPONSE)])
+        assert fields == list(RESPONSE.items())
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_any_chunking(self, indent):
+        text = json.dumps(RESPONSE, indent=indent)
+        for split in range(len(text) + 1):
+            fields, _ = _scan([text[:split], text[split:]])
+            assert fields == list(RESPONSE.items()), split
+
+    def test_one_character_at_a_time(self):
+        fields, _ = _scan(list(json.dumps(RESPONSE)))
+        assert fields == list(RESPONSE.items())
+
+    def test_field_reported_before_object_closes(self):
+        fields, _ = _scan(['{"chief_complaint": "Weakness", "age": 1'])
+        assert fields == [("chief_complaint", "Weakness")]
+
+    def test_leading_and_trailing_text_ignored(self):
+        text = 'Here is the JSON: {"a": 1} and {"b": 2}'
+        fields, _ = _scan([text])
+        assert fields == [("a", 1)]
+
+    def test_feed_after_close_is_ignored(self):
+        fields, _ = _scan(['{"a": 1}', ', "b": 2}'])
+        assert fields == [("a", 1)]
+
+    def test_unparseable_value_is_skipped(self):
+        fields, _ = _scan(['{"a": tru, "b": [1,], "c": 3}'])
+        assert fields == [("c", 3)]
+
+    def test_without_callbacks(self):
+        stream = JSONFieldStream()
+        stream.feed(json.dumps(RESPONSE))
+
+
+class TestItems:
+    """Elements of arrays named in item_keys are reported as they close."""
+
+    def test_items_in_order(self):
+        _, items = _scan(list(json.dumps(RESPONSE)))
+        assert items == [("variants", v) for v in RESPONSE["variants"]]
+
+    def test_item_reported_before_array_closes(self):
+        _, items = _scan(['{"variants": [{"gene": "LMNA"}, {"gene": "D'])
+        assert items == [("variants", {"gene": "LMNA"})]
+
+    def test_only_named_arrays(self):
+        _, items = _scan([json.dumps(RESPONSE)], item_keys=("phenotypes",))
+        assert items == []
+
+    def test_nested_array_is_not_itemized(self):
+        _, items = _scan(['{"x": {"variants": [1, 2]}}'])
+        assert items == []
+
+    def test_no_items_without_on_item(self):
+        fields = []
+        stream = JSONFieldStream(on_field=lambda k, v: fields.append((k, v)), item_keys=("variants",))
+        stream.feed(json.dumps(RESPONSE))
+        assert fields == list(RESPONSE.items())
@@ -0,0 +1,136 @@
+"""
+Tests for model sharing in the LLM factory (code/llm/llm_factory.py).
+
+Agents share one resident model through get_or_create()/release(). A
+caller reusing it must not change the sampling settings of the other
+holders, and the model must not be swapped out from under a holder that
+cannot be told about it. Models are faked, so no weights are loaded.
+
+Usage:
+    pytest tests/test_llm_factory.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.llm import llm_factory, mlx_llm
+from code.llm.llm_factory import LLMFactory
+
+
+SMALL = "llama-3.2-3b-instruct"
+LARGE = "qwen-2.5-14b-instruct"
+
+
+class _FakeLLM:
+    """Stands in for MLXLLM: records its load-time settings."""
+
+    _llm_type = "mlx"
+
+    def __init__(self, **params):
+        self.params = params
+
+
+@pytest.fixture
+def factory(monkeypatch, tmp_path):
+    """Factory whose models "load" instantly through the MLX path."""
+    monkeypatch.setattr(llm_factory, "is_mlx_available", lambda: True)
+    monkeypatch.setitem(mlx_llm.MLX_MODEL_REPOS, LARGE, "mlx-community/Qwen2.5-14B-Instruct-4bit")
+    monkeypatch.setattr(mlx_llm, "MLXLLM", _FakeLLM)
+    factory = LLMFactory(models_dir=tmp_path)
+    monkeypatch.setattr(llm_factory, "_SHARED_FACTORY", factory)
+    return factory
+
+
+class TestCacheHit:
+
+    def test_reuse_keeps_load_time_sampling(self, factory):
+        first = factory.get_or_create(model_name=SMALL, backend="mlx", temperature=0.1, max_tokens=512)
+        second = factory.get_or_create(model_name=SMALL, backend="mlx", temperature=0.7, max_tokens=4096)
+
+        assert second is first
+        assert first.params["temperature"] == 0.1
+        assert first.params["max_tokens"] == 512
+
+
+class TestHeldModel:
+
+    def test_unregistered_holder_blocks_swap(self, factory):
+        factory.get_or_create(model_name=SMALL, backend="mlx")
+        with pytest.raises(RuntimeError, match="still held"):
+            factory.create(model_name=LARGE, backend="mlx")
+        assert factory.current_model_name == SMALL
+
+    def test_released_model_is_swapped(self, factory):
+        factory.get_or_create(model_name=SMALL, backend="mlx")
+        factory.release(SMALL)
+        factory.create(model_name=LARGE, backend="mlx")
+        assert factory.current_model_name == LARGE
+
+    def test_holders_are_evicted(self, factory):
+        evicted = []
+        factory.get_or_create(model_name=SMALL, backend="mlx", on_evict=lambda: evicted.append(SMALL))
+        factory.create(model_name=LARGE, backend="mlx")
+
+        assert evicted == [SMALL]
+        assert factory.current_model_name == LARGE
+        assert factory._refcounts.get(SMALL, 0) == 0
+
+    def test_released_holder_is_not_called(self, factory):
+        evicted = []
+        on_evict = lambda: evicted.append(SMALL)  # noqa: E731
+        factory.get_or_create(model_name=SMALL, backend="mlx", on_evict=on_evict)
+        factory.release(SMALL, on_evict=on_evict)
+        factory.create(model_name=LARGE, backend="mlx")
+        assert evicted == []
+
+
+class TestAgents:
+    """Agents pass their own sampling settings and drop evicted models."""
+
+    @staticmethod
+    def _agents():
+        from code.agents import IngestionAgent, StructuringAgent
+
+        first, second = IngestionAgent(), StructuringAgent()
+        for agent, name in ((first, SMALL), (second, LARGE)):
+            agent.config.model.name = name
+            agent.config.model.backend = "mlx"
+            agent.config.model.draft_model = None
+        first.config.model.temperature = 0.1
+        second.config.model.temperature = 0.7
+        return first, second
+
+    def test_sampling_passed_per_call(self, factory):
+        first, second = self._agents()
+        second.config.model.name = SMALL
+        second.config.model.quantization = first.config.model.quantization
+        first.load_model(4096)
+        second.load_model(4096)
+
+        assert first._model is second._model
+        assert first._llm_kwargs()["temperature"] == 0.1
+        assert second._llm_kwargs()["temperature"] == 0.7
+        assert second._llm_kwargs()["max_tokens"] == second.config.model.max_tokens
+
+    def test_loading_another_model_evicts_holder(self, factory):
+        first, second = self._agents()
+        first.load_model()
+        second.load_model()
+
+        assert not first._is_loaded
+        assert first._model is None
+        assert factory.current_model_name == LARGE
+
+        # The evicted agent reacquires on its next load
+        second.unload_model()
+        first.load_model()
+        assert first._is_loaded
+        assert factory.current_model_name == SMALL
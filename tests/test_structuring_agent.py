@@ -0,0 +1,145 @@
+"""
+Unit tests for the Structuring Agent (code/agents/structuring_agent.py)
+that run without a model.
+
+Usage:
+    pytest tests/test_structuring_agent.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.agents.structuring_agent import (
+    DiagnosisEntry,
+    PathogenicityClass,
+    StructuringAgent,
+    StructuringOutput,
+    ToolPriority,
+    ToolUsageEntry,
+    VariantEntry,
+    _decode_structuring,
+)
+
+
+PATIENT_CONTEXT = {
+    "patient_id": "P1",
+    "demographics": {"age": 12, "sex": "M", "ethnicity": None},
+    "clinical_presentation": {
+        "chief_complaint": "Progressive weakness",
+        "history_present_illness": "Elevated CK, early contractures and cardiomyopathy.",
+        "past_medical_history": "",
+        "family_history": "Father with arrhythmia",
+    },
+    "physical_exam": "Elbow contractures",
+    "variants": [{
+        "gene": "LMNA", "chromosome": "chr1", "position": 156137204,
+        "reference": "C", "alternate": "T", "zygosity": "heterozygous",
+    }],
+}
+
+
+@pytest.fixture
+def output():
+    return StructuringOutput(
+        diagnostic_table=[
+            DiagnosisEntry(
+                diagnosis="Emery-Dreifuss muscular dystrophy 2",
+                omim_id="181350",
+                confidence=0.82,
+                inheritance="AD",
+                supporting_evidence=["Elbow contractures", "Cardiomyopathy"],
+                rank=1,
+            ),
+            DiagnosisEntry(diagnosis="Limb-girdle muscular dystrophy 1B", confidence=0.4, rank=2),
+        ],
+        variants_table=[VariantEntry(
+            gene="LMNA",
+            variant="NM_170707.4:c.1357C>T",
+            protein_change="p.Arg453Trp",
+            zygosity="heterozygous",
+            pathogenicity_class=PathogenicityClass.LIKELY_PATHOGENIC,
+            priority=1,
+            rationale="Known EDMD2 hotspot",
+            associated_diagnoses=["Emery-Dreifuss muscular dystrophy 2"],
+        )],
+        tool_usage_plan=[ToolUsageEntry(
+            tool_name="clinvar",
+            priority=ToolPriority.HIGH,
+            variants_to_query=["NM_170707.4:c.1357C>T"],
+            expected_evidence="Pathogenic assertions",
+        )],
+        phenotype_analysis="Contractures with cardiac involvement",
+        variant_interpretation="Missense in the rod domain",
+        tool_selection_rationale="ClinVar first",
+    )
+
+
+@pytest.fixture
+def agent():
+    agent = StructuringAgent()
+    agent.config.model.backend = "llama.cpp"
+    return agent
+
+
+class TestContextLength:
+    """The loaded window holds the prompt plus the full output limit."""
+
+    @pytest.mark.parametrize("max_tokens", [1024, 4096, 8192])
+    def test_window_fits_prompt_and_max_tokens(self, agent, max_tokens):
+        agent.config.model.max_tokens = max_tokens
+        inputs = {"patient_context": PATIENT_CONTEXT}
+
+        prompt_tokens = len(agent._build_prompt(dict(inputs))) // 3
+        n_ctx = agent._context_length(dict(inputs))
+
+        assert n_ctx >= prompt_tokens + max_tokens
+        assert n_ctx & (n_ctx - 1) == 0
+
+    def test_window_capped_at_context_length(self, agent):
+        agent.config.model.max_tokens = 1 << 20
+        n_ctx = agent._context_length({"patient_context": PATIENT_CONTEXT})
+        assert n_ctx == agent.config.model.context_length
+
+    def test_run_renders_prompt_once(self, agent, monkeypatch):
+        rendered = []
+        build_prompt = agent._build_prompt
+
+        def spy(inputs):
+            rendered.append(build_prompt(inputs))
+            return rendered[-1]
+
+        monkeypatch.setattr(agent, "_build_prompt", spy)
+        monkeypatch.setattr(agent, "load_model", lambda n_ctx=None: None)
+
+        result = agent.run({"patient_context": PATIENT_CONTEXT})
+        assert result.error_message is None
+        assert len(rendered) == 1
+        assert result.tokens_input == agent.count_prompt_tokens(rendered[0])
+
+
+class TestDecodeStructuring:
+    """msgspec decoding of schema-conformant output."""
+
+    @pytest.fixture(autouse=True)
+    def _msgspec(self):
+        pytest.importorskip("msgspec")
+
+    def test_round_trip(self, output):
+        assert _decode_structuring(output.to_json_bytes()) == output
+
+    def test_round_trip_from_str(self, output):
+        assert _decode_structuring(output.to_json_bytes().decode()) == output
+
+    def test_empty_differential_is_rejected(self, output):
+        output.diagnostic_table = []
+        assert _decode_structuring(output.to_json_bytes()) is None
+
+    def test_non_conformant_json_is_rejected(self, output):
+        data = output.to_json_bytes().replace(b'"likely_pathogenic"', b'"probably bad"')
+        assert _decode_structuring(data) is None
@@ -0,0 +1,121 @@
+"""
+Unit tests for StructuringCache (code/agents/structuring_agent.py).
+
+The cache must only reuse a differential for a context that would
+produce the same one: any variant field, the family history or the
+clinical text (including negations) changing is a miss.
+
+Usage:
+    pytest tests/test_structuring_cache.py -v
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from code.agents.structuring_agent import StructuringCache
+
+
+OUTPUT = {"diagnostic_table": [{"disease_name": "Emery-Dreifuss muscular dystrophy 2 (AD)"}]}
+
+
+@pytest.fixture
+def context():
+    return {
+        "patient_id": "P1",
+        "demographics": {"age": 12, "sex": "M", "ethnicity": None},
+        "clinical_presentation": {
+            "chief_complaint": "Progressive weakness",
+            "history_present_illness": "Elevated CK, early contractures and cardiomyopathy.",
+            "past_medical_history": "",
+            "family_history": "Father with arrhythmia",
+        },
+        "physical_exam": "Elbow contractures",
+        "variants": [{
+            "gene": "LMNA", "chromosome": "chr1", "position": 156137204,
+            "reference": "C", "alternate": "T", "zygosity": "heterozygous",
+        }],
+    }
+
+
+@pytest.fixture
+def cache(context):
+    cache = StructuringCache()
+    cache.set(context, [], OUTPUT)
+    return cache
+
+
+class TestExactKey:
+    """Only an identical context hits by default."""
+
+    def test_identical_context_hits(self, cache, context):
+        assert cache.get(copy.deepcopy(context), []) == OUTPUT
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_whitespace_and_case_are_normalized(self, cache, context):
+        edited = copy.deepcopy(context)
+        edited["physical_exam"] = "  elbow   CONTRACTURES "
+        assert cache.lookup(edited, []) == OUTPUT
+
+    def test_zygosity_is_part_of_key(self, cache, context):
+        edited = copy.deepcopy(context)
+        edited["variants"][0]["zygosity"] = "homozygous"
+        assert cache.lookup(edited, []) is None
+
+    def test_family_history_is_part_of_key(self, cache, context):
+        edited = copy.deepcopy(context)
+        edited["clinical_presentation"]["family_history"] = "Unremarkable"
+        assert cache.lookup(edited, []) is None
+
+    def test_previous_tool_results_are_part_of_key(self, cache, context):
+        assert cache.lookup(context, [{"tool": "clinvar"}]) is None
+
+    def test_negated_text_misses(self, cache, context):
+        edited = copy.deepcopy(context)
+        edited["clinical_presentation"]["history_present_illness"] = (
+            "Without elevated CK, early contractures and no cardiomyopathy."
+        )
+        assert cache.lookup(edited, []) is None
+
+    def test_returns_a_copy(self, cache, context):
+        cache.lookup(context, [])["diagnostic_table"].clear()
+        assert cache.lookup(context, []) == OUTPUT
+
+
+class TestSimilarity:
+    """Word-set similarity only applies when opted in."""
+
+    def test_opt_in_tolerates_small_edits(self, context):
+        cache = StructuringCache(min_similarity=0.5)
+        cache.set(context, [], OUTPUT)
+        edited = copy.deepcopy(context)
+        edited["physical_exam"] = "Elbow contractures noted"
+        assert cache.lookup(edited, []) == OUTPUT
+
+    def test_opt_in_still_requires_exact_variants(self, context):
+        cache = StructuringCache(min_similarity=0.0)
+        cache.set(context, [], OUTPUT)
+        edited = copy.deepcopy(context)
+        edited["variants"][0]["zygosity"] = "homozygous"
+        assert cache.lookup(edited, []) is None
+
+
+class TestEviction:
+
+    def test_least_recently_used_is_evicted(self, context):
+        cache = StructuringCache(maxsize=2)
+        contexts = []
+        for age in (1, 2, 3):
+            ctx = copy.deepcopy(context)
+            ctx["demographics"]["age"] = age
+            cache.set(ctx, [], {"age": age})
+            contexts.append(ctx)
+        assert len(cache) == 2
+        assert cache.lookup(contexts[0], []) is None
+        assert cache.lookup(contexts[2], []) == {"age": 3}